@@ -0,0 +1,186 @@
+"""
+Benchmark job ingestion: per-statement writes vs. the batched UNWIND path.
+
+Usage (from JobParser/src):
+    python bench_ingest.py --jobs 200 --batch-size 50
+
+Writes synthetic jobs whose ids and names start with "bench-" and deletes
+them again afterwards.
+"""
+
+import argparse
+import contextlib
+import io
+import random
+import time
+import uuid
+from typing import Any, Dict, List
+
+from jd_to_neo4j import create_job_graph, create_job_graphs
+from graph_driver import get_driver
+from skill_keys import canonical_skills
+
+PREFIX = "bench-"
+
+def make_jobs(n: int, skills_per_job: int, seed: int = 7):
+    """Synthetic parsed job descriptions shaped like parse_jd_file output"""
+    rng = random.Random(seed)
+    skill_pool = [f"{PREFIX}skill-{i}" for i in range(500)]
+    jobs = []
+    for i in range(n):
+        jobs.append({
+            "job_id": f"{PREFIX}{uuid.uuid4()}",
+            "job_title": f"{PREFIX}Engineer {i}",
+            "company": f"{PREFIX}company-{rng.randrange(50)}",
+            "location": f"{PREFIX}city-{rng.randrange(20)}",
+            "employment_type": "Full-time",
+            "experience_required": "3+ years",
+            "salary_range": "Not specified",
+            "education_required": [f"{PREFIX}degree-{rng.randrange(5)}"],
+            "certifications_required": [f"{PREFIX}cert-{rng.randrange(10)}"],
+            "skills_required": rng.sample(skill_pool, skills_per_job),
+            "tools_and_technologies": [f"{PREFIX}tool-{rng.randrange(40)}" for _ in range(4)],
+            "responsibilities": [f"{PREFIX}duty {i}-{k}" for k in range(5)],
+        })
+    return jobs
+
+def create_job_graph_per_statement(job_json: Dict[str, Any]) -> None:
+    """
+    Baseline: the write path create_job_graphs replaced, one auto-commit
+    statement per node. It skips the graph-version bump and does not keep
+    Skill.job_count/version, so it is only fit for the bench- data here.
+    """
+    params = {
+        "job_id": job_json.get("job_id") or str(uuid.uuid4()),
+        "title": job_json.get("job_title") or "Untitled Role",
+        "company": (job_json.get("company") or "Unknown Company"),
+        "location": (job_json.get("location") or "Unknown"),
+        "employment_type": job_json.get("employment_type") or "Not specified",
+        "experience_required": job_json.get("experience_required") or "Not specified",
+        "salary_range": job_json.get("salary_range") or "Not specified",
+    }
+
+    #fixed --> List[str]
+    skills: List[str] = job_json.get("skills_required") or []
+    certs: List[str] = job_json.get("certifications_required") or []
+    education: List[str] = job_json.get("education_required") or []
+    tools: List[str] = job_json.get("tools_and_technologies") or []
+    responsibilities: List[str] = job_json.get("responsibilities") or []
+
+    with get_driver().session() as session:
+        session.run("""
+            MERGE (j:Job {id:$job_id})
+            SET j.title = $title,
+                j.employment_type = $employment_type,
+                j.experience_required = $experience_required,
+                j.salary_range = $salary_range
+        """, **params)
+
+        # Company (skip null/empty)
+        session.run("""
+            MATCH (j:Job {id: $job_id})
+            FOREACH (_ IN CASE WHEN $company IS NULL OR $company = '' THEN [] ELSE [1] END |
+                MERGE (c:Company {name: $company})
+                MERGE (c)-[:POSTS]->(j)
+            )
+        """, job_id=params["job_id"], company=params["company"])
+
+        # Location (skip null/empty)
+        session.run("""
+            MATCH (j:Job {id: $job_id})
+            FOREACH (_ IN CASE WHEN $location IS NULL OR $location = '' THEN [] ELSE [1] END |
+                MERGE (l:Location {name: $location})
+                MERGE (j)-[:LOCATED_AT]->(l)
+            )
+        """, job_id=params["job_id"], location=params["location"])
+
+        # Skills are merged on their canonical key so resumes and jobs share nodes
+        for skill_key, skill in canonical_skills(skills):
+            session.run("""
+                MATCH (j:Job {id:$job_id})
+                MERGE (s:Skill {key:$skill_key})
+                ON CREATE SET s.name = $skill_name
+                MERGE (j)-[:REQUIRES_SKILL]->(s)
+            """, job_id=params["job_id"], skill_key=skill_key, skill_name=skill)
+
+        for cert in certs:
+            if not cert:
+                continue
+            session.run("""
+                MATCH (j:Job {id:$job_id})
+                MERGE (c:Certification {name:$cert_name})
+                MERGE (j)-[:REQUIRES_CERT]->(c)
+            """, job_id=params["job_id"], cert_name=cert)
+
+        for edu in education:
+            if not edu:
+                continue
+            session.run("""
+                MATCH (j:Job {id:$job_id})
+                MERGE (e:Education {name:$edu_name})
+                MERGE (j)-[:REQUIRES_EDU]->(e)
+            """, job_id=params["job_id"], edu_name=edu)
+
+        for t in tools:
+            if not t:
+                continue
+            session.run("""
+                MATCH (j:Job {id:$job_id})
+                MERGE (t:Tool {name:$tool_name})
+                MERGE (j)-[:USES_TOOL]->(t)
+            """, job_id=params["job_id"], tool_name=t)
+
+        for r in responsibilities:
+            if not r:
+                continue
+            session.run("""
+                MATCH (j:Job {id:$job_id})
+                MERGE (resp:Responsibility {desc:$desc_text})
+                MERGE (j)-[:HAS_RESPONSIBILITY]->(resp)
+            """, job_id=params["job_id"], desc_text=r)
+
+    print(f"Created/Merged Job node (id={params['job_id']}) title='{params['title']}'")
+
+def cleanup():
+    with get_driver().session() as session:
+        session.run("""
+            MATCH (n)
+            WHERE (n:Job AND n.id STARTS WITH $prefix)
+               OR n.name STARTS WITH $prefix
+               OR n.desc STARTS WITH $prefix
+            DETACH DELETE n
+        """, prefix=PREFIX)
+
+def timed(label: str, fn, jobs):
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        fn(jobs)
+    elapsed = time.perf_counter() - started
+    rate = len(jobs) / elapsed if elapsed > 0 else 0.0
+    print(f"{label:<28} {len(jobs):>6} jobs in {elapsed:7.2f}s -> {rate:8.1f} jobs/sec")
+    return rate
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark create_job_graph write paths.")
+    ap.add_argument("--jobs", type=int, default=200, help="Jobs per write path")
+    ap.add_argument("--skills", type=int, default=12, help="Skills per job")
+    ap.add_argument("--batch-size", type=int, default=50, help="Jobs per transaction for create_job_graphs")
+    args = ap.parse_args()
+
+    cleanup()
+    try:
+        before = timed("per-statement (before)", lambda jobs: [create_job_graph_per_statement(j) for j in jobs],
+                       make_jobs(args.jobs, args.skills, seed=1))
+        after = timed("batched, 1 job/tx", lambda jobs: [create_job_graph(j) for j in jobs],
+                      make_jobs(args.jobs, args.skills, seed=2))
+        batched = timed(f"batched, {args.batch_size} jobs/tx",
+                        lambda jobs: [create_job_graphs(jobs[i:i + args.batch_size])
+                                      for i in range(0, len(jobs), args.batch_size)],
+                        make_jobs(args.jobs, args.skills, seed=3))
+        if before:
+            print(f"\nSpeedup: {after / before:.1f}x (1 job/tx), {batched / before:.1f}x ({args.batch_size} jobs/tx)")
+    finally:
+        cleanup()
+
+if __name__ == "__main__":
+    main()
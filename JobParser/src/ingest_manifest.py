@@ -0,0 +1,132 @@
+"""
+Manifest of the JD files already ingested from a directory.
+
+One JSON file maps each source file (resolved path) to its size, mtime,
+sha256 and the Job id it was written as. scan() compares a directory with
+it: a file whose size and mtime are unchanged is skipped without being
+read; otherwise its content hash decides (a touched but identical file only
+gets its mtime refreshed). Files in the manifest that are gone from the
+directory are reported as deleted so their jobs can be retired.
+
+Entries are only recorded after the job is written, so an interrupted run
+simply redoes the files it had not finished. Jobs left behind by deleted
+or replaced files are queued in the manifest (`retire_pending`) and only
+dequeued once they have been retired, so a failed or interrupted run
+retires them next time instead of forgetting them.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+MANIFEST_VERSION = 1
+
+
+def file_sha256(path: Path, chunk_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class IngestManifest:
+    """path -> {size, mtime_ns, sha256, job_id} for ingested source files."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.files: Dict[str, Dict[str, Any]] = {}
+        self.retire_pending: List[str] = []
+        if self.path.exists():
+            with open(self.path, encoding="utf-8") as fh:
+                data = json.load(fh)
+            if data.get("version") == MANIFEST_VERSION:
+                self.files = data.get("files", {})
+                self.retire_pending = data.get("retire_pending", [])
+
+    @staticmethod
+    def key(path: Path) -> str:
+        return str(Path(path).resolve())
+
+    def scan(self, directory: Path, pattern: str = "*.txt") -> Dict[str, Any]:
+        """
+        Compare the files under `directory` (recursively) matching `pattern`
+        with the manifest. Returns:
+          changed:   new or modified files, as {path, size, mtime_ns, sha256, previous_job_id}
+          deleted:   manifest keys under `directory` matching `pattern` whose file is gone
+                     (files another pattern ingested are left alone)
+          unchanged: number of files skipped
+        """
+        root = Path(directory).resolve()
+        changed: List[Dict[str, Any]] = []
+        unchanged = 0
+        seen = set()
+        for path in sorted(p for p in root.rglob(pattern) if p.is_file()):
+            key = self.key(path)
+            seen.add(key)
+            stat = path.stat()
+            entry = self.files.get(key)
+            if entry is not None and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+                unchanged += 1
+                continue
+
+            sha256 = file_sha256(path)
+            if entry is not None and entry["sha256"] == sha256:
+                entry["size"], entry["mtime_ns"] = stat.st_size, stat.st_mtime_ns
+                unchanged += 1
+                continue
+            changed.append({"path": path, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns,
+                            "sha256": sha256, "previous_job_id": entry["job_id"] if entry else None})
+
+        prefix = str(root) + os.sep
+        deleted = [key for key in self.files
+                   if key.startswith(prefix) and key not in seen and Path(key).match(pattern)]
+        return {"changed": changed, "deleted": deleted, "unchanged": unchanged}
+
+    def record(self, change: Dict[str, Any], job_id: Optional[str]) -> None:
+        """
+        Remember a file from scan()["changed"] once its job has been written;
+        the job it replaces (if any) is queued for retirement
+        """
+        self.files[self.key(change["path"])] = {
+            "size": change["size"],
+            "mtime_ns": change["mtime_ns"],
+            "sha256": change["sha256"],
+            "job_id": job_id,
+        }
+        if change.get("previous_job_id") not in (None, job_id):
+            self.retire_pending.append(change["previous_job_id"])
+
+    def forget(self, key: str) -> Optional[Dict[str, Any]]:
+        """Drop a deleted file, queueing its job for retirement"""
+        entry = self.files.pop(key, None)
+        if entry is not None and entry.get("job_id"):
+            self.retire_pending.append(entry["job_id"])
+        return entry
+
+    def jobs_to_retire(self) -> List[str]:
+        """Queued jobs that no file maps to any more (a renamed file keeps its job)"""
+        return self.unreferenced(self.retire_pending)
+
+    def retired(self) -> None:
+        """Call once jobs_to_retire() has been retired successfully"""
+        self.retire_pending = []
+
+    def job_ids_for(self, keys: List[str]) -> List[str]:
+        return [self.files[key]["job_id"] for key in keys if self.files.get(key, {}).get("job_id")]
+
+    def unreferenced(self, job_ids: List[str]) -> List[str]:
+        """The given job ids that no file in the manifest maps to any more"""
+        live = {entry["job_id"] for entry in self.files.values()}
+        return [job_id for job_id in dict.fromkeys(job_ids) if job_id not in live]
+
+    def save(self) -> None:
+        """Write atomically, so a crash mid-write never leaves a truncated manifest"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump({"version": MANIFEST_VERSION, "files": self.files, "retire_pending": self.retire_pending},
+                      fh, indent=1, sort_keys=True)
+        os.replace(tmp, self.path)
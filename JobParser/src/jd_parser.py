@@ -1,14 +1,31 @@
+import hashlib
 import json
+import os
+import random
+import sys
 from pathlib import Path
 from typing import Any, Dict
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI, RateLimitError
 from pydantic import BaseModel, Field, ValidationError
 from dotenv import load_dotenv
+from rate_limiter import AsyncRateLimiter
+
+# Shared root-level modules (disk_cache, config, ...) live two levels up
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from disk_cache import get_parse_cache, normalize_text, parse_cache_key, schema_version
 
 # Load .env so OPENAI_API_KEY is visible
 load_dotenv()
 client = OpenAI()  # reads OPENAI_API_KEY from env
 
+MODEL = "gpt-4o-mini"
+MAX_OUTPUT_TOKENS = 1200
+
+# Account limits for the concurrent parser (see run_pipeline.py --workers)
+DEFAULT_RPM = int(os.getenv("OPENAI_RPM", "500"))
+DEFAULT_TPM = int(os.getenv("OPENAI_TPM", "200000"))
+MAX_RETRIES = 6
+
 class ParsedJobDescription(BaseModel):
     job_title: str = Field(description="The primary title of the job, e.g., 'Software Engineer'.")
     company: str = Field(description="The name of the company posting the job.")
@@ -32,43 +49,122 @@ SYSTEM_PROMPT = (
     "Do not include any text outside the JSON."
 )
 
-def parse_jd_file(file_path: str) -> dict:
-    """Reads a job description from a file and sends it to the OpenAI API for parsing."""
+# Part of the parse cache key: changes only when the output schema or prompt does
+SCHEMA_VERSION = schema_version(ParsedJobDescription, SYSTEM_PROMPT)
+
+def read_jd_text(file_path: str) -> str:
+    """Reads a job description file, raising FileNotFoundError/IOError like parse_jd_file."""
     path = Path(file_path)
     if not path.exists():
         raise FileNotFoundError(f"The file '{file_path}' does not exist.")
 
     try:
-        job_desc_text = path.read_text(encoding="utf-8")
+        return path.read_text(encoding="utf-8")
     except Exception as e:
         raise IOError(f"An error occurred while reading the file: {e}")
 
+def _request_args(job_desc_text: str) -> Dict[str, Any]:
+    # OpenAI Responses API with structured output via text.format
+    return dict(
+        model=MODEL,
+        input=f"{SYSTEM_PROMPT}\n\nHere is the job description:\n\n{job_desc_text}",
+        text={
+            "format": {
+                "type": "json_schema",
+                "name": "ParsedJobDescription",  # label
+                "schema": SCHEMA_JSON            # MUST be a dict
+            }
+        },
+        max_output_tokens=MAX_OUTPUT_TOKENS  # Responses API uses max_output_tokens
+    )
+
+def source_ids(job_desc_text: str) -> Dict[str, str]:
+    """
+    Deterministic Job id (content hash of the JD text) plus the fingerprint
+    stored on the Job node. The fingerprint also covers the model and output
+    schema, so a posting is re-parsed when the parser changes but skipped
+    entirely when nothing did.
+    """
+    digest = hashlib.sha256(normalize_text(job_desc_text).encode("utf-8")).hexdigest()
+    fingerprint = hashlib.sha256(f"{digest}:{MODEL}:{SCHEMA_VERSION}".encode("utf-8")).hexdigest()
+    return {"job_id": digest[:32], "source_fingerprint": fingerprint[:32]}
+
+def _cache_key(job_desc_text: str) -> str:
+    return parse_cache_key(job_desc_text, "OpenAI", MODEL, SCHEMA_VERSION)
+
+def _validated(json_text: str) -> dict:
+    json_data = json.loads(json_text)
+    validated = ParsedJobDescription.model_validate(json_data)
+    return validated.model_dump()
+
+def estimate_tokens(job_desc_text: str) -> int:
+    """Rough request size for the TPM budget: ~4 chars/token plus the output cap."""
+    return (len(SYSTEM_PROMPT) + len(job_desc_text)) // 4 + MAX_OUTPUT_TOKENS
+
+def parse_jd_text(job_desc_text: str) -> dict:
+    """
+    Sends job description text to the OpenAI API for parsing (served from the
+    parse cache when possible). The result carries source_ids() for the graph write.
+    """
+    cache = get_parse_cache()
+    if cache is not None:
+        cached = cache.get(_cache_key(job_desc_text))
+        if cached is not None:
+            return {**cached, **source_ids(job_desc_text)}
+
     try:
-        # OpenAI Responses API with structured output via text.format
-        response = client.responses.create(
-            model="gpt-4o-mini",
-            input=f"{SYSTEM_PROMPT}\n\nHere is the job description:\n\n{job_desc_text}",
-            text={
-                "format": {
-                    "type": "json_schema",
-                    "name": "ParsedJobDescription",  # label
-                    "schema": SCHEMA_JSON            # MUST be a dict
-                }
-            },
-            max_output_tokens=1200  # Responses API uses max_output_tokens
-        )
-
-        json_text = response.output_text
-        json_data = json.loads(json_text)
-
-        validated = ParsedJobDescription.model_validate(json_data)
-        return validated.model_dump()
+        response = client.responses.create(**_request_args(job_desc_text))
+        parsed = _validated(response.output_text)
+        if cache is not None:
+            cache.put(_cache_key(job_desc_text), parsed)
+        return {**parsed, **source_ids(job_desc_text)}
 
     except ValidationError as e:
         return {"error": "Validation Failed", "details": str(e)}
     except Exception as e:
         return {"error": "API Call Failed", "details": str(e)}
 
+def parse_jd_file(file_path: str) -> dict:
+    """Reads a job description from a file and sends it to the OpenAI API for parsing."""
+    return parse_jd_text(read_jd_text(file_path))
+
+async def parse_jd_text_async(job_desc_text: str, async_client: AsyncOpenAI,
+                              limiter: AsyncRateLimiter, max_retries: int = MAX_RETRIES) -> dict:
+    """
+    Async counterpart of parse_jd_text. Waits for the shared RPM/TPM budget
+    before each attempt and backs off exponentially on 429s, honouring the
+    server's retry-after header when present.
+    """
+    cache = get_parse_cache()
+    if cache is not None:
+        cached = cache.get(_cache_key(job_desc_text))
+        if cached is not None:
+            return {**cached, **source_ids(job_desc_text)}
+
+    tokens = estimate_tokens(job_desc_text)
+    for attempt in range(max_retries + 1):
+        await limiter.acquire(tokens)
+        try:
+            response = await async_client.responses.create(**_request_args(job_desc_text))
+            parsed = _validated(response.output_text)
+            if cache is not None:
+                cache.put(_cache_key(job_desc_text), parsed)
+            return {**parsed, **source_ids(job_desc_text)}
+
+        except RateLimitError as e:
+            if attempt == max_retries:
+                return {"error": "API Call Failed", "details": f"Rate limited after {max_retries} retries: {e}"}
+            retry_after = e.response.headers.get("retry-after") if e.response is not None else None
+            try:
+                delay = float(retry_after)
+            except (TypeError, ValueError):
+                delay = min(2 ** attempt, 60) + random.uniform(0, 1)
+            limiter.pause(delay)
+        except ValidationError as e:
+            return {"error": "Validation Failed", "details": str(e)}
+        except Exception as e:
+            return {"error": "API Call Failed", "details": str(e)}
+
 if __name__ == "__main__":
     sample_file = Path(__file__).parent.parent / "data" / "sample_jd.txt"
     parsed = parse_jd_file(str(sample_file))
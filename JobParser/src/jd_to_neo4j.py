@@ -1,113 +1,258 @@
-from neo4j import GraphDatabase
 from dotenv import load_dotenv
+from pathlib import Path
 from typing import Dict, Any, List
-import os
-import uuid
+import hashlib
+import json
+import sys
+
+# Shared root-level modules (skill_keys, ...) live two levels up
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+import config
+from graph_driver import get_driver
+from graph_version import bump_graph_version
+from matching import invalidate_skill_index, update_matches_for_job, update_matches_for_resumes
+from skill_keys import canonical_skill_key, canonical_skills
 
 load_dotenv()
 
-NEO4J_URI = os.getenv("NEO4J_URI", "neo4j://127.0.0.1:7687")
-NEO4J_USER = os.getenv("NEO4J_USER", "neo4j")
-NEO4J_PASS = os.getenv("NEO4J_PASSWORD")
+# One statement per batch of jobs: every list is written with UNWIND inside a
+# unit subquery so an empty list never drops the job row. MERGE semantics
+# match the original per-item statements (kept as a baseline in bench_ingest.py).
+JOB_GRAPH_QUERY = """
+UNWIND $jobs AS job
+MERGE (j:Job {id: job.job_id})
+SET j.title = job.title,
+    j.title_key = job.title_key,
+    j.employment_type = job.employment_type,
+    j.experience_required = job.experience_required,
+    j.salary_range = job.salary_range,
+    j.fingerprint = job.fingerprint
+WITH j, job
+CALL {
+    WITH j, job
+    UNWIND job.companies AS company_name
+    MERGE (c:Company {name: company_name})
+    MERGE (c)-[:POSTS]->(j)
+}
+CALL {
+    WITH j, job
+    UNWIND job.locations AS location_name
+    MERGE (l:Location {name: location_name})
+    MERGE (j)-[:LOCATED_AT]->(l)
+}
+CALL {
+    WITH j, job
+    UNWIND job.skills AS skill
+    MERGE (s:Skill {key: skill.key})
+    ON CREATE SET s.name = skill.name
+    // Document frequency for idf scoring: counted once per job->skill edge
+    // (CLEAR_JOB_LISTS_QUERY has already removed a rewritten job's old ones),
+    // stamped with the graph version so skill_suggest can pick up just the changes
+    MERGE (j)-[:REQUIRES_SKILL]->(s)
+    ON CREATE SET s.job_count = coalesce(s.job_count, 0) + 1, s.version = $version
+}
+CALL {
+    WITH j, job
+    UNWIND job.certs AS cert_name
+    MERGE (c:Certification {name: cert_name})
+    MERGE (j)-[:REQUIRES_CERT]->(c)
+}
+CALL {
+    WITH j, job
+    UNWIND job.education AS edu_name
+    MERGE (e:Education {name: edu_name})
+    MERGE (j)-[:REQUIRES_EDU]->(e)
+}
+CALL {
+    WITH j, job
+    UNWIND job.tools AS tool_name
+    MERGE (t:Tool {name: tool_name})
+    MERGE (j)-[:USES_TOOL]->(t)
+}
+CALL {
+    WITH j, job
+    UNWIND job.responsibilities AS desc_text
+    MERGE (resp:Responsibility {desc: desc_text})
+    MERGE (j)-[:HAS_RESPONSIBILITY]->(resp)
+}
+"""
 
-if not NEO4J_PASS:
-    raise RuntimeError("Set NEO4J_PASSWORD in .env file")
+# Jobs whose source file was deleted are retired, not deleted: they keep
+# their edges but get the :RetiredJob label, which matching, search and the
+# skill index filter out, and stop counting toward Skill.job_count. Their
+# MATCHES edges are dropped and the affected resumes returned for rescoring.
+RETIRE_JOBS_QUERY = """
+UNWIND $job_ids AS job_id
+MATCH (j:Job {id: job_id})
+WHERE NOT j:RetiredJob
+SET j:RetiredJob, j.retired_at = datetime()
+WITH j
+CALL {
+    WITH j
+    MATCH (j)-[:REQUIRES_SKILL]->(s:Skill)
+    SET s.job_count = coalesce(s.job_count, 1) - 1, s.version = $version
+}
+CALL {
+    WITH j
+    OPTIONAL MATCH (resume:Resume)-[m:MATCHES]->(j)
+    DELETE m
+    RETURN collect(DISTINCT resume.id) AS resume_ids
+}
+RETURN j.id AS job_id, resume_ids
+"""
 
-driver = GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASS))
+# Undo a retirement when a retired job is written again (e.g. its file came back)
+REVIVE_JOBS_QUERY = """
+UNWIND $job_ids AS job_id
+MATCH (j:Job {id: job_id})
+WHERE j:RetiredJob
+REMOVE j:RetiredJob, j.retired_at
+WITH j
+MATCH (j)-[:REQUIRES_SKILL]->(s:Skill)
+SET s.job_count = coalesce(s.job_count, 0) + 1, s.version = $version
+"""
 
-def create_job_graph(job_json: Dict[str, Any]) -> None:
-    """
-    Takes a parsed job description dictionary and creates a full graph structure.
-    Accepts keys from ParsedJobDescription as-is.
-    """
+# A job written again (re-parsed after a model/prompt change, or an edited
+# file under the same id) is replaced, not merged into: its list edges are
+# dropped first so items the new parse no longer has do not linger. Each
+# removed REQUIRES_SKILL edge takes its job back out of Skill.job_count;
+# JOB_GRAPH_QUERY then re-adds (and re-counts) the current ones.
+CLEAR_JOB_LISTS_QUERY = """
+UNWIND $job_ids AS job_id
+MATCH (j:Job {id: job_id})
+CALL {
+    WITH j
+    MATCH (j)-[r:REQUIRES_SKILL]->(s:Skill)
+    SET s.job_count = coalesce(s.job_count, 1) - 1, s.version = $version
+    DELETE r
+}
+CALL {
+    WITH j
+    MATCH (j)-[r:LOCATED_AT|REQUIRES_CERT|REQUIRES_EDU|USES_TOOL|HAS_RESPONSIBILITY]->()
+    DELETE r
+}
+CALL {
+    WITH j
+    MATCH (:Company)-[r:POSTS]->(j)
+    DELETE r
+}
+"""
+
+def _content_job_id(job_json: Dict[str, Any]) -> str:
+    """Stable id for jobs parsed without a source id, so re-runs merge instead of duplicating"""
+    payload = json.dumps(job_json, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
 
-    params = {
-        "job_id": job_json.get("job_id") or str(uuid.uuid4()),
-        "title": job_json.get("job_title") or "Untitled Role",
-        "company": (job_json.get("company") or "Unknown Company"),
-        "location": (job_json.get("location") or "Unknown"),
+def get_job_fingerprints(job_ids: List[str]) -> Dict[str, str]:
+    """Stored source fingerprint per live Job id (ids not in the graph, or retired, are absent)"""
+    with get_driver().session() as session:
+        result = session.run("""
+            UNWIND $job_ids AS job_id
+            MATCH (j:Job {id: job_id})
+            WHERE NOT j:RetiredJob
+            RETURN j.id AS job_id, j.fingerprint AS fingerprint
+        """, job_ids=job_ids)
+        return {record["job_id"]: record["fingerprint"] for record in result}
+
+def _job_params(job_json: Dict[str, Any]) -> Dict[str, Any]:
+    """Flatten a parsed job description into the parameter map JOB_GRAPH_QUERY expects"""
+    company = job_json.get("company") or "Unknown Company"
+    title = job_json.get("job_title") or "Untitled Role"
+    location = job_json.get("location") or "Unknown"
+    return {
+        "job_id": job_json.get("job_id") or _content_job_id(job_json),
+        "fingerprint": job_json.get("source_fingerprint"),
+        "title": title,
+        "title_key": canonical_skill_key(title),   # for the Job.title_key TEXT index (title substring search)
         "employment_type": job_json.get("employment_type") or "Not specified",
         "experience_required": job_json.get("experience_required") or "Not specified",
         "salary_range": job_json.get("salary_range") or "Not specified",
+        "companies": [company],
+        "locations": [location],
+        "skills": [{"key": key, "name": name}
+                   for key, name in canonical_skills(job_json.get("skills_required") or [])],
+        "certs": [c for c in job_json.get("certifications_required") or [] if c],
+        "education": [e for e in job_json.get("education_required") or [] if e],
+        "tools": [t for t in job_json.get("tools_and_technologies") or [] if t],
+        "responsibilities": [r for r in job_json.get("responsibilities") or [] if r],
     }
 
-    #fixed --> List[str]
-    skills: List[str] = job_json.get("skills_required") or []
-    certs: List[str] = job_json.get("certifications_required") or []
-    education: List[str] = job_json.get("education_required") or []
-    tools: List[str] = job_json.get("tools_and_technologies") or []
-    responsibilities: List[str] = job_json.get("responsibilities") or []
-
+def backfill_title_keys(driver, batch_size: int = 10000) -> int:
+    """One-off: set Job.title_key on jobs written before it existed. Returns how many were set."""
     with driver.session() as session:
-        session.run("""
-            MERGE (j:Job {id:$job_id})
-            SET j.title = $title,
-                j.employment_type = $employment_type,
-                j.experience_required = $experience_required,
-                j.salary_range = $salary_range
-        """, **params)
-
-        # Company (skip null/empty)
-        session.run("""
-            MATCH (j:Job {id: $job_id})
-            FOREACH (_ IN CASE WHEN $company IS NULL OR $company = '' THEN [] ELSE [1] END |
-                MERGE (c:Company {name: $company})
-                MERGE (c)-[:POSTS]->(j)
-            )
-        """, job_id=params["job_id"], company=params["company"])
-
-        # Location (skip null/empty)
-        session.run("""
-            MATCH (j:Job {id: $job_id})
-            FOREACH (_ IN CASE WHEN $location IS NULL OR $location = '' THEN [] ELSE [1] END |
-                MERGE (l:Location {name: $location})
-                MERGE (j)-[:LOCATED_AT]->(l)
-            )
-        """, job_id=params["job_id"], location=params["location"])
-
-        for skill in skills:
-            if not skill:
-                continue
+        rows = session.run("MATCH (j:Job) WHERE j.title_key IS NULL AND j.title IS NOT NULL "
+                           "RETURN j.id AS id, j.title AS title").data()
+        keys = [{"id": row["id"], "title_key": canonical_skill_key(row["title"])} for row in rows]
+        for start in range(0, len(keys), batch_size):
             session.run("""
-                MATCH (j:Job {id:$job_id})
-                MERGE (s:Skill {name:$skill_name})
-                MERGE (j)-[:REQUIRES_SKILL]->(s)
-            """, job_id=params["job_id"], skill_name=skill)
-
-        for cert in certs:
-            if not cert:
-                continue
-            session.run("""
-                MATCH (j:Job {id:$job_id})
-                MERGE (c:Certification {name:$cert_name})
-                MERGE (j)-[:REQUIRES_CERT]->(c)
-            """, job_id=params["job_id"], cert_name=cert)
-
-        for edu in education:
-            if not edu:
-                continue
-            session.run("""
-                MATCH (j:Job {id:$job_id})
-                MERGE (e:Education {name:$edu_name})
-                MERGE (j)-[:REQUIRES_EDU]->(e)
-            """, job_id=params["job_id"], edu_name=edu)
-
-        for t in tools:
-            if not t:
-                continue
-            session.run("""
-                MATCH (j:Job {id:$job_id})
-                MERGE (t:Tool {name:$tool_name})
-                MERGE (j)-[:USES_TOOL]->(t)
-            """, job_id=params["job_id"], tool_name=t)
-
-        for r in responsibilities:
-            if not r:
-                continue
-            session.run("""
-                MATCH (j:Job {id:$job_id})
-                MERGE (resp:Responsibility {desc:$desc_text})
-                MERGE (j)-[:HAS_RESPONSIBILITY]->(resp)
-            """, job_id=params["job_id"], desc_text=r)
+                UNWIND $jobs AS job
+                MATCH (j:Job {id: job.id})
+                SET j.title_key = job.title_key
+            """, jobs=keys[start:start + batch_size]).consume()
+    return len(keys)
+
+def _write_jobs_tx(tx, jobs: List[Dict[str, Any]]) -> None:
+    version = bump_graph_version(tx)
+    job_ids = [job["job_id"] for job in jobs]
+    tx.run(REVIVE_JOBS_QUERY, job_ids=job_ids, version=version).consume()
+    tx.run(CLEAR_JOB_LISTS_QUERY, job_ids=job_ids, version=version).consume()
+    tx.run(JOB_GRAPH_QUERY, jobs=jobs, version=version).consume()
+
+def _retire_jobs_tx(tx, job_ids: List[str]) -> List[Dict[str, Any]]:
+    version = bump_graph_version(tx)
+    return tx.run(RETIRE_JOBS_QUERY, job_ids=job_ids, version=version).data()
+
+def retire_jobs(job_ids: List[str]) -> List[str]:
+    """
+    Retire the given jobs (see RETIRE_JOBS_QUERY) in one transaction.
+    Returns the ids that were live until now; unknown or already retired
+    ids are ignored.
+    """
+    if not job_ids:
+        return []
+    with get_driver().session() as session:
+        rows = session.execute_write(_retire_jobs_tx, list(job_ids))
+    invalidate_skill_index()
+    if config.MATERIALIZE_MATCHES:
+        resume_ids = sorted({resume_id for row in rows for resume_id in row["resume_ids"]})
+        if resume_ids:
+            update_matches_for_resumes(resume_ids)
+    return [row["job_id"] for row in rows]
+
+def _refresh_matches(job_ids: List[str]) -> None:
+    """
+    Drop this process's skill index so the index/lsh engines see the written
+    jobs, and rescore resumes sharing a skill with them (MATERIALIZE_MATCHES only)
+    """
+    invalidate_skill_index()
+    if config.MATERIALIZE_MATCHES:
+        for job_id in job_ids:
+            update_matches_for_job(job_id)
+
+def create_job_graphs(job_jsons: List[Dict[str, Any]]) -> List[str]:
+    """
+    Write many parsed job descriptions in a single managed transaction.
+    Returns the job ids in input order.
+    """
+    jobs = [_job_params(job_json) for job_json in job_jsons]
+    if not jobs:
+        return []
+
+    with get_driver().session() as session:
+        session.execute_write(_write_jobs_tx, jobs)
+    job_ids = [job["job_id"] for job in jobs]
+    _refresh_matches(job_ids)
+    return job_ids
+
+def create_job_graph(job_json: Dict[str, Any]) -> None:
+    """
+    Takes a parsed job description dictionary and creates a full graph structure.
+    Accepts keys from ParsedJobDescription as-is. The whole job is sent as one
+    parameter map in one transaction.
+    """
+    job = _job_params(job_json)
+    with get_driver().session() as session:
+        session.execute_write(_write_jobs_tx, [job])
+    _refresh_matches([job["job_id"]])
 
-    print(f"Created/Merged Job node (id={params['job_id']}) title='{params['title']}'")
+    print(f"Created/Merged Job node (id={job['job_id']}) title='{job['title']}'")
@@ -1,88 +1,260 @@
-from fastapi import FastAPI, HTTPException
-from neo4j import GraphDatabase
-from typing import List, Dict, Any
-from dotenv import load_dotenv
-import os
+from fastapi import FastAPI, HTTPException, Query, Request, Response
+from fastapi.responses import JSONResponse, StreamingResponse
+from typing import List, Dict, Any, Optional
+from pathlib import Path
+import asyncio
+import base64
+import binascii
+import json
+import sys
 
-load_dotenv()
+# Shared root-level modules (graph_schema, ...) live two levels up
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from graph_schema import ensure_schema, print_schema_report
+from graph_driver import get_driver, close_all, close_all_async, pool_stats
+import config
+from graph_store import get_graph_store
+from matching import get_top_resume_matches_for_job
+from response_cache import ResponseCache
+from skill_suggest import SkillSuggester
 
-NEO4J_URI = os.getenv("NEO4J_URI", "neo4j://127.0.0.1:7687")
-NEO4J_USER = os.getenv("NEO4J_USER", "neo4j")
-NEO4J_PASS = os.getenv("NEO4J_PASSWORD")
+app = FastAPI(title="Job Knowledge Graph API", version="1.0.0")
 
-if not NEO4J_PASS:
-    raise RuntimeError("NEO4J_PASSWORD is not set")
 
-DRIVER = GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASS))
-app = FastAPI(title="Job Knowledge Graph API", version="1.0.0")
+class ConcurrencyLimiter:
+    """
+    Caps in-flight requests. A request that cannot get a slot within
+    `queue_timeout` seconds is rejected instead of joining an unbounded
+    queue, so overload shows up as fast 503s rather than growing latency.
+    """
+
+    def __init__(self, max_concurrency: int, queue_timeout: float = 0.0):
+        self.max_concurrency = max_concurrency
+        self.queue_timeout = queue_timeout
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.in_flight = 0
+        self.rejected = 0
+
+    async def acquire(self) -> bool:
+        if not self._semaphore.locked():
+            await self._semaphore.acquire()   # a slot is free: returns without waiting
+        elif self.queue_timeout <= 0:
+            self.rejected += 1
+            return False
+        else:
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), timeout=self.queue_timeout)
+            except asyncio.TimeoutError:
+                self.rejected += 1
+                return False
+        self.in_flight += 1
+        return True
+
+    def release(self) -> None:
+        self.in_flight -= 1
+        self._semaphore.release()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"max_concurrency": self.max_concurrency, "in_flight": self.in_flight, "rejected": self.rejected}
+
+
+limiter = ConcurrencyLimiter(config.API_MAX_CONCURRENCY, config.API_QUEUE_TIMEOUT)
+
+# Read endpoints are served from here until the next ingest (or the TTL) invalidates them
+response_cache = ResponseCache(lambda: get_graph_store().graph_version_async(),
+                               max_entries=config.RESPONSE_CACHE_SIZE, ttl=config.RESPONSE_CACHE_TTL,
+                               version_interval=config.RESPONSE_CACHE_VERSION_INTERVAL)
+
+# Type-ahead index for /skills/suggest, loaded at startup and caught up after each ingest
+suggester = SkillSuggester()
+suggester_refresh: Optional[asyncio.Task] = None
+
+# Operational endpoints stay reachable while the API is saturated
+UNLIMITED_PATHS = ("/stats/", "/docs", "/openapi.json")
+
+
+class LimitConcurrencyMiddleware:
+    """
+    Holds a `limiter` slot for the whole ASGI call, i.e. until the last body
+    chunk is sent. An @app.middleware("http") function returns as soon as
+    the headers are ready, which would free the slot while a streamed
+    response (/jobs/export) is still reading from Neo4j.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"].startswith(UNLIMITED_PATHS):
+            await self.app(scope, receive, send)
+            return
+        if not await limiter.acquire():
+            busy = JSONResponse(status_code=503, content={"detail": "Server busy, retry shortly"},
+                                headers={"Retry-After": "1"})
+            await busy(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release()
+
+
+app.add_middleware(LimitConcurrencyMiddleware)
+
+
+def encode_cursor(job_id: str) -> str:
+    """Opaque, header-safe page cursor for the last job id of a page"""
+    return base64.urlsafe_b64encode(job_id.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: Optional[str]) -> str:
+    if not cursor:
+        return ""
+    try:
+        return base64.b64decode(cursor.encode("ascii"), altchars=b"-_", validate=True).decode("utf-8")
+    except (binascii.Error, UnicodeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def cached_json(request: Request, entry: Dict[str, Any], headers: Optional[Dict[str, str]] = None) -> Response:
+    """
+    Response for a ResponseCache entry: 304 when the client's If-None-Match
+    already has this ETag, else the cached JSON body. Clients must
+    revalidate each time, which the ETag keeps cheap.
+    """
+    headers = {**(headers or {}), "ETag": entry["etag"], "Cache-Control": "no-cache"}
+    if response_cache.is_fresh(entry, request.headers.get("if-none-match")):
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry["body"], media_type="application/json", headers=headers)
+
 
 @app.on_event("startup")
 def startup_db_client():
     """Verify connectivity when the FastAPI server starts."""
     try:
-        DRIVER.verify_connectivity()
+        get_driver().verify_connectivity()
         print("Neo4j Connection successful!")
+        print_schema_report(ensure_schema(get_driver()))
     except Exception as e:
         print(f"Neo4j Connection FAILED. Check credentials/URI: {e}")
         
+async def refresh_suggester() -> None:
+    """Load the suggester once, then apply only the skills stamped since its version"""
+    version = await response_cache.version()
+    if suggester.version is None:
+        suggester.load(await get_graph_store().skill_weights_async(), version)
+    elif version != suggester.version:
+        suggester.update(await get_graph_store().skill_weights_async(since=suggester.version), version)
+
+async def _refresh_suggester_in_background() -> None:
+    try:
+        await refresh_suggester()
+    except Exception as e:
+        print(f"Skill suggestions not refreshed: {e}")
+
+def schedule_suggester_refresh() -> asyncio.Task:
+    """
+    Start a background refresh_suggester() unless one is already running, so
+    concurrent requests after an ingest share one Neo4j read and none waits on it.
+    """
+    global suggester_refresh
+    if suggester_refresh is None or suggester_refresh.done():
+        suggester_refresh = asyncio.create_task(_refresh_suggester_in_background())
+    return suggester_refresh
+
+@app.on_event("startup")
+async def load_skill_suggestions():
+    try:
+        await refresh_suggester()
+        print(f"Skill suggestions: {suggester.stats()['skills']} skills loaded.")
+    except Exception as e:
+        print(f"Skill suggestions not loaded yet: {e}")
+
 @app.on_event("shutdown")
-def shutdown_db_client():
-    DRIVER.close()
+async def shutdown_db_client():
+    await close_all_async()
+    close_all()
     print(" Neo4j Driver closed.")
 
+@app.get("/stats/", tags=["Operations"])
+async def get_stats():
+    """Neo4j connection pool utilization, request limiter, response cache and suggester state for this API process."""
+    return {"neo4j_pool": pool_stats(), "limiter": limiter.stats(), "response_cache": response_cache.stats(),
+            "skill_suggest": suggester.stats()}
+
 @app.get("/jobs/", response_model=List[Dict[str, Any]], tags=["Job Retrieval"])
-def get_all_jobs():
-    """Retrieve all job postings (Job nodes) with their location and type."""
-    query = """
-    MATCH (j:Job)-[:LOCATED_AT]->(l:Location)
-    RETURN j.title AS title, j.employment_type AS type, l.name AS location
-    LIMIT 50
-    """
-    
-    with DRIVER.session() as session:
-        result = session.run(query)
-        jobs = [record.data() for record in result]
-        return jobs
+async def get_all_jobs(request: Request, limit: int = Query(50, ge=1, le=500), cursor: Optional[str] = None):
+    """
+    Retrieve job postings (Job nodes) with their location and type, ordered
+    by job id. A full page carries an X-Next-Cursor header; pass it back as
+    `cursor` for the next page.
+    """
+    after = decode_cursor(cursor)
+    entry = await response_cache.get("jobs", {"limit": limit, "after": after},
+                                     lambda: get_graph_store().list_jobs_async(limit=limit, after=after))
+    jobs = entry["data"]
+    headers = {"X-Next-Cursor": encode_cursor(jobs[-1]["id"])} if len(jobs) == limit else None
+    return cached_json(request, entry, headers)
 
-@app.get("/jobs/search_by_skill/{skill_name}", response_model=List[Dict[str, Any]], tags=["Graph Traversal"])
-def search_jobs_by_skill(skill_name: str):
+@app.get("/jobs/export", tags=["Job Retrieval"])
+async def export_jobs():
     """
-    Find all jobs that require a specific skill, demonstrating graph traversal.
-    The query uses toLower() for case-insensitive matching.
+    Stream the whole job catalog as NDJSON, one job per line with its
+    companies, locations, skills and tools. Rows go to the client as they
+    come off the Neo4j result, so memory stays flat for any catalog size.
+    The request keeps its concurrency slot until the stream ends.
     """
-    query = """
-    MATCH (s:Skill) WHERE toLower(s.name) CONTAINS toLower($skill)
-    MATCH (s)<-[:REQUIRES_SKILL]-(j:Job)-[:LOCATED_AT]->(l:Location)
-    RETURN j.title AS title, l.name AS location, s.name AS skill_match
+    async def ndjson():
+        async for job in get_graph_store().iter_jobs_async():
+            yield json.dumps(job, ensure_ascii=False) + "\n"
+
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+@app.get("/jobs/search_by_skill/{skill_name}", response_model=List[Dict[str, Any]], tags=["Graph Traversal"])
+async def search_jobs_by_skill(request: Request, skill_name: str, limit: int = Query(50, ge=1, le=200)):
     """
-    
-    with DRIVER.session() as session:
-        result = session.run(query, skill=skill_name)
-        jobs = [record.data() for record in result]
-        
-        if not jobs:
-            raise HTTPException(status_code=404, detail=f"No jobs found requiring a skill matching: {skill_name}")
-            
-        return jobs
+    Find jobs that require a skill, demonstrating graph traversal. Skills are
+    looked up in the Skill.name full-text index (case-insensitive, prefix and
+    typo-tolerant), best-matching skills first.
+    """
+    entry = await response_cache.get("search_by_skill", {"skill": skill_name, "limit": limit},
+                                     lambda: get_graph_store().search_jobs_by_skill_async(skill_name, limit=limit))
+    if not entry["data"]:
+        raise HTTPException(status_code=404, detail=f"No jobs found requiring a skill matching: {skill_name}")
+    return cached_json(request, entry)
 
 @app.get("/jobs/skills_and_tools/{job_title}", tags=["Detailed Retrieval"])
-def get_job_details(job_title: str):
+async def get_job_details(request: Request, job_title: str):
+    """
+    Retrieve all skills and tools required for the job whose title best
+    matches `job_title` (Job.title full-text index).
     """
-    Retrieve all skills and tools required for a specific job title.
+    entry = await response_cache.get("skills_and_tools", {"title": job_title},
+                                     lambda: get_graph_store().job_details_async(job_title))
+    if not entry["data"]:
+        raise HTTPException(status_code=404, detail=f"Job title not found: {job_title}")
+    return cached_json(request, entry)
+
+@app.get("/skills/suggest", response_model=List[Dict[str, Any]], tags=["Autocomplete"])
+async def suggest_skills(prefix: str = Query(..., min_length=1, max_length=100),
+                         limit: int = Query(10, ge=1, le=50)):
     """
-    query = """
-    MATCH (j:Job) 
-    WHERE toLower(j.title) CONTAINS toLower($title)
-    OPTIONAL MATCH (j)-[:REQUIRES_SKILL]->(s:Skill)
-    OPTIONAL MATCH (j)-[:USES_TOOL]->(t:Tool)
-    WITH j, collect(DISTINCT s.name) AS Skills, collect(DISTINCT t.name) AS Tools
-    RETURN j.title AS JobTitle, Skills, Tools
+    Type-ahead on skill names: skills starting with `prefix`, most-required
+    first. Always answered from the in-process SkillSuggester as it stands;
+    a background refresh then fetches just the skills that changed when an
+    ingest bumped the graph version.
     """
-    
-    with DRIVER.session() as session:
-        result = session.run(query, title=job_title).single()
-        
-        if not result:
-            raise HTTPException(status_code=404, detail=f"Job title not found: {job_title}")
-            
-        return result.data()
+    schedule_suggester_refresh()
+    return suggester.suggest(prefix, limit=limit)
+
+@app.get("/jobs/{job_id}/top_resumes", response_model=List[Dict[str, Any]], tags=["Matching"])
+def get_top_resumes_for_job(job_id: str, limit: int = Query(10, ge=1, le=100)):
+    """
+    Rank resumes for a job by skill overlap, then coverage (share of the
+    job's skills the resume covers). Stays a sync handler (run in the
+    threadpool): matching is shared with the CLI and uses the sync driver.
+    """
+    matches = get_top_resume_matches_for_job(job_id, limit=limit)
+    if not matches:
+        raise HTTPException(status_code=404, detail=f"No resumes share a skill with job: {job_id}")
+    return matches
@@ -0,0 +1,48 @@
+import asyncio
+import time
+
+class AsyncRateLimiter:
+    """
+    Token-bucket limiter for an LLM API's requests-per-minute and
+    tokens-per-minute budgets, shared by all concurrent workers.
+    """
+
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int):
+        self.rpm = max(1, requests_per_minute)
+        self.tpm = max(1, tokens_per_minute)
+        self._requests = float(self.rpm)
+        self._tokens = float(self.tpm)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._updated
+        self._updated = now
+        self._requests = min(self.rpm, self._requests + elapsed * self.rpm / 60.0)
+        self._tokens = min(self.tpm, self._tokens + elapsed * self.tpm / 60.0)
+
+    async def acquire(self, tokens: int) -> None:
+        """Wait until one request of roughly `tokens` tokens fits both budgets"""
+        tokens = min(tokens, self.tpm)  # an oversized request still goes through eventually
+        async with self._lock:  # first come, first served
+            while True:
+                pause = self._paused_until - time.monotonic()
+                if pause > 0:
+                    await asyncio.sleep(pause)
+                    continue
+
+                self._refill()
+                if self._requests >= 1 and self._tokens >= tokens:
+                    self._requests -= 1
+                    self._tokens -= tokens
+                    return
+
+                wait_requests = (1 - self._requests) * 60.0 / self.rpm
+                wait_tokens = (tokens - self._tokens) * 60.0 / self.tpm
+                await asyncio.sleep(max(wait_requests, wait_tokens, 0.01))
+
+    def pause(self, seconds: float) -> None:
+        """Hold back every worker for `seconds` (e.g. after a 429)"""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
@@ -0,0 +1,108 @@
+"""
+Response cache for the jobs_api read endpoints.
+
+Entries are keyed on (endpoint, parameters) plus the graph version from
+graph_version.py, which every ingest bumps, and expire after a TTL as a
+backstop. Each entry keeps the serialized JSON body and an ETag (a hash of
+that body), so a client revalidating with If-None-Match gets a 304 without
+the body being rebuilt or re-sent.
+
+The version itself is re-read at most every `version_interval` seconds,
+so a dashboard hammering the API costs one tiny query per interval rather
+than one per request.
+"""
+
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from fastapi.encoders import jsonable_encoder
+
+
+class ResponseCache:
+    """Async LRU of rendered JSON responses with TTL and graph-version invalidation."""
+
+    def __init__(self, version: Callable[[], Awaitable[int]], max_entries: int = 512,
+                 ttl: float = 60.0, version_interval: float = 1.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.version_interval = version_interval
+        self._version = version
+        self._current_version: Optional[int] = None
+        self._version_checked = 0.0
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.not_modified = 0
+
+    async def version(self) -> int:
+        now = time.monotonic()
+        if self._current_version is None or now - self._version_checked >= self.version_interval:
+            self._current_version = await self._version()
+            self._version_checked = now
+        return self._current_version
+
+    @staticmethod
+    def key(endpoint: str, params: Dict[str, Any], version: int) -> str:
+        return json.dumps([endpoint, version, sorted(params.items())])
+
+    async def get(self, endpoint: str, params: Dict[str, Any],
+                  compute: Callable[[], Awaitable[Any]]) -> Dict[str, Any]:
+        """
+        Entry for `endpoint(**params)`: data (the computed value), body (its
+        JSON bytes) and etag. `compute` only runs on a miss.
+        """
+        key = self.key(endpoint, params, await self.version())
+        entry = self._entries.get(key)
+        if entry is not None and entry["expires"] > time.monotonic():
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+        if entry is not None:
+            self.expired += 1
+
+        self.misses += 1
+        data = await compute()
+        body = json.dumps(jsonable_encoder(data), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        entry = {
+            "data": data,
+            "body": body,
+            "etag": '"' + hashlib.sha1(body).hexdigest()[:20] + '"',
+            "expires": time.monotonic() + self.ttl,
+        }
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return entry
+
+    def is_fresh(self, entry: Dict[str, Any], if_none_match: Optional[str]) -> bool:
+        """True (and counted) when the client's If-None-Match already names this entry's ETag"""
+        if not if_none_match:
+            return False
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        if entry["etag"] in tags or "*" in tags:
+            self.not_modified += 1
+            return True
+        return False
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._current_version = None
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "expired": self.expired,
+            "not_modified": self.not_modified,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl,
+            "graph_version": self._current_version,
+        }
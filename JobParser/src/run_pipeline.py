@@ -1,32 +1,222 @@
 from pathlib import Path
-from jd_parser import parse_jd_file
-from jd_to_neo4j import create_job_graph
+from openai import AsyncOpenAI
+from jd_parser import parse_jd_file, parse_jd_text_async, read_jd_text, source_ids, DEFAULT_RPM, DEFAULT_TPM
+from jd_to_neo4j import create_job_graph, create_job_graphs, get_job_fingerprints, retire_jobs
+from ingest_manifest import IngestManifest
+from rate_limiter import AsyncRateLimiter
+from staged_pipeline import run_staged_pipeline
+from graph_driver import get_driver
+from graph_schema import ensure_schema, print_schema_report
+from disk_cache import get_parse_cache
+import argparse
+import asyncio
 import json
-import sys
+import time
 
 # Directory where your JD .txt files live
 data_dir = Path(__file__).parent.parent / "data"
 
-# Take file names from command line: python script.py jd1.txt jd2.txt jd3.txt
-# If none are given, fall back to sample_jd.txt
-jd_filenames = sys.argv[1:] or ["sample_jd.txt"]
-
-for filename in jd_filenames:
-    jd_path = data_dir / filename
-
-    if not jd_path.exists():
-        print(f"[WARN] File not found, skipping: {jd_path}")
-        continue
-
+def print_parsed(jd_path: Path, parsed: dict, quiet: bool = False) -> None:
+    """Print one file's parse result (only failures when quiet)."""
+    if "error" in parsed:
+        print(f"[WARN] {jd_path.name}: parsing failed, not pushing to Neo4j: {parsed['error']}")
+        return
+    if quiet:
+        return
     print(f"\n=== Processing: {jd_path.name} ===")
-    print("Parsing JD -> JSON ...")
-    parsed = parse_jd_file(str(jd_path))
-
     print("Parsed JSON:")
     print(json.dumps(parsed, indent=2))
 
-    print("\nPushing to Neo4j ...")
+def push_parsed(jd_path: Path, parsed: dict, quiet: bool = False) -> bool:
+    """Print one file's parse result and write it to Neo4j. Returns whether it was written."""
+    print_parsed(jd_path, parsed, quiet)
+    if "error" in parsed:
+        return False
+
+    if not quiet:
+        print("\nPushing to Neo4j ...")
     create_job_graph(parsed)
-    print("Done.")
+    if not quiet:
+        print("Done.")
+    return True
+
+def select_changed(jd_paths, batch_size: int = 1000):
+    """
+    Drop files whose Job node already carries the same source fingerprint,
+    so unchanged postings cost neither an LLM call nor a graph write.
+    Returns the changed paths and the source ids of every readable path.
+    """
+    ids = {}
+    for jd_path in jd_paths:
+        try:
+            ids[jd_path] = source_ids(read_jd_text(str(jd_path)))
+        except (FileNotFoundError, IOError) as e:
+            print(f"[WARN] {e}")
+
+    job_ids = [v["job_id"] for v in ids.values()]
+    stored = {}
+    for start in range(0, len(job_ids), batch_size):
+        stored.update(get_job_fingerprints(job_ids[start:start + batch_size]))
+
+    changed = [p for p, v in ids.items() if stored.get(v["job_id"]) != v["source_fingerprint"]]
+    if len(changed) < len(jd_paths):
+        print(f"Skipping {len(jd_paths) - len(changed)} unchanged postings.")
+    return changed, ids
+
+def run_sequential(jd_paths, quiet: bool = False, after_write=None):
+    """Original one-file-at-a-time path: parse, print, write. Kept as the baseline."""
+    for jd_path in jd_paths:
+        if not quiet:
+            print(f"\nParsing {jd_path.name} -> JSON ...")
+        parsed = parse_jd_file(str(jd_path))
+        if push_parsed(jd_path, parsed, quiet) and after_write is not None:
+            after_write([(jd_path, parsed)])
+
+async def run_staged(jd_paths, workers: int, rpm: int, tpm: int, batch_size: int, quiet: bool = False,
+                     after_write=None):
+    """
+    Read, parse (up to `workers` LLM calls in flight) and write (batches of
+    `batch_size` jobs per transaction) as concurrent stages; results are
+    printed and written in file order. after_write(batch) gets the
+    (path, parsed) pairs of each written batch.
+    """
+    print(f"\nProcessing {len(jd_paths)} files: {workers} parse workers "
+          f"(limits: {rpm} requests/min, {tpm} tokens/min), writes in batches of {batch_size} ...")
+    async_client = AsyncOpenAI()
+    limiter = AsyncRateLimiter(rpm, tpm)
+
+    def written(batch):
+        if not quiet:
+            print(f"Pushed {len(batch)} jobs to Neo4j: {', '.join(path.name for path, _ in batch)}")
+        if after_write is not None:
+            after_write(batch)
+
+    try:
+        return await run_staged_pipeline(
+            jd_paths,
+            read=lambda path: read_jd_text(str(path)),
+            parse=lambda text: parse_jd_text_async(text, async_client, limiter),
+            write=create_job_graphs,
+            workers=workers,
+            batch_size=batch_size,
+            queue_size=max(2 * workers, batch_size),
+            on_parsed=lambda path, parsed: print_parsed(path, parsed, quiet),
+            on_written=written,
+        )
+    finally:
+        await async_client.close()
+
+def print_stage_report(report: dict) -> None:
+    print(f"\nPipeline wall time: {report['wall_seconds']:.2f}s")
+    for stage in report["stages"]:
+        print(f"  {stage['stage']:<6} {stage['items']:>6} items  {stage['items_per_sec']:>8.1f}/s  "
+              f"mean {stage['mean_latency_ms']:>8.1f} ms  max {stage['max_latency_ms']:>8.1f} ms  "
+              f"busy {stage['busy_seconds']:.2f}s")
+
+def ingest(jd_paths, args, after_write=None) -> None:
+    if args.sequential:
+        run_sequential(jd_paths, args.quiet, after_write)
+    elif jd_paths:
+        print_stage_report(asyncio.run(run_staged(jd_paths, max(args.workers, 1), args.rpm, args.tpm,
+                                                  max(args.batch_size, 1), args.quiet, after_write)))
+
+def run_directory(directory: Path, manifest: IngestManifest, args) -> None:
+    """
+    Ingest the new and changed files under `directory`, then retire the jobs
+    of deleted files and the previous jobs of changed ones (unless another
+    file still maps to the same job). Jobs stay queued for retirement in the
+    manifest until retire_jobs succeeds, so a failed run retires them next time.
+    """
+    scan = manifest.scan(directory, args.pattern)
+    changes = {change["path"]: change for change in scan["changed"]}
+    print(f"\n{directory}: {len(changes)} new or changed, {scan['unchanged']} unchanged, "
+          f"{len(scan['deleted'])} deleted files.")
+
+    for key in scan["deleted"]:
+        manifest.forget(key)
+
+    jd_paths = list(changes)
+    try:
+        if not args.force:
+            jd_paths, ids = select_changed(jd_paths)
+            # Content already in the graph (e.g. a renamed file): nothing to parse
+            for path in set(changes) - set(jd_paths):
+                if path in ids:
+                    manifest.record(changes[path], ids[path]["job_id"])
+
+        def written(batch):
+            for path, parsed in batch:
+                manifest.record(changes[path], parsed.get("job_id"))
+
+        ingest(jd_paths, args, written)
+
+        stale = manifest.jobs_to_retire()
+        if stale:
+            print(f"Retired {len(retire_jobs(stale))} jobs whose source file was deleted or replaced.")
+        manifest.retired()
+    finally:
+        manifest.save()
+
+def main():
+    ap = argparse.ArgumentParser(description="Parse job descriptions and load them into Neo4j.")
+    # Take file names from command line: python run_pipeline.py jd1.txt jd2.txt jd3.txt
+    # If none are given, fall back to sample_jd.txt
+    ap.add_argument("files", nargs="*", default=["sample_jd.txt"], help="JD files in JobParser/data")
+    ap.add_argument("--dir", nargs="?", const=str(data_dir), type=Path,
+                    help="Ingest every new or changed file under this directory (default: JobParser/data) "
+                         "instead of the listed files")
+    ap.add_argument("--pattern", default="*.txt", help="File name pattern for --dir")
+    ap.add_argument("--manifest", type=Path,
+                    help="Manifest of ingested files for --dir (default: <dir>/.ingest_manifest.json)")
+    ap.add_argument("--watch", type=float, metavar="SECONDS",
+                    help="With --dir: keep polling the directory every SECONDS")
+    ap.add_argument("--workers", type=int, default=1,
+                    help="Parse up to N files concurrently through the async OpenAI client")
+    ap.add_argument("--rpm", type=int, default=DEFAULT_RPM, help="Requests-per-minute limit")
+    ap.add_argument("--tpm", type=int, default=DEFAULT_TPM, help="Tokens-per-minute limit")
+    ap.add_argument("--batch-size", type=int, default=16, help="Jobs written per Neo4j transaction")
+    ap.add_argument("--sequential", action="store_true",
+                    help="Parse and write one file at a time (no pipelining)")
+    ap.add_argument("--quiet", action="store_true", help="Don't print each parsed JSON, only warnings and totals")
+    ap.add_argument("--force", action="store_true", help="Re-parse and re-write postings even if unchanged")
+    args = ap.parse_args()
+
+    if args.watch and args.dir is None:
+        ap.error("--watch needs --dir")
+
+    # Constraints/indexes for every MERGE key (idempotent)
+    print_schema_report(ensure_schema(get_driver()))
+
+    if args.dir is not None:
+        if not args.dir.is_dir():
+            ap.error(f"Not a directory: {args.dir}")
+        manifest = IngestManifest(args.manifest or args.dir / ".ingest_manifest.json")
+        run_directory(args.dir, manifest, args)
+        try:
+            while args.watch:
+                time.sleep(args.watch)
+                run_directory(args.dir, manifest, args)
+        except KeyboardInterrupt:
+            print("\nStopped watching.")
+    else:
+        jd_paths = []
+        for filename in args.files:
+            jd_path = data_dir / filename
+            if not jd_path.exists():
+                print(f"[WARN] File not found, skipping: {jd_path}")
+                continue
+            jd_paths.append(jd_path)
+
+        if not args.force:
+            jd_paths, _ = select_changed(jd_paths)
+        ingest(jd_paths, args)
+
+    print("\nAll requested files processed.")
+    cache = get_parse_cache()
+    if cache is not None:
+        stats = cache.stats()
+        print(f"Parse cache: {stats['hits']} hits, {stats['misses']} misses "
+              f"({stats['entries']} entries, {stats['bytes'] / 1e6:.1f} MB)")
 
-print("\nAll requested files processed.")
+if __name__ == "__main__":
+    main()
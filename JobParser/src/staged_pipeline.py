@@ -0,0 +1,169 @@
+"""
+Staged ingest pipeline: reader -> parse workers -> batched graph writer.
+
+The stages run concurrently and are connected by bounded asyncio queues, so
+the database writes one batch while the next files are still with the LLM.
+A full queue blocks the stage feeding it (backpressure), and a window
+semaphore caps how many files are anywhere between the reader and the
+writer, including the reorder buffer that hands results to the writer in
+input order. Wall time approaches the slowest stage's time instead of the
+sum of all of them.
+
+Stage functions are passed in, so this module knows nothing about OpenAI or
+Neo4j: run_pipeline.py wires in read_jd_text, parse_jd_text_async and
+create_job_graphs.
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+_DONE = object()
+
+
+class StageStats:
+    """Throughput and latency counters for one stage."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.items = 0
+        self.calls = 0
+        self.busy_seconds = 0.0
+        self.max_latency = 0.0
+        self._first_start: Optional[float] = None
+        self._last_end: Optional[float] = None
+
+    def record(self, started: float, items: int = 1) -> None:
+        """Count one call that began at `started` (time.perf_counter()) and just finished"""
+        now = time.perf_counter()
+        elapsed = now - started
+        self.items += items
+        self.calls += 1
+        self.busy_seconds += elapsed
+        self.max_latency = max(self.max_latency, elapsed)
+        if self._first_start is None or started < self._first_start:
+            self._first_start = started
+        self._last_end = now
+
+    def summary(self) -> Dict[str, Any]:
+        active = self._last_end - self._first_start if self.calls else 0.0
+        return {
+            "stage": self.name,
+            "items": self.items,
+            "calls": self.calls,
+            "items_per_sec": self.items / active if active else 0.0,
+            "mean_latency_ms": self.busy_seconds * 1000 / self.calls if self.calls else 0.0,
+            "max_latency_ms": self.max_latency * 1000,
+            "busy_seconds": self.busy_seconds,
+        }
+
+
+async def run_staged_pipeline(paths: Iterable[Any],
+                              read: Callable[[Any], str],
+                              parse: Callable[[str], Awaitable[dict]],
+                              write: Callable[[List[dict]], Any],
+                              workers: int = 4,
+                              batch_size: int = 16,
+                              queue_size: int = 32,
+                              batch_wait: float = 0.5,
+                              on_parsed: Optional[Callable[[Any, dict], None]] = None,
+                              on_written: Optional[Callable[[List[Tuple[Any, dict]]], None]] = None) -> Dict[str, Any]:
+    """
+    Read each path (sync, in a thread), parse its text with up to `workers`
+    concurrent `parse` calls, and pass successful parses to `write` (sync,
+    in a thread) in batches of up to `batch_size`. A partial batch is
+    written once no new result has arrived for `batch_wait` seconds.
+
+    on_parsed(path, parsed) sees every result, errors included, in input
+    order; parses with an "error" key are not written. on_written(batch)
+    gets the (path, parsed) pairs after each write. Returns the wall time
+    and per-stage StageStats summaries.
+    """
+    stats = {name: StageStats(name) for name in ("read", "parse", "write")}
+    read_queue: asyncio.Queue = asyncio.Queue(queue_size)
+    parsed_queue: asyncio.Queue = asyncio.Queue(queue_size)
+    window = asyncio.Semaphore(2 * queue_size + workers)
+
+    async def reader():
+        for seq, path in enumerate(paths):
+            await window.acquire()
+            started = time.perf_counter()
+            try:
+                text, error = await asyncio.to_thread(read, path), None
+            except (FileNotFoundError, IOError) as e:
+                text, error = None, {"error": "Read Failed", "details": str(e)}
+            stats["read"].record(started)
+            await read_queue.put((seq, path, text, error))
+        for _ in range(workers):
+            await read_queue.put(_DONE)
+
+    async def parser():
+        while True:
+            item = await read_queue.get()
+            if item is _DONE:
+                await parsed_queue.put(_DONE)
+                return
+            seq, path, text, parsed = item
+            if parsed is None:
+                started = time.perf_counter()
+                parsed = await parse(text)
+                stats["parse"].record(started)
+            await parsed_queue.put((seq, path, parsed))
+
+    async def writer():
+        pending: Dict[int, Tuple[Any, dict]] = {}   # reorder buffer
+        next_seq = 0
+        batch: List[Tuple[Any, dict]] = []
+        finished_parsers = 0
+
+        async def flush():
+            nonlocal batch
+            if batch:
+                started = time.perf_counter()
+                await asyncio.to_thread(write, [parsed for _, parsed in batch])
+                stats["write"].record(started, items=len(batch))
+                if on_written is not None:
+                    on_written(batch)
+                batch = []
+
+        while finished_parsers < workers:
+            try:
+                if batch:
+                    item = await asyncio.wait_for(parsed_queue.get(), timeout=batch_wait)
+                else:
+                    item = await parsed_queue.get()
+            except asyncio.TimeoutError:
+                await flush()
+                continue
+            if item is _DONE:
+                finished_parsers += 1
+                continue
+
+            seq, path, parsed = item
+            pending[seq] = (path, parsed)
+            while next_seq in pending:
+                path, parsed = pending.pop(next_seq)
+                next_seq += 1
+                window.release()
+                if on_parsed is not None:
+                    on_parsed(path, parsed)
+                if "error" not in parsed:
+                    batch.append((path, parsed))
+                    if len(batch) >= batch_size:
+                        await flush()
+        await flush()
+
+    started = time.perf_counter()
+    tasks = [asyncio.create_task(reader()), asyncio.create_task(writer())]
+    tasks += [asyncio.create_task(parser()) for _ in range(workers)]
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    return {
+        "wall_seconds": time.perf_counter() - started,
+        "stages": [stage.summary() for stage in stats.values()],
+    }
@@ -11,6 +11,8 @@ except ImportError:
     from resume_parser import ResumeParser
     from neo4j_manager import Neo4jManager
     from resume_schema import ResumeData
+from graph_driver import pool_stats
+from match_cache import get_match_cache
 import json
 
 # Page configuration
@@ -25,6 +27,8 @@ if 'parsed_resumes' not in st.session_state:
     st.session_state.parsed_resumes = []
 if 'neo4j_connected' not in st.session_state:
     st.session_state.neo4j_connected = False
+if 'neo4j_schema_checked' not in st.session_state:
+    st.session_state.neo4j_schema_checked = False
 
 def main():
     st.title("📄 Resume Parser & Knowledge Graph Builder")
@@ -72,6 +76,14 @@ def main():
         if st.button("Test Neo4j Connection"):
             try:
                 neo4j_manager = Neo4jManager(neo4j_uri, neo4j_user, neo4j_password)
+                if not st.session_state.neo4j_schema_checked:
+                    # Constraints/indexes for every MERGE key (idempotent)
+                    schema_report = neo4j_manager.ensure_schema()
+                    for name, error in schema_report['failed'].items():
+                        st.warning(f"Could not create {name}: {error}")
+                    for label, prop in schema_report['missing']:
+                        st.warning(f"No index for :{label}({prop}); lookups on it will scan every {label} node.")
+                    st.session_state.neo4j_schema_checked = True
                 neo4j_manager.close()
                 st.success("✅ Neo4j connection successful!")
                 st.session_state.neo4j_connected = True
@@ -117,6 +129,8 @@ def main():
             for i, resume_data in enumerate(st.session_state.parsed_resumes):
                 with st.expander(f"Resume {i+1}: {resume_data.get('name', 'Unknown')}"):
                     display_resume_data(resume_data)
+                    if st.session_state.neo4j_connected:
+                        display_job_matches(resume_data['id'], neo4j_uri, neo4j_user, neo4j_password)
         else:
             st.info("No resumes parsed yet. Upload a resume to get started!")
     
@@ -131,6 +145,15 @@ def main():
                 
                 st.metric("Total Resumes", len(resumes))
                 
+                for pool_name, pool in pool_stats().items():
+                    in_use = sum(a['in_use'] for a in pool['addresses'].values())
+                    idle = sum(a['idle'] for a in pool['addresses'].values())
+                    st.caption(f"Neo4j pool {pool_name}: {in_use} in use, {idle} idle, max {pool['max_pool_size']}")
+                
+                cache_stats = get_match_cache(neo4j_uri, neo4j_user, neo4j_password).stats()
+                st.caption(f"Match cache: {cache_stats['hit_rate']:.0%} hit rate, "
+                           f"{cache_stats['entries']} entries")
+                
                 if resumes:
                     st.subheader("Recent Resumes")
                     for resume in resumes[-5:]:  # Show last 5
@@ -193,6 +216,23 @@ def parse_resume(uploaded_file, llm_provider, api_key, neo4j_uri, neo4j_user, ne
         # Clean up temporary file
         os.unlink(tmp_file_path)
 
+def display_job_matches(resume_id, neo4j_uri, neo4j_user, neo4j_password, limit=5):
+    """Top job matches for a stored resume, from the match cache of the connected graph"""
+    st.subheader("🎯 Top Job Matches")
+    try:
+        matches = get_match_cache(neo4j_uri, neo4j_user, neo4j_password).get_matches(resume_id, limit=limit)
+    except Exception as e:
+        st.error(f"Error loading matches: {str(e)}")
+        return
+    
+    if not matches:
+        st.write("No matching jobs yet.")
+        return
+    for m in matches:
+        st.write(f"**{m.get('title') or 'Untitled'}** at *{m.get('company') or 'Unknown'}* "
+                 f"({m['matching_skill_count']}/{m['total_skill_required']} skills, "
+                 f"{m['coverage']:.0%} coverage)")
+
 def display_resume_data(resume_data):
     """Display parsed resume data in a formatted way"""
     
@@ -1,208 +1,218 @@
-from neo4j import GraphDatabase
-from typing import List, Dict, Any
-from resume_schema import ResumeData, Education, Experience, Skill, Project, Certification
+from typing import List, Dict, Any, Tuple
+from resume_schema import ResumeData
 import json
+import os
+import sys
+
+# Shared root-level modules (skill_keys, ...) live two levels up
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+import config
+from skill_keys import canonical_skills
+from graph_schema import ensure_schema
+from graph_driver import get_driver
+from graph_version import bump_graph_version
+from matching import update_matches_for_resumes
+
+# One statement per entity type, each covering every resume in the batch.
+# They run in order inside a single managed transaction (see _write_resumes_tx).
+RESUME_WRITE_QUERIES = [
+    # Main resume nodes
+    """
+    UNWIND $resumes AS res
+    CREATE (r:Resume {
+        id: res.id,
+        name: res.name,
+        email: res.email,
+        phone: res.phone,
+        summary: res.summary
+    })
+    """,
+    # Education: institute, degree, majors and courses
+    """
+    UNWIND $resumes AS res
+    MATCH (r:Resume {id: res.id})
+    UNWIND res.education AS edu
+    MERGE (i:Institute {name: edu.institute})
+    ON CREATE SET i.type = 'Educational'
+    MERGE (d:Degree {name: edu.degree})
+    CREATE (r)-[:HAS_EDUCATION {
+        from_date: edu.from_date,
+        to_date: edu.to_date,
+        gpa: edu.gpa
+    }]->(i)
+    CREATE (i)-[:OFFERS]->(d)
+    WITH i, edu
+    CALL {
+        WITH i, edu
+        UNWIND edu.majors AS major_name
+        MERGE (m:Major {name: major_name})
+        CREATE (i)-[:HAS_MAJOR]->(m)
+    }
+    CALL {
+        WITH i, edu
+        UNWIND edu.courses AS course_name
+        MERGE (c:Course {name: course_name})
+        CREATE (i)-[:OFFERS_COURSE]->(c)
+    }
+    """,
+    # Experience: company, position and the skills used in the role
+    """
+    UNWIND $resumes AS res
+    MATCH (r:Resume {id: res.id})
+    UNWIND res.experience AS exp
+    MERGE (c:Company {name: exp.company})
+    ON CREATE SET c.type = 'Organization'
+    MERGE (p:Position {name: exp.position})
+    CREATE (r)-[:HAS_EXPERIENCE {
+        from_date: exp.from_date,
+        to_date: exp.to_date,
+        description: exp.description,
+        location: exp.location
+    }]->(c)
+    CREATE (c)-[:HAS_POSITION]->(p)
+    WITH c, p, exp
+    CALL {
+        WITH c, p, exp
+        UNWIND exp.skills AS skill
+        MERGE (s:Skill {key: skill.key})
+        ON CREATE SET s.name = skill.name
+        CREATE (p)-[:REQUIRES_SKILL]->(s)
+        CREATE (c)-[:USES_SKILL]->(s)
+    }
+    """,
+    # Skills (comma-joined names were already split into one entry per skill)
+    """
+    UNWIND $resumes AS res
+    MATCH (r:Resume {id: res.id})
+    UNWIND res.skills AS skill
+    MERGE (s:Skill {key: skill.key})
+    ON CREATE SET s.name = skill.name, s.category = skill.category, s.proficiency = skill.proficiency
+    ON MATCH SET s.category = COALESCE(s.category, skill.category)
+    MERGE (r)-[:HAS_SKILL]->(s)
+    """,
+    # Projects and their technologies
+    """
+    UNWIND $resumes AS res
+    MATCH (r:Resume {id: res.id})
+    UNWIND res.projects AS project
+    CREATE (p:Project {
+        name: project.name,
+        description: project.description,
+        url: project.url
+    })
+    CREATE (r)-[:HAS_PROJECT]->(p)
+    WITH p, project
+    CALL {
+        WITH p, project
+        UNWIND project.technologies AS tech_name
+        MERGE (t:Technology {name: tech_name})
+        CREATE (p)-[:USES_TECHNOLOGY]->(t)
+    }
+    """,
+    # Certifications
+    """
+    UNWIND $resumes AS res
+    MATCH (r:Resume {id: res.id})
+    UNWIND res.certifications AS cert
+    MERGE (c:Certification {name: cert.name})
+    ON CREATE SET c.issuer = cert.issuer, c.date = cert.date, c.expiry = cert.expiry
+    CREATE (r)-[:HAS_CERTIFICATION]->(c)
+    """,
+    # Languages
+    """
+    UNWIND $resumes AS res
+    MATCH (r:Resume {id: res.id})
+    UNWIND res.languages AS language_name
+    MERGE (l:Language {name: language_name})
+    CREATE (r)-[:SPEAKS_LANGUAGE]->(l)
+    """,
+]
 
 class Neo4jManager:
     def __init__(self, uri: str, user: str, password: str):
-        self.driver = GraphDatabase.driver(uri, auth=(user, password))
+        # Pooled driver shared by every manager for this URI/user (graph_driver.py)
+        self.driver = get_driver(uri, user, password)
     
     def close(self):
-        """Close the database connection"""
-        self.driver.close()
-    
-    def create_resume_node(self, resume_data: ResumeData, resume_id: str) -> None:
-        """Create a resume node and all related nodes in Neo4j"""
-        with self.driver.session() as session:
-            # Create the main resume node
-            session.run("""
-                CREATE (r:Resume {
-                    id: $resume_id,
-                    name: $name,
-                    email: $email,
-                    phone: $phone,
-                    summary: $summary
-                })
-            """, 
-            resume_id=resume_id,
-            name=resume_data.personal_info.get('name', ''),
-            email=resume_data.personal_info.get('email', ''),
-            phone=resume_data.personal_info.get('phone', ''),
-            summary=resume_data.summary or ''
-            )
-            
-            # Create education nodes and relationships
-            self._create_education_nodes(session, resume_data.education, resume_id)
-            
-            # Create experience nodes and relationships
-            self._create_experience_nodes(session, resume_data.experience, resume_id)
-            
-            # Create skill nodes and relationships
-            self._create_skill_nodes(session, resume_data.skills, resume_id)
-            
-            # Create project nodes and relationships
-            self._create_project_nodes(session, resume_data.projects, resume_id)
-            
-            # Create certification nodes and relationships
-            self._create_certification_nodes(session, resume_data.certifications, resume_id)
-            
-            # Create language nodes and relationships
-            self._create_language_nodes(session, resume_data.languages, resume_id)
-    
-    def _create_education_nodes(self, session, education_list: List[Education], resume_id: str):
-        """Create education nodes and relationships"""
-        for i, edu in enumerate(education_list):
-            # Create institute and degree nodes, then create relationships
-            session.run("""
-                MERGE (i:Institute {name: $institute_name})
-                ON CREATE SET i.type = 'Educational'
-                WITH i
-                MERGE (d:Degree {name: $degree_name})
-                WITH i, d
-                MATCH (r:Resume {id: $resume_id})
-                CREATE (r)-[:HAS_EDUCATION {
-                    from_date: $from_date,
-                    to_date: $to_date,
-                    gpa: $gpa
-                }]->(i)
-                CREATE (i)-[:OFFERS]->(d)
-            """, 
-            resume_id=resume_id,
-            institute_name=edu.institute,
-            degree_name=edu.degree,
-            from_date=edu.dates.from_date,
-            to_date=edu.dates.to_date,
-            gpa=edu.gpa
-            )
-            
-            # Create major nodes and relationships
-            for major in edu.major:
-                session.run("""
-                    MERGE (m:Major {name: $major_name})
-                    WITH m
-                    MATCH (i:Institute {name: $institute_name})
-                    CREATE (i)-[:HAS_MAJOR]->(m)
-                """, major_name=major, institute_name=edu.institute)
-            
-            # Create course nodes and relationships
-            for course in edu.courses:
-                session.run("""
-                    MERGE (c:Course {name: $course_name})
-                    WITH c
-                    MATCH (i:Institute {name: $institute_name})
-                    CREATE (i)-[:OFFERS_COURSE]->(c)
-                """, course_name=course, institute_name=edu.institute)
+        """Release this manager; the shared driver stays open for reuse and closes at exit"""
+        self.driver = None
     
-    def _create_experience_nodes(self, session, experience_list: List[Experience], resume_id: str):
-        """Create experience nodes and relationships"""
-        for i, exp in enumerate(experience_list):
-            # Create company and position nodes, then create relationships
-            session.run("""
-                MERGE (c:Company {name: $company_name})
-                ON CREATE SET c.type = 'Organization'
-                WITH c
-                MERGE (p:Position {name: $position_name})
-                WITH c, p
-                MATCH (r:Resume {id: $resume_id})
-                CREATE (r)-[:HAS_EXPERIENCE {
-                    from_date: $from_date,
-                    to_date: $to_date,
-                    description: $description,
-                    location: $location
-                }]->(c)
-                CREATE (c)-[:HAS_POSITION]->(p)
-            """, 
-            resume_id=resume_id,
-            company_name=exp.company,
-            position_name=exp.position,
-            from_date=exp.dates.from_date,
-            to_date=exp.dates.to_date,
-            description=exp.description,
-            location=exp.location
-            )
-            
-            # Create skill relationships for this experience
-            for skill in exp.skills_used:
-                session.run("""
-                    MERGE (s:Skill {name: $skill_name})
-                    WITH s
-                    MATCH (c:Company {name: $company_name})
-                    MATCH (p:Position {name: $position_name})
-                    CREATE (p)-[:REQUIRES_SKILL]->(s)
-                    CREATE (c)-[:USES_SKILL]->(s)
-                """, skill_name=skill, company_name=exp.company, position_name=exp.position)
+    def ensure_schema(self) -> Dict[str, Any]:
+        """Create any missing constraints/indexes; returns the graph_schema report"""
+        return ensure_schema(self.driver)
     
-    def _create_skill_nodes(self, session, skill_list: List[Skill], resume_id: str):
-        """Create skill nodes and relationships"""
-        for skill in skill_list:
-            session.run("""
-                MERGE (s:Skill {name: $skill_name})
-                ON CREATE SET s.category = $category, s.proficiency = $proficiency
-                ON MATCH SET s.category = COALESCE(s.category, $category)
-                WITH s
-                MATCH (r:Resume {id: $resume_id})
-                MERGE (r)-[:HAS_SKILL]->(s)
-            """, 
-            resume_id=resume_id,
-            skill_name=skill.name,
-            category=skill.category,
-            proficiency=skill.proficiency
-            )
+    def create_resume_node(self, resume_data: ResumeData, resume_id: str) -> None:
+        """Create a resume node and all related nodes in Neo4j (one transaction)"""
+        self.create_resume_nodes([(resume_data, resume_id)])
     
-    def _create_project_nodes(self, session, project_list: List[Project], resume_id: str):
-        """Create project nodes and relationships"""
-        for project in project_list:
-            session.run("""
-                CREATE (p:Project {
-                    name: $project_name,
-                    description: $description,
-                    url: $url
-                })
-                WITH p
-                MATCH (r:Resume {id: $resume_id})
-                CREATE (r)-[:HAS_PROJECT]->(p)
-            """, 
-            resume_id=resume_id,
-            project_name=project.name,
-            description=project.description,
-            url=project.url
-            )
-            
-            # Create technology relationships
-            for tech in project.technologies:
-                session.run("""
-                    MERGE (t:Technology {name: $tech_name})
-                    WITH t
-                    MATCH (p:Project {name: $project_name})
-                    CREATE (p)-[:USES_TECHNOLOGY]->(t)
-                """, tech_name=tech, project_name=project.name)
+    def create_resume_nodes(self, resumes: List[Tuple[ResumeData, str]], batch_size: int = 100) -> None:
+        """
+        Create many resumes, `batch_size` per transaction. Each batch is
+        written with a handful of UNWIND statements and rolls back as a
+        whole if any of them fails. With MATERIALIZE_MATCHES set, only the
+        new resumes get their MATCHES edges scored afterwards.
+        """
+        params = [self._resume_params(resume_data, resume_id) for resume_data, resume_id in resumes]
+        with self.driver.session() as session:
+            for start in range(0, len(params), batch_size):
+                batch = params[start:start + batch_size]
+                session.execute_write(self._write_resumes_tx, batch)
+                if config.MATERIALIZE_MATCHES:
+                    update_matches_for_resumes([p['id'] for p in batch], driver=self.driver)
     
-    def _create_certification_nodes(self, session, cert_list: List[Certification], resume_id: str):
-        """Create certification nodes and relationships"""
-        for cert in cert_list:
-            session.run("""
-                MERGE (c:Certification {name: $cert_name})
-                ON CREATE SET c.issuer = $issuer, c.date = $date, c.expiry = $expiry
-                WITH c
-                MATCH (r:Resume {id: $resume_id})
-                CREATE (r)-[:HAS_CERTIFICATION]->(c)
-            """, 
-            resume_id=resume_id,
-            cert_name=cert.name,
-            issuer=cert.issuer,
-            date=cert.date,
-            expiry=cert.expiry
-            )
+    @staticmethod
+    def _write_resumes_tx(tx, resumes: List[Dict[str, Any]]):
+        for query in RESUME_WRITE_QUERIES:
+            tx.run(query, resumes=resumes).consume()
+        bump_graph_version(tx)
     
-    def _create_language_nodes(self, session, language_list: List[str], resume_id: str):
-        """Create language nodes and relationships"""
-        for language in language_list:
-            session.run("""
-                MERGE (l:Language {name: $language_name})
-                WITH l
-                MATCH (r:Resume {id: $resume_id})
-                CREATE (r)-[:SPEAKS_LANGUAGE]->(l)
-            """, resume_id=resume_id, language_name=language)
+    @staticmethod
+    def _resume_params(resume_data: ResumeData, resume_id: str) -> Dict[str, Any]:
+        """Flatten a ResumeData into the parameter map RESUME_WRITE_QUERIES expect"""
+        return {
+            'id': resume_id,
+            'name': resume_data.personal_info.get('name', ''),
+            'email': resume_data.personal_info.get('email', ''),
+            'phone': resume_data.personal_info.get('phone', ''),
+            'summary': resume_data.summary or '',
+            'education': [{
+                'institute': edu.institute,
+                'degree': edu.degree,
+                'from_date': edu.dates.from_date,
+                'to_date': edu.dates.to_date,
+                'gpa': edu.gpa,
+                'majors': edu.major,
+                'courses': edu.courses,
+            } for edu in resume_data.education],
+            'experience': [{
+                'company': exp.company,
+                'position': exp.position,
+                'from_date': exp.dates.from_date,
+                'to_date': exp.dates.to_date,
+                'description': exp.description,
+                'location': exp.location,
+                'skills': [{'key': key, 'name': name} for key, name in canonical_skills(exp.skills_used)],
+            } for exp in resume_data.experience],
+            'skills': [{
+                'key': key,
+                'name': name,
+                'category': skill.category,
+                'proficiency': skill.proficiency,
+            } for skill in resume_data.skills for key, name in canonical_skills([skill.name])],
+            'projects': [{
+                'name': project.name,
+                'description': project.description,
+                'url': project.url,
+                'technologies': project.technologies,
+            } for project in resume_data.projects],
+            'certifications': [{
+                'name': cert.name,
+                'issuer': cert.issuer,
+                'date': cert.date,
+                'expiry': cert.expiry,
+            } for cert in resume_data.certifications],
+            'languages': resume_data.languages,
+        }
     
     def get_resume_summary(self, resume_id: str) -> Dict[str, Any]:
         """Get a summary of a resume from Neo4j"""
@@ -1,4 +1,5 @@
 import os
+import sys
 import json
 import re
 import requests
@@ -12,7 +13,21 @@ except ImportError:
 import openai
 import google.generativeai as genai
 
+# Shared root-level modules (disk_cache, config, ...) live two levels up
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+from disk_cache import get_parse_cache, parse_cache_key, schema_version
+
+# Part of the parse cache key: changes only when the ResumeData schema does
+RESUME_SCHEMA_VERSION = schema_version(ResumeData)
+
 class ResumeParser:
+    # Model used per provider (also part of the parse cache key)
+    MODELS = {
+        "OpenAI": "gpt-4",
+        "Anthropic": "claude-3-haiku-20240307",
+        "Google": "gemini-pro",
+    }
+    
     def __init__(self, llm_provider: str, api_key: str):
         self.llm_provider = llm_provider
         self.api_key = api_key
@@ -64,7 +79,15 @@ class ResumeParser:
             return file.read()
     
     def parse_resume_with_llm(self, raw_text: str) -> ResumeData:
-        """Parse resume text using the selected LLM"""
+        """Parse resume text using the selected LLM (served from the parse cache when possible)"""
+        cache = get_parse_cache()
+        cache_key = parse_cache_key(raw_text, self.llm_provider, self.MODELS.get(self.llm_provider, ""),
+                                    RESUME_SCHEMA_VERSION)
+        if cache is not None:
+            cached = cache.get(cache_key)
+            if cached is not None:
+                return ResumeData(**cached)
+        
         prompt = self._create_parsing_prompt(raw_text)
         
         if self.llm_provider == "OpenAI":
@@ -76,7 +99,10 @@ class ResumeParser:
         else:
             raise ValueError(f"Unsupported LLM provider: {self.llm_provider}")
         
-        return self._parse_llm_response(response)
+        resume_data = self._parse_llm_response(response)
+        if cache is not None:
+            cache.put(cache_key, resume_data.model_dump())
+        return resume_data
     
     def _create_parsing_prompt(self, raw_text: str) -> str:
         """Create a detailed prompt for resume parsing"""
@@ -170,7 +196,7 @@ Important instructions:
         """Call OpenAI API"""
         try:
             response = openai.chat.completions.create(
-                model="gpt-4",
+                model=self.MODELS["OpenAI"],
                 messages=[{"role": "user", "content": prompt}],
                 temperature=0.1
             )
@@ -187,7 +213,7 @@ Important instructions:
         }
 
         data = {
-            "model": "claude-3-haiku-20240307",
+            "model": self.MODELS["Anthropic"],
             "max_tokens": 4000,
             "temperature": 0,
             "system": (
@@ -238,7 +264,7 @@ Important instructions:
     def _call_google(self, prompt: str) -> str:
         """Call Google Gemini API"""
         try:
-            model = genai.GenerativeModel('gemini-pro')
+            model = genai.GenerativeModel(self.MODELS["Google"])
             response = model.generate_content(prompt)
             return response.text
         except Exception as e:
@@ -0,0 +1,236 @@
+"""
+Matching benchmark on a synthetic Job/Skill/Resume graph.
+
+Generates jobs and resumes whose skills follow a Zipfian popularity curve
+(a few skills like "Python" on most postings, a long tail on few), loads
+them through the project's own ingest code and reports:
+
+  - ingest throughput (jobs/sec, resumes/sec)
+  - get_top_job_matches_for_resume latency percentiles
+  - batch throughput (resumes/sec through the batch matching path)
+  - Python heap used by the loaded index (tracemalloc)
+
+Usage (from the repo root):
+    python bench_matching.py --backend memory --jobs 20000 --resumes 1000
+    python bench_matching.py --backend neo4j --engine cypher --jobs 2000 --resumes 200
+    python bench_matching.py --backend memory --json results.json
+
+The neo4j backend writes nodes whose ids/names start with "bench-" into the
+database from config.py and deletes them afterwards (unless --keep).
+Both go through graph_store: Neo4jGraphStore for a database, and
+InMemoryGraphStore (no database process) for the in-memory stand-in.
+"""
+
+import argparse
+import json
+import random
+import statistics
+import time
+import tracemalloc
+from typing import Any, Dict, List, Tuple
+
+import config
+from graph_store import GraphStore, InMemoryGraphStore, Neo4jGraphStore
+from skill_index import SCORING_MODES
+
+PREFIX = "bench-"
+
+
+def zipf_weights(n: int, skew: float) -> List[float]:
+    """Popularity of the i-th most common skill ~ 1 / (i + 1)^skew"""
+    return [1.0 / (rank + 1) ** skew for rank in range(n)]
+
+
+def sample_skills(rng: random.Random, pool: List[str], weights: List[float], k: int) -> List[str]:
+    """k distinct skills drawn by popularity"""
+    picked: Dict[str, None] = {}
+    while len(picked) < min(k, len(pool)):
+        for name in rng.choices(pool, weights, k=k - len(picked)):
+            picked[name] = None
+    return list(picked)
+
+
+def make_corpus(jobs: int, resumes: int, skills: int, skew: float,
+                job_skills: int, resume_skills: int, seed: int = 7) -> Dict[str, Any]:
+    """Parsed job dicts (parse_jd_file shape) and (resume_id, name, email, skills) tuples"""
+    rng = random.Random(seed)
+    pool = [f"{PREFIX}skill-{i}" for i in range(skills)]
+    weights = zipf_weights(skills, skew)
+
+    job_jsons = [{
+        "job_id": f"{PREFIX}job-{i}",
+        "job_title": f"{PREFIX}{rng.choice(['Engineer', 'Analyst', 'Scientist', 'Developer'])} {i}",
+        "company": f"{PREFIX}company-{rng.randrange(max(jobs // 20, 1))}",
+        "location": f"{PREFIX}city-{rng.randrange(50)}",
+        "employment_type": rng.choice(["Full-time", "Contract", "Part-time"]),
+        "skills_required": sample_skills(rng, pool, weights, rng.randint(max(job_skills // 2, 1), job_skills)),
+    } for i in range(jobs)]
+
+    resume_rows = [(f"{PREFIX}resume-{i}", f"{PREFIX}Candidate {i}", f"{PREFIX}{i}@example.com",
+                    sample_skills(rng, pool, weights, rng.randint(max(resume_skills // 2, 1), resume_skills)))
+                   for i in range(resumes)]
+    return {"jobs": job_jsons, "resumes": resume_rows}
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    """Latency summary in milliseconds"""
+    ordered = sorted(samples)
+
+    def pick(q: float) -> float:
+        return ordered[min(int(q * len(ordered)), len(ordered) - 1)] * 1000
+
+    return {
+        "mean_ms": statistics.fmean(ordered) * 1000,
+        "p50_ms": pick(0.50),
+        "p90_ms": pick(0.90),
+        "p99_ms": pick(0.99),
+        "max_ms": ordered[-1] * 1000,
+    }
+
+
+def timed(fn, *args, **kwargs):
+    started = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - started
+
+
+def resume_data(corpus: Dict[str, Any]) -> List[Tuple[Any, str]]:
+    """(ResumeData, resume_id) pairs for GraphStore.upsert_resumes"""
+    from resume_schema import ResumeData, Skill
+
+    return [(ResumeData(personal_info={"name": name, "email": email},
+                        skills=[Skill(name=skill, category="Technical") for skill in skills]), resume_id)
+            for resume_id, name, email, skills in corpus["resumes"]]
+
+
+def cleanup_neo4j() -> None:
+    from graph_driver import get_driver
+
+    with get_driver().session() as session:
+        session.run("""
+            MATCH (n)
+            WHERE ((n:Job OR n:Resume) AND n.id STARTS WITH $prefix)
+               OR n.name STARTS WITH $prefix
+            CALL { WITH n DETACH DELETE n } IN TRANSACTIONS OF 10000 ROWS
+        """, prefix=PREFIX).consume()
+
+
+def open_store(args) -> GraphStore:
+    if args.backend == "memory":
+        return InMemoryGraphStore(engine=args.engine)
+
+    from graph_driver import get_driver
+    from graph_schema import ensure_schema
+
+    # Incremental MATCHES upkeep is measured separately (engine=materialized)
+    config.MATERIALIZE_MATCHES = False
+    ensure_schema(get_driver())
+    cleanup_neo4j()
+    return Neo4jGraphStore(engine=args.engine)
+
+
+def prepare_matching(store: GraphStore, args, resume_ids: List[str]) -> float:
+    """Build whatever the engine reads before the timed lookups; returns its heap size in MB"""
+    if args.engine == "materialized":
+        from matching import update_matches_for_resumes
+
+        _, seconds = timed(update_matches_for_resumes, resume_ids)
+        print(f"Materialized MATCHES for {len(resume_ids)} resumes in {seconds:.2f}s")
+        return 0.0
+    if args.engine not in ("index", "lsh"):
+        return 0.0
+
+    tracemalloc.start()
+    if isinstance(store, InMemoryGraphStore):
+        store.match_jobs(resume_ids[0])
+    else:
+        from matching import get_skill_lsh, refresh_skill_index
+
+        refresh_skill_index()
+        if args.engine == "lsh":
+            get_skill_lsh()
+    index_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return index_bytes / 1e6
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark resume -> job matching on a synthetic graph.")
+    ap.add_argument("--backend", choices=("memory", "neo4j"), default="memory")
+    ap.add_argument("--engine", default="index",
+                    help="Matching engine: neo4j backend accepts matching.MATCH_ENGINES, memory accepts index/lsh")
+    ap.add_argument("--scoring", choices=SCORING_MODES, default="overlap")
+    ap.add_argument("--jobs", type=int, default=5000)
+    ap.add_argument("--resumes", type=int, default=500)
+    ap.add_argument("--skills", type=int, default=2000, help="Distinct skills in the corpus")
+    ap.add_argument("--skew", type=float, default=1.1, help="Zipf exponent of skill popularity")
+    ap.add_argument("--job-skills", type=int, default=12, help="Max skills per job")
+    ap.add_argument("--resume-skills", type=int, default=25, help="Max skills per resume")
+    ap.add_argument("--queries", type=int, default=200, help="Single-resume lookups to time")
+    ap.add_argument("--limit", type=int, default=10)
+    ap.add_argument("--batch-size", type=int, default=500, help="Jobs/resumes per ingest call")
+    ap.add_argument("--lsh-bands", type=int, default=32)
+    ap.add_argument("--lsh-rows", type=int, default=2)
+    ap.add_argument("--seed", type=int, default=7)
+    ap.add_argument("--keep", action="store_true", help="Leave the bench-* nodes in Neo4j")
+    ap.add_argument("--json", help="Also write the results to this file")
+    args = ap.parse_args()
+
+    if args.backend == "memory" and args.engine not in ("index", "lsh"):
+        ap.error("the memory backend supports --engine index or lsh")
+
+    corpus = make_corpus(args.jobs, args.resumes, args.skills, args.skew,
+                         args.job_skills, args.resume_skills, seed=args.seed)
+    print(f"Corpus: {args.jobs} jobs, {args.resumes} resumes, {args.skills} skills (zipf {args.skew})")
+
+    config.LSH_BANDS, config.LSH_ROWS = args.lsh_bands, args.lsh_rows
+    store = open_store(args)
+    resumes = resume_data(corpus)
+    resume_ids = [resume_id for _, resume_id in resumes]
+    try:
+        jobs_seconds = sum(timed(store.upsert_jobs, corpus["jobs"][start:start + args.batch_size])[1]
+                           for start in range(0, len(corpus["jobs"]), args.batch_size))
+        resumes_seconds = sum(timed(store.upsert_resumes, resumes[start:start + args.batch_size])[1]
+                              for start in range(0, len(resumes), args.batch_size))
+        index_mb = prepare_matching(store, args, resume_ids)
+
+        rng = random.Random(args.seed)
+        samples = []
+        for _ in range(args.queries):
+            _, seconds = timed(store.match_jobs, rng.choice(resume_ids), limit=args.limit, scoring=args.scoring)
+            samples.append(seconds)
+        matched, batch_seconds = timed(store.match_jobs_many, resume_ids, limit=args.limit, scoring=args.scoring)
+    finally:
+        if args.backend == "neo4j" and not args.keep:
+            cleanup_neo4j()
+
+    results = {
+        "backend": args.backend,
+        "engine": args.engine,
+        "scoring": args.scoring,
+        "jobs": args.jobs,
+        "resumes": args.resumes,
+        "ingest_jobs_per_sec": args.jobs / jobs_seconds if jobs_seconds else 0.0,
+        "ingest_resumes_per_sec": args.resumes / resumes_seconds if resumes_seconds else 0.0,
+        "latency": percentiles(samples),
+        "batch_resumes_per_sec": len(matched) / batch_seconds if batch_seconds else 0.0,
+        "index_mb": index_mb,
+    }
+
+    latency = results["latency"]
+    print(f"Ingest:  {results['ingest_jobs_per_sec']:.0f} jobs/sec, "
+          f"{results['ingest_resumes_per_sec']:.0f} resumes/sec")
+    print(f"Latency ({args.queries} lookups, {args.backend}/{args.engine}/{args.scoring}): "
+          f"mean {latency['mean_ms']:.2f} ms, p50 {latency['p50_ms']:.2f} ms, "
+          f"p90 {latency['p90_ms']:.2f} ms, p99 {latency['p99_ms']:.2f} ms")
+    print(f"Batch:   {results['batch_resumes_per_sec']:.0f} resumes/sec")
+    if results["index_mb"]:
+        print(f"Index:   {results['index_mb']:.1f} MB Python heap")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as fh:
+            json.dump(results, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,11 +5,48 @@ from dotenv import load_dotenv
 load_dotenv()
 
 # Neo4j Configuration
-NEO4J_URI = os.getenv('NEO4J_URI', 'bolt://localhost:7687')
+NEO4J_URI = os.getenv('NEO4J_URI', 'neo4j://127.0.0.1:7687')
 NEO4J_USER = os.getenv('NEO4J_USER', 'neo4j')
 NEO4J_PASSWORD = os.getenv('NEO4J_PASSWORD', 'password')
 
+# Neo4j connection pool (shared per URI/user, see graph_driver.py)
+NEO4J_MAX_POOL_SIZE = int(os.getenv('NEO4J_MAX_POOL_SIZE', '100'))
+NEO4J_MAX_CONNECTION_LIFETIME = float(os.getenv('NEO4J_MAX_CONNECTION_LIFETIME', '3600'))  # seconds
+NEO4J_CONNECTION_ACQUISITION_TIMEOUT = float(os.getenv('NEO4J_CONNECTION_ACQUISITION_TIMEOUT', '60'))  # seconds
+
 # API Keys (optional - can be entered in UI)
 OPENAI_API_KEY = os.getenv('OPENAI_API_KEY', '')
 ANTHROPIC_API_KEY = os.getenv('ANTHROPIC_API_KEY', '')
 GOOGLE_API_KEY = os.getenv('GOOGLE_API_KEY', '')
+
+# LLM parse cache (content-addressed; set PARSE_CACHE_PATH to an empty string to disable)
+PARSE_CACHE_PATH = os.getenv('PARSE_CACHE_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'parse_cache.sqlite'))
+PARSE_CACHE_MAX_MB = int(os.getenv('PARSE_CACHE_MAX_MB', '256'))
+
+# Materialized (:Resume)-[:MATCHES]->(:Job) edges, updated on ingest (see matching.py)
+MATERIALIZE_MATCHES = os.getenv('MATERIALIZE_MATCHES', 'false').lower() in ('1', 'true', 'yes')
+MATCHES_TOP_N = int(os.getenv('MATCHES_TOP_N', '20'))
+
+# Match-result cache (match_cache.py): in-process LRU size; set MATCH_CACHE_PATH to share results on disk
+MATCH_CACHE_SIZE = int(os.getenv('MATCH_CACHE_SIZE', '1024'))
+MATCH_CACHE_PATH = os.getenv('MATCH_CACHE_PATH', '')
+MATCH_CACHE_MAX_MB = int(os.getenv('MATCH_CACHE_MAX_MB', '64'))
+
+# Split the in-process skill index into N job-id partitions, each scored in its own process (1 = off)
+MATCH_PARTITIONS = int(os.getenv('MATCH_PARTITIONS', '1'))
+
+# MinHash/LSH banding for the approximate "lsh" engine: more bands / fewer rows = higher recall, more candidates
+LSH_BANDS = int(os.getenv('LSH_BANDS', '32'))
+LSH_ROWS = int(os.getenv('LSH_ROWS', '2'))
+
+# GraphStore backend for graph_store.get_graph_store(): neo4j, or memory (in-process, nothing persisted)
+GRAPH_BACKEND = os.getenv('GRAPH_BACKEND', 'neo4j')
+
+# jobs_api concurrency limit: requests beyond API_MAX_CONCURRENCY wait up to API_QUEUE_TIMEOUT seconds, then get a 503
+API_MAX_CONCURRENCY = int(os.getenv('API_MAX_CONCURRENCY', '64'))
+API_QUEUE_TIMEOUT = float(os.getenv('API_QUEUE_TIMEOUT', '0.5'))
+
+# jobs_api response cache: entries also expire on every ingest (graph version, re-read at most once per interval)
+RESPONSE_CACHE_SIZE = int(os.getenv('RESPONSE_CACHE_SIZE', '512'))
+RESPONSE_CACHE_TTL = float(os.getenv('RESPONSE_CACHE_TTL', '60'))  # seconds
+RESPONSE_CACHE_VERSION_INTERVAL = float(os.getenv('RESPONSE_CACHE_VERSION_INTERVAL', '1'))  # seconds
@@ -0,0 +1,128 @@
+"""
+Persistent SQLite key/value cache with an LRU size cap.
+
+Used as the content-addressed LLM parse cache for job descriptions
+(jd_parser.parse_jd_file) and resumes (ResumeParser.parse_resume_with_llm):
+entries are keyed on a hash of the normalized input text, the provider/model
+and the output schema version, so re-running the pipeline or re-uploading a
+resume costs no LLM call unless one of those actually changed.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import config
+
+
+class DiskCache:
+    """JSON values in a single SQLite file, evicting least recently used entries past `max_bytes`."""
+
+    def __init__(self, path: str, max_bytes: int):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS entries_last_access ON entries(last_access)")
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._conn.execute("UPDATE entries SET last_access = ? WHERE key = ?", (time.time(), key))
+        return json.loads(row[0])
+
+    def put(self, key: str, value: Any) -> None:
+        data = json.dumps(value)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, last_access) VALUES (?, ?, ?, ?)",
+                (key, data, len(data), time.time()),
+            )
+            self._evict()
+
+    def _evict(self) -> None:
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        while total > self.max_bytes:
+            oldest = self._conn.execute(
+                "SELECT key, size FROM entries ORDER BY last_access LIMIT 64"
+            ).fetchall()
+            if not oldest:
+                break
+            for key, size in oldest:
+                if total <= self.max_bytes:
+                    break
+                self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                total -= size
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM entries")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+            ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": entries,
+            "bytes": size,
+            "max_bytes": self.max_bytes,
+        }
+
+
+def normalize_text(text: str) -> str:
+    """Whitespace-insensitive form of an LLM input, so re-saved files hash the same"""
+    return " ".join(text.split())
+
+
+def schema_version(model_cls, *extra: str) -> str:
+    """Short hash of a pydantic model's JSON schema (plus e.g. the prompt it is used with)"""
+    payload = json.dumps(model_cls.model_json_schema(), sort_keys=True) + "".join(extra)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def parse_cache_key(text: str, provider: str, model: str, version: str) -> str:
+    payload = "\x1f".join([provider, model, version, normalize_text(text)])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+_parse_cache = None
+_parse_cache_lock = threading.Lock()
+
+
+def get_parse_cache() -> Optional[DiskCache]:
+    """Process-wide parse cache from config.py; None when PARSE_CACHE_PATH is empty."""
+    global _parse_cache
+    if not config.PARSE_CACHE_PATH:
+        return None
+    with _parse_cache_lock:
+        if _parse_cache is None:
+            _parse_cache = DiskCache(config.PARSE_CACHE_PATH, config.PARSE_CACHE_MAX_MB * 1024 * 1024)
+    return _parse_cache
@@ -0,0 +1,112 @@
+"""
+One shared, pooled Neo4j driver per URI/user/password for the whole process.
+
+Every entry point (matching, run_matching, jd_to_neo4j, jobs_api and the
+Streamlit app through Neo4jManager) gets its driver from get_driver(), so
+connections are pooled across callers and reruns instead of re-doing the
+handshake each time. Drivers are created lazily on first use, sized from
+config.py, and closed at process exit.
+
+get_async_driver() is the AsyncGraphDatabase counterpart for async callers
+(the FastAPI endpoints). An async driver belongs to the event loop that
+uses it, so its owner closes it with close_all_async() on shutdown.
+"""
+
+import atexit
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+from neo4j import AsyncDriver, AsyncGraphDatabase, Driver, GraphDatabase
+
+import config
+
+# Keyed on (uri, user, password): callers with different credentials each keep
+# their own pool, and a driver is never closed under another thread's feet
+_drivers: Dict[Tuple[str, str, str], Driver] = {}
+_async_drivers: Dict[Tuple[str, str, str], AsyncDriver] = {}
+_lock = threading.Lock()
+
+
+def pool_settings() -> Dict[str, Any]:
+    return {
+        "max_connection_pool_size": config.NEO4J_MAX_POOL_SIZE,
+        "max_connection_lifetime": config.NEO4J_MAX_CONNECTION_LIFETIME,
+        "connection_acquisition_timeout": config.NEO4J_CONNECTION_ACQUISITION_TIMEOUT,
+    }
+
+
+def _credentials(uri: Optional[str], user: Optional[str], password: Optional[str]) -> Tuple[str, str, str]:
+    return (uri or config.NEO4J_URI, user or config.NEO4J_USER,
+            config.NEO4J_PASSWORD if password is None else password)
+
+
+def get_driver(uri: Optional[str] = None, user: Optional[str] = None,
+               password: Optional[str] = None) -> Driver:
+    """
+    Shared driver for (uri, user, password); arguments default to config.py.
+    A new password gets a new pool; the old one stays open (another session
+    may still be using it) until close_all() at process exit.
+    """
+    key = _credentials(uri, user, password)
+    with _lock:
+        driver = _drivers.get(key)
+        if driver is None:
+            driver = _drivers[key] = GraphDatabase.driver(key[0], auth=key[1:], **pool_settings())
+        return driver
+
+
+def get_async_driver(uri: Optional[str] = None, user: Optional[str] = None,
+                     password: Optional[str] = None) -> AsyncDriver:
+    """Shared async driver for (uri, user, password), pooled with the same settings."""
+    key = _credentials(uri, user, password)
+    with _lock:
+        driver = _async_drivers.get(key)
+        if driver is None:
+            driver = _async_drivers[key] = AsyncGraphDatabase.driver(key[0], auth=key[1:], **pool_settings())
+        return driver
+
+
+async def close_all_async() -> None:
+    with _lock:
+        drivers = list(_async_drivers.values())
+        _async_drivers.clear()
+    for driver in drivers:
+        await driver.close()
+
+
+def pool_stats() -> Dict[str, Any]:
+    """
+    Connection pool utilization per driver and server address. Reads the
+    driver's pool internals, so it degrades to an empty address map if
+    those change between driver versions.
+    """
+    stats = {}
+    with _lock:
+        drivers = [(f"{user}@{uri}", driver) for (uri, user, _), driver in _drivers.items()]
+        drivers += [(f"{user}@{uri} (async)", driver) for (uri, user, _), driver in _async_drivers.items()]
+    seen: Dict[str, int] = {}
+    for name, driver in drivers:
+        # one account with several passwords has several pools
+        seen[name] = seen.get(name, 0) + 1
+        if seen[name] > 1:
+            name = f"{name} #{seen[name]}"
+        addresses = {}
+        pool = getattr(driver, "_pool", None)
+        for address, connections in dict(getattr(pool, "connections", {}) or {}).items():
+            connections = list(connections)
+            in_use = sum(1 for c in connections if getattr(c, "in_use", False))
+            addresses[str(address)] = {"in_use": in_use, "idle": len(connections) - in_use}
+        stats[name] = {
+            "max_pool_size": config.NEO4J_MAX_POOL_SIZE,
+            "addresses": addresses,
+        }
+    return stats
+
+
+@atexit.register
+def close_all() -> None:
+    with _lock:
+        drivers = list(_drivers.values())
+        _drivers.clear()
+    for driver in drivers:
+        driver.close()
@@ -0,0 +1,168 @@
+"""
+Constraints and indexes for every node key the ingest and matching code
+MERGEs or MATCHes on (jd_to_neo4j, neo4j_manager, matching, run_matching).
+
+ensure_schema() is idempotent and runs at startup from the pipeline, the
+Streamlit app and jobs_api. Run this module to bootstrap a database by hand
+and print which lookups would still fall back to a label scan:
+
+    python graph_schema.py
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+from neo4j.exceptions import Neo4jError
+
+# Single-property node keys that are MERGEd on -> uniqueness constraints
+UNIQUE_KEYS: List[Tuple[str, str]] = [
+    ("Job", "id"),
+    ("Resume", "id"),
+    ("Skill", "key"),
+    ("Company", "name"),
+    ("Location", "name"),
+    ("Certification", "name"),
+    ("Education", "name"),
+    ("Tool", "name"),
+    ("Responsibility", "desc"),
+    ("Institute", "name"),
+    ("Degree", "name"),
+    ("Major", "name"),
+    ("Course", "name"),
+    ("Position", "name"),
+    ("Technology", "name"),
+    ("Language", "name"),
+    ("GraphMeta", "id"),
+]
+
+# Non-unique lookup keys -> range indexes
+INDEXED_KEYS: List[Tuple[str, str]] = [
+    ("Resume", "email"),
+    ("Skill", "version"),
+]
+
+# (index name, label, property) -> full-text indexes behind the text search
+# endpoints (graph_store.fulltext_query builds their Lucene queries). The
+# analyzer keeps stop words so titles like "IT Manager" stay searchable.
+FULLTEXT_INDEXES: List[Tuple[str, str, str]] = [
+    ("skill_name_fulltext", "Skill", "name"),
+    ("job_title_fulltext", "Job", "title"),
+]
+FULLTEXT_ANALYZER = "standard-no-stop-words"
+
+# (index name, label, property) -> TEXT indexes, which serve CONTAINS; the
+# substring fallbacks of the skill and job-title searches match on these
+# lowercase keys
+TEXT_INDEXES: List[Tuple[str, str, str]] = [
+    ("skill_key_text", "Skill", "key"),
+    ("job_title_key_text", "Job", "title_key"),
+]
+
+# Plain index created by the first skill-key migration; it blocks the
+# Skill.key uniqueness constraint, which provides the same index.
+LEGACY_INDEXES = ["skill_key"]
+
+SCAN_OPERATORS = ("NodeByLabelScan", "AllNodesScan")
+
+
+def schema_statements() -> List[Tuple[str, str]]:
+    """(name, Cypher) for every constraint and index, in creation order"""
+    statements = []
+    for label, prop in UNIQUE_KEYS:
+        name = f"{label.lower()}_{prop}_unique"
+        statements.append((name, f"CREATE CONSTRAINT {name} IF NOT EXISTS "
+                                 f"FOR (n:{label}) REQUIRE n.{prop} IS UNIQUE"))
+    for label, prop in INDEXED_KEYS:
+        name = f"{label.lower()}_{prop}"
+        statements.append((name, f"CREATE INDEX {name} IF NOT EXISTS FOR (n:{label}) ON (n.{prop})"))
+    for name, label, prop in FULLTEXT_INDEXES:
+        statements.append((name, f"CREATE FULLTEXT INDEX {name} IF NOT EXISTS FOR (n:{label}) ON EACH [n.{prop}] "
+                                 f"OPTIONS {{indexConfig: {{`fulltext.analyzer`: '{FULLTEXT_ANALYZER}'}}}}"))
+    for name, label, prop in TEXT_INDEXES:
+        statements.append((name, f"CREATE TEXT INDEX {name} IF NOT EXISTS FOR (n:{label}) ON (n.{prop})"))
+    return statements
+
+
+def ensure_schema(driver) -> Dict[str, Any]:
+    """
+    Create any missing constraints/indexes. Failures (e.g. existing duplicate
+    values blocking a constraint) are reported rather than raised, so callers
+    can run this on every startup.
+    """
+    report: Dict[str, Any] = {"ensured": [], "failed": {}, "missing": []}
+    with driver.session() as session:
+        for name in LEGACY_INDEXES:
+            session.run(f"DROP INDEX {name} IF EXISTS").consume()
+        for name, statement in schema_statements():
+            try:
+                session.run(statement).consume()
+                report["ensured"].append(name)
+            except Neo4jError as e:
+                report["failed"][name] = e.message or str(e)
+
+    report["missing"] = missing_indexes(driver)
+    return report
+
+
+def missing_indexes(driver) -> List[Tuple[str, str]]:
+    """(label, property) pairs with no ONLINE index backing them"""
+    with driver.session() as session:
+        rows = session.run("""
+            SHOW INDEXES YIELD entityType, labelsOrTypes, properties, state
+            WHERE entityType = 'NODE' AND state = 'ONLINE'
+            RETURN labelsOrTypes, properties
+        """)
+        online = {(labels[0], props[0]) for labels, props in (r.values() for r in rows)
+                  if labels and props and len(props) == 1}
+    return [key for key in UNIQUE_KEYS + INDEXED_KEYS if key not in online]
+
+
+def _scan_operators(plan: Dict[str, Any]) -> List[str]:
+    found = []
+    operator = plan.get("operatorType", "").split("@")[0]
+    if operator in SCAN_OPERATORS:
+        found.append(f"{operator} {plan.get('args', {}).get('Details', '')}".strip())
+    for child in plan.get("children", []):
+        found.extend(_scan_operators(child))
+    return found
+
+
+def check_query_plans(driver, queries: Optional[Dict[str, Tuple[str, Dict[str, Any]]]] = None) -> Dict[str, List[str]]:
+    """
+    EXPLAIN each query and return the label/all-node scans its plan uses,
+    keyed by query name. Defaults to one keyed lookup per schema entry.
+    """
+    if queries is None:
+        queries = {
+            f"{label}.{prop}": (f"MATCH (n:{label} {{{prop}: $value}}) RETURN n", {"value": ""})
+            for label, prop in UNIQUE_KEYS + INDEXED_KEYS
+        }
+
+    scans = {}
+    with driver.session() as session:
+        for name, (query, params) in queries.items():
+            plan = session.run(f"EXPLAIN {query}", **params).consume().plan or {}
+            found = _scan_operators(plan)
+            if found:
+                scans[name] = found
+    return scans
+
+
+def print_schema_report(report: Dict[str, Any]) -> None:
+    print(f"Neo4j schema: {len(report['ensured'])} constraints/indexes in place.")
+    for name, error in report["failed"].items():
+        print(f"[WARN] Could not create {name}: {error}")
+    for label, prop in report["missing"]:
+        print(f"[WARN] No online index for :{label}({prop}); lookups on it will scan every {label} node.")
+
+
+if __name__ == "__main__":
+    from graph_driver import get_driver
+
+    driver = get_driver()
+
+    print_schema_report(ensure_schema(driver))
+    scans = check_query_plans(driver)
+    if not scans:
+        print("All keyed lookups are index-backed.")
+    for name, operators in scans.items():
+        print(f"[WARN] {name}: plan uses {', '.join(operators)}")
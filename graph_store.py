@@ -0,0 +1,562 @@
+"""
+GraphStore: the graph operations the project actually performs, behind one
+interface with two backends.
+
+  - Neo4jGraphStore delegates to the existing Neo4j code paths
+    (jd_to_neo4j, Neo4jManager, matching), so behaviour is unchanged.
+  - InMemoryGraphStore keeps jobs and resumes in dicts and scores matches
+    with the SkillIndex posting arrays, rebuilt lazily after writes. It
+    needs no database process, so tests, benchmarks and small single-process
+    deployments run at in-process latency.
+
+get_graph_store() returns the backend selected by config.GRAPH_BACKEND.
+
+The read paths the API serves (list_jobs, iter_jobs, search_jobs_by_skill,
+job_details) also have *_async variants. Neo4jGraphStore runs them on the async driver in
+execute_read transactions; the in-memory store answers them inline.
+"""
+
+import os
+import sys
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+import config
+from skill_index import SkillIndex
+from skill_keys import canonical_skill_key, canonical_skills
+
+# Ingest code lives in the subprojects; their modules import root modules the same way
+_ROOT = os.path.dirname(os.path.abspath(__file__))
+for _subdir in (("JobParser", "src"), ("ResumeParser", "src")):
+    _path = os.path.join(_ROOT, *_subdir)
+    if _path not in sys.path:
+        sys.path.append(_path)
+
+
+# Keyset pagination: seek past the cursor on the Job.id uniqueness index and
+# read in index order, so page N costs the same as page 1 (no SKIP/OFFSET)
+LIST_JOBS_QUERY = """
+MATCH (j:Job) WHERE j.id > $after AND NOT j:RetiredJob
+WITH j ORDER BY j.id LIMIT $limit
+RETURN j.id AS id, j.title AS title, j.employment_type AS type,
+       head([(j)-[:LOCATED_AT]->(l:Location) | l.name]) AS location
+"""
+
+EXPORT_JOBS_QUERY = """
+MATCH (j:Job) WHERE j.id IS NOT NULL AND NOT j:RetiredJob
+WITH j ORDER BY j.id
+RETURN j.id AS id, j.title AS title, j.employment_type AS type,
+       [(c:Company)-[:POSTS]->(j) | c.name] AS companies,
+       [(j)-[:LOCATED_AT]->(l:Location) | l.name] AS locations,
+       [(j)-[:REQUIRES_SKILL]->(s:Skill) | s.name] AS skills,
+       [(j)-[:USES_TOOL]->(t:Tool) | t.name] AS tools
+"""
+
+# Both text searches go through the full-text indexes from graph_schema.FULLTEXT_INDEXES
+# instead of scanning every Skill / Job name with CONTAINS. Lucene matches whole
+# words, so skills merely containing the text ("PostgreSQL" for "sql") are added
+# from the Skill.key TEXT index with score 0, ranked below every full-text hit.
+SEARCH_JOBS_BY_SKILL_QUERY = """
+CALL db.index.fulltext.queryNodes('skill_name_fulltext', $query, {limit: $skill_limit})
+YIELD node, score
+WITH collect({skill: node, score: score}) AS hits
+CALL {
+    WITH hits
+    MATCH (s:Skill) WHERE s.key CONTAINS $needle AND NOT s IN [hit IN hits | hit.skill]
+    WITH s ORDER BY size(s.key), s.key LIMIT $skill_limit
+    RETURN collect({skill: s, score: 0.0}) AS substring_hits
+}
+UNWIND hits + substring_hits AS hit
+WITH hit.skill AS s, hit.score AS score
+MATCH (s)<-[:REQUIRES_SKILL]-(j:Job)-[:LOCATED_AT]->(l:Location)
+WHERE NOT j:RetiredJob
+RETURN j.title AS title, l.name AS location, s.name AS skill_match
+ORDER BY score DESC, title, location
+LIMIT $limit
+"""
+
+_JOB_DETAILS_RETURN = """
+OPTIONAL MATCH (j)-[:REQUIRES_SKILL]->(s:Skill)
+OPTIONAL MATCH (j)-[:USES_TOOL]->(t:Tool)
+WITH j, collect(DISTINCT s.name) AS Skills, collect(DISTINCT t.name) AS Tools
+RETURN j.title AS JobTitle, Skills, Tools
+"""
+
+JOB_DETAILS_QUERY = """
+CALL db.index.fulltext.queryNodes('job_title_fulltext', $query, {limit: 10})
+YIELD node AS j, score
+WITH j, score WHERE NOT j:RetiredJob
+ORDER BY score DESC
+LIMIT 1
+""" + _JOB_DETAILS_RETURN
+
+# Only run when the full-text index has no hit: titles merely containing the
+# text, shortest (closest) first, from the Job.title_key TEXT index
+JOB_DETAILS_SUBSTRING_QUERY = """
+MATCH (j:Job) WHERE j.title_key CONTAINS $needle AND NOT j:RetiredJob
+WITH j ORDER BY size(j.title_key), j.title_key
+LIMIT 1
+""" + _JOB_DETAILS_RETURN
+
+# Skills considered per search: bounds the traversal for very broad terms
+SEARCH_SKILL_CANDIDATES = 20
+
+_LUCENE_SPECIAL = set('+-&|!(){}[]^"~*?:\\/')
+
+
+def fulltext_query(text: str) -> Optional[str]:
+    """
+    Lucene query for free text typed into a search box: every word must
+    match, exactly (boosted), as a prefix, or (for words of 4+ characters)
+    within one edit. Query syntax characters are escaped. None for blank input.
+    """
+    clauses = []
+    for word in text.lower().split():
+        term = "".join("\\" + ch if ch in _LUCENE_SPECIAL else ch for ch in word)
+        options = [f"{term}^2", f"{term}*"]
+        if len(word) >= 4:
+            options.append(f"{term}~1")
+        clauses.append("(" + " OR ".join(options) + ")")
+    return " AND ".join(clauses) or None
+
+
+def _needle(text: str) -> str:
+    """Search text as the substring fallbacks (and the in-memory store) match it"""
+    return " ".join(text.lower().split())
+
+
+def text_rank(needle: str, text: Optional[str]) -> Optional[int]:
+    """In-memory stand-in for the full-text score: 0 exact, 1 prefix, 2 word prefix, 3 substring"""
+    text = (text or "").lower()
+    if not needle or needle not in text:
+        return None
+    if text == needle:
+        return 0
+    if text.startswith(needle):
+        return 1
+    return 2 if f" {needle}" in text else 3
+
+
+class GraphStore(ABC):
+    """Job/resume graph operations used by ingest, matching, the API and the CLI."""
+
+    @abstractmethod
+    def upsert_jobs(self, job_jsons: List[Dict[str, Any]]) -> List[str]:
+        """Write parsed job descriptions (parse_jd_file shape); returns their ids"""
+
+    def upsert_job(self, job_json: Dict[str, Any]) -> str:
+        return self.upsert_jobs([job_json])[0]
+
+    @abstractmethod
+    def retire_jobs(self, job_ids: List[str]) -> List[str]:
+        """Hide jobs from matching, search and skill counts (re-upserting revives them); returns the ids retired"""
+
+    @abstractmethod
+    def upsert_resumes(self, resumes: List[Tuple[Any, str]]) -> None:
+        """Write (ResumeData, resume_id) pairs"""
+
+    def upsert_resume(self, resume_data, resume_id: str) -> None:
+        self.upsert_resumes([(resume_data, resume_id)])
+
+    @abstractmethod
+    def list_resumes(self, limit: int = 25) -> List[Dict[str, Any]]:
+        """id, name, email and skill_count per resume, ordered by name, email, id"""
+
+    @abstractmethod
+    def resume_id_by_email(self, email: str) -> Optional[str]:
+        pass
+
+    @abstractmethod
+    def match_jobs(self, resume_id: str, limit: int = 5, scoring: str = "overlap") -> List[Dict[str, Any]]:
+        """Same rows as matching.get_top_job_matches_for_resume"""
+
+    def match_jobs_many(self, resume_ids: List[str], limit: int = 5,
+                        scoring: str = "overlap") -> List[List[Dict[str, Any]]]:
+        return [self.match_jobs(resume_id, limit=limit, scoring=scoring) for resume_id in resume_ids]
+
+    @abstractmethod
+    def list_jobs(self, limit: int = 50, after: str = "") -> List[Dict[str, Any]]:
+        """id, title, type, location of the first `limit` jobs with id > `after`, ordered by id"""
+
+    @abstractmethod
+    def iter_jobs(self) -> Iterator[Dict[str, Any]]:
+        """Every job as id, title, type, companies, locations, skills, tools, ordered by id"""
+
+    @abstractmethod
+    def search_jobs_by_skill(self, skill_name: str, limit: int = 50) -> List[Dict[str, Any]]:
+        """title, location, skill_match for jobs requiring a skill matching `skill_name`, best match first"""
+
+    @abstractmethod
+    def job_details(self, job_title: str) -> Optional[Dict[str, Any]]:
+        """JobTitle, Skills, Tools of the job whose title best matches `job_title`"""
+
+    async def list_jobs_async(self, limit: int = 50, after: str = "") -> List[Dict[str, Any]]:
+        return self.list_jobs(limit=limit, after=after)
+
+    async def iter_jobs_async(self) -> AsyncIterator[Dict[str, Any]]:
+        for row in self.iter_jobs():
+            yield row
+
+    async def search_jobs_by_skill_async(self, skill_name: str, limit: int = 50) -> List[Dict[str, Any]]:
+        return self.search_jobs_by_skill(skill_name, limit=limit)
+
+    async def job_details_async(self, job_title: str) -> Optional[Dict[str, Any]]:
+        return self.job_details(job_title)
+
+    @abstractmethod
+    def skill_weights(self, since: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        key, name, job_count per skill that jobs require; with `since`, the
+        skills changed after that graph version (including ones now at 0)
+        """
+
+    async def skill_weights_async(self, since: Optional[int] = None) -> List[Dict[str, Any]]:
+        return self.skill_weights(since=since)
+
+    @abstractmethod
+    def graph_version(self) -> int:
+        """Monotonic counter bumped by every write (see graph_version.py)"""
+
+    async def graph_version_async(self) -> int:
+        return self.graph_version()
+
+
+class Neo4jGraphStore(GraphStore):
+    """GraphStore over the configured Neo4j database."""
+
+    def __init__(self, engine: str = "cypher", uri: Optional[str] = None,
+                 user: Optional[str] = None, password: Optional[str] = None):
+        from graph_driver import get_driver
+
+        self.engine = engine
+        self.uri = uri or config.NEO4J_URI
+        self.user = user or config.NEO4J_USER
+        self.password = config.NEO4J_PASSWORD if password is None else password
+        self.driver = get_driver(self.uri, self.user, self.password)
+
+    def upsert_jobs(self, job_jsons: List[Dict[str, Any]]) -> List[str]:
+        from jd_to_neo4j import create_job_graphs
+
+        return create_job_graphs(job_jsons)
+
+    def retire_jobs(self, job_ids: List[str]) -> List[str]:
+        from jd_to_neo4j import retire_jobs
+
+        return retire_jobs(job_ids)
+
+    def upsert_resumes(self, resumes: List[Tuple[Any, str]]) -> None:
+        """Resume ids must be new: resumes are created, not merged (Resume.id is unique)"""
+        from neo4j_manager import Neo4jManager
+
+        Neo4jManager(self.uri, self.user, self.password).create_resume_nodes(resumes)
+
+    def list_resumes(self, limit: int = 25) -> List[Dict[str, Any]]:
+        query = """
+        MATCH (r:Resume)
+        OPTIONAL MATCH (r)-[hs:HAS_SKILL]->(:Skill)
+        WITH r, count(hs) AS skill_count
+        RETURN r.id AS id, r.name AS name, r.email AS email, skill_count
+        ORDER BY coalesce(r.name, ''), coalesce(r.email, ''), coalesce(r.id, '')
+        LIMIT $limit
+        """
+        with self.driver.session() as session:
+            return [record.data() for record in session.run(query, limit=limit)]
+
+    def resume_id_by_email(self, email: str) -> Optional[str]:
+        with self.driver.session() as session:
+            record = session.run("MATCH (r:Resume {email: $email}) RETURN r.id AS id LIMIT 1",
+                                 email=email).single()
+            return record["id"] if record else None
+
+    def match_jobs(self, resume_id: str, limit: int = 5, scoring: str = "overlap") -> List[Dict[str, Any]]:
+        from matching import get_top_job_matches_for_resume
+
+        return get_top_job_matches_for_resume(resume_id, limit=limit, engine=self.engine, scoring=scoring)
+
+    def match_jobs_many(self, resume_ids: List[str], limit: int = 5,
+                        scoring: str = "overlap") -> List[List[Dict[str, Any]]]:
+        if self.engine != "index":
+            return super().match_jobs_many(resume_ids, limit=limit, scoring=scoring)
+        from matching import iter_matches_for_all_resumes
+
+        found = {resume["resume_id"]: matches for resume, matches
+                 in iter_matches_for_all_resumes(limit=limit, resume_ids=resume_ids, scoring=scoring)}
+        return [found.get(resume_id, []) for resume_id in resume_ids]
+
+    # `cypher`, not `query`: the text searches pass a Lucene `query` parameter
+    def _read(self, cypher: str, **params) -> List[Dict[str, Any]]:
+        with self.driver.session() as session:
+            return session.execute_read(_read_rows, cypher, params)
+
+    async def _read_async(self, cypher: str, **params) -> List[Dict[str, Any]]:
+        from graph_driver import get_async_driver
+
+        async with get_async_driver(self.uri, self.user, self.password).session() as session:
+            return await session.execute_read(_read_rows_async, cypher, params)
+
+    def list_jobs(self, limit: int = 50, after: str = "") -> List[Dict[str, Any]]:
+        return self._read(LIST_JOBS_QUERY, limit=limit, after=after)
+
+    def iter_jobs(self, fetch_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        """Rows are pulled from the server `fetch_size` records at a time, never all held at once"""
+        from neo4j import READ_ACCESS
+
+        with self.driver.session(fetch_size=fetch_size, default_access_mode=READ_ACCESS) as session:
+            for record in session.run(EXPORT_JOBS_QUERY):
+                yield record.data()
+
+    def search_jobs_by_skill(self, skill_name: str, limit: int = 50) -> List[Dict[str, Any]]:
+        query = fulltext_query(skill_name)
+        if query is None:
+            return []
+        return self._read(SEARCH_JOBS_BY_SKILL_QUERY, query=query, needle=canonical_skill_key(skill_name),
+                          skill_limit=SEARCH_SKILL_CANDIDATES, limit=limit)
+
+    def job_details(self, job_title: str) -> Optional[Dict[str, Any]]:
+        query = fulltext_query(job_title)
+        if query is None:
+            return None
+        rows = (self._read(JOB_DETAILS_QUERY, query=query)
+                or self._read(JOB_DETAILS_SUBSTRING_QUERY, needle=canonical_skill_key(job_title)))
+        return rows[0] if rows else None
+
+    async def list_jobs_async(self, limit: int = 50, after: str = "") -> List[Dict[str, Any]]:
+        return await self._read_async(LIST_JOBS_QUERY, limit=limit, after=after)
+
+    async def iter_jobs_async(self, fetch_size: int = 1000) -> AsyncIterator[Dict[str, Any]]:
+        from neo4j import READ_ACCESS
+        from graph_driver import get_async_driver
+
+        driver = get_async_driver(self.uri, self.user, self.password)
+        async with driver.session(fetch_size=fetch_size, default_access_mode=READ_ACCESS) as session:
+            result = await session.run(EXPORT_JOBS_QUERY)
+            async for record in result:
+                yield record.data()
+
+    async def search_jobs_by_skill_async(self, skill_name: str, limit: int = 50) -> List[Dict[str, Any]]:
+        query = fulltext_query(skill_name)
+        if query is None:
+            return []
+        return await self._read_async(SEARCH_JOBS_BY_SKILL_QUERY, query=query, needle=canonical_skill_key(skill_name),
+                                      skill_limit=SEARCH_SKILL_CANDIDATES, limit=limit)
+
+    async def job_details_async(self, job_title: str) -> Optional[Dict[str, Any]]:
+        query = fulltext_query(job_title)
+        if query is None:
+            return None
+        rows = (await self._read_async(JOB_DETAILS_QUERY, query=query)
+                or await self._read_async(JOB_DETAILS_SUBSTRING_QUERY, needle=canonical_skill_key(job_title)))
+        return rows[0] if rows else None
+
+    def skill_weights(self, since: Optional[int] = None) -> List[Dict[str, Any]]:
+        from skill_suggest import ALL_SKILL_WEIGHTS_QUERY, SKILL_WEIGHTS_SINCE_QUERY
+
+        if since is None:
+            return self._read(ALL_SKILL_WEIGHTS_QUERY)
+        return self._read(SKILL_WEIGHTS_SINCE_QUERY, since=since)
+
+    async def skill_weights_async(self, since: Optional[int] = None) -> List[Dict[str, Any]]:
+        from skill_suggest import ALL_SKILL_WEIGHTS_QUERY, SKILL_WEIGHTS_SINCE_QUERY
+
+        if since is None:
+            return await self._read_async(ALL_SKILL_WEIGHTS_QUERY)
+        return await self._read_async(SKILL_WEIGHTS_SINCE_QUERY, since=since)
+
+    def graph_version(self) -> int:
+        from graph_version import get_graph_version
+
+        return get_graph_version(self.driver)
+
+    async def graph_version_async(self) -> int:
+        from graph_version import GRAPH_VERSION_QUERY
+
+        return (await self._read_async(GRAPH_VERSION_QUERY))[0]["version"]
+
+
+class InMemoryGraphStore(GraphStore):
+    """
+    Pure-Python GraphStore. Jobs keep the parameter maps jd_to_neo4j writes
+    (re-upserting a job replaces its lists like jd_to_neo4j does, and brings
+    a retired job back from `retired`); resumes keep
+    their canonical skill keys. Like Skill nodes, a skill keeps the display
+    name it was first written with. Matching uses a SkillIndex built from
+    the jobs, rebuilt on the first match after a job write.
+    """
+
+    def __init__(self, engine: str = "index"):
+        if engine not in ("index", "lsh"):
+            raise ValueError(f"InMemoryGraphStore supports the index and lsh engines, not {engine}")
+        self.engine = engine
+        self.jobs: Dict[str, Dict[str, Any]] = {}
+        self.retired: Dict[str, Dict[str, Any]] = {}
+        self.resumes: Dict[str, Dict[str, Any]] = {}
+        self.skills: Dict[str, str] = {}
+        self._version = 0
+        self._index: Optional[SkillIndex] = None
+        self._lsh = None
+        self._lock = threading.RLock()
+
+    def upsert_jobs(self, job_jsons: List[Dict[str, Any]]) -> List[str]:
+        from jd_to_neo4j import _job_params
+
+        ids = []
+        with self._lock:
+            for job_json in job_jsons:
+                params = _job_params(job_json)
+                self.retired.pop(params["job_id"], None)
+                for skill in params["skills"]:
+                    self.skills.setdefault(skill["key"], skill["name"])
+                self.jobs[params["job_id"]] = params
+                ids.append(params["job_id"])
+            self._version += 1
+            self._index = self._lsh = None
+        return ids
+
+    def retire_jobs(self, job_ids: List[str]) -> List[str]:
+        with self._lock:
+            retired = [job_id for job_id in dict.fromkeys(job_ids) if job_id in self.jobs]
+            for job_id in retired:
+                self.retired[job_id] = self.jobs.pop(job_id)
+            self._version += 1
+            self._index = self._lsh = None
+        return retired
+
+    def upsert_resumes(self, resumes: List[Tuple[Any, str]]) -> None:
+        with self._lock:
+            for resume_data, resume_id in resumes:
+                skills = canonical_skills(skill.name for skill in resume_data.skills)
+                for key, name in skills:
+                    self.skills.setdefault(key, name)
+                self.resumes[resume_id] = {
+                    "id": resume_id,
+                    "name": resume_data.personal_info.get("name", ""),
+                    "email": resume_data.personal_info.get("email", ""),
+                    "skills": [key for key, _ in skills],
+                }
+            self._version += 1
+
+    def list_resumes(self, limit: int = 25) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = [{"id": r["id"], "name": r["name"], "email": r["email"], "skill_count": len(r["skills"])}
+                    for r in self.resumes.values()]
+        rows.sort(key=lambda r: (r["name"] or "", r["email"] or "", r["id"] or ""))
+        return rows[:limit]
+
+    def resume_id_by_email(self, email: str) -> Optional[str]:
+        with self._lock:
+            return next((r["id"] for r in self.resumes.values() if r["email"] == email), None)
+
+    def skill_index(self) -> SkillIndex:
+        with self._lock:
+            if self._index is None:
+                self._index = SkillIndex.build({
+                    "job_id": job["job_id"],
+                    "title": job["title"],
+                    "company": job["companies"][0] if job["companies"] else None,
+                    "location": job["locations"][0] if job["locations"] else None,
+                    "employment_type": job["employment_type"],
+                    "skills": [self.skills[skill["key"]] for skill in job["skills"]],
+                } for job in self.jobs.values())
+            return self._index
+
+    def _matcher(self):
+        if self.engine == "index":
+            return self.skill_index()
+        with self._lock:
+            if self._lsh is None:
+                from skill_lsh import SkillLSH
+
+                self._lsh = SkillLSH(self.skill_index(), bands=config.LSH_BANDS, rows=config.LSH_ROWS)
+            return self._lsh
+
+    def match_jobs(self, resume_id: str, limit: int = 5, scoring: str = "overlap") -> List[Dict[str, Any]]:
+        return self.match_jobs_many([resume_id], limit=limit, scoring=scoring)[0]
+
+    def match_jobs_many(self, resume_ids: List[str], limit: int = 5,
+                        scoring: str = "overlap") -> List[List[Dict[str, Any]]]:
+        skill_lists = [self.resumes[r]["skills"] if r in self.resumes else [] for r in resume_ids]
+        return self._matcher().top_jobs_many(skill_lists, limit=limit, scoring=scoring)
+
+    def list_jobs(self, limit: int = 50, after: str = "") -> List[Dict[str, Any]]:
+        with self._lock:
+            jobs = sorted((job for job in self.jobs.values() if job["job_id"] > after),
+                          key=lambda job: job["job_id"])[:limit]
+        return [{"id": job["job_id"], "title": job["title"], "type": job["employment_type"],
+                 "location": job["locations"][0] if job["locations"] else None} for job in jobs]
+
+    def iter_jobs(self) -> Iterator[Dict[str, Any]]:
+        with self._lock:
+            jobs = sorted(self.jobs.values(), key=lambda job: job["job_id"])
+            names = dict(self.skills)
+        for job in jobs:
+            yield {"id": job["job_id"], "title": job["title"], "type": job["employment_type"],
+                   "companies": list(job["companies"]), "locations": list(job["locations"]),
+                   "skills": [names[skill["key"]] for skill in job["skills"]], "tools": list(job["tools"])}
+
+    def search_jobs_by_skill(self, skill_name: str, limit: int = 50) -> List[Dict[str, Any]]:
+        needle = _needle(skill_name)
+        with self._lock:
+            jobs = list(self.jobs.values())
+            names = dict(self.skills)
+        ranked = []
+        for job in jobs:
+            for skill in job["skills"]:
+                rank = text_rank(needle, names[skill["key"]])
+                if rank is not None:
+                    ranked.extend((rank, job["title"] or "", location, names[skill["key"]])
+                                  for location in job["locations"])
+        ranked.sort(key=lambda row: row[:3])
+        return [{"title": title, "location": location, "skill_match": skill}
+                for _, title, location, skill in ranked[:limit]]
+
+    def job_details(self, job_title: str) -> Optional[Dict[str, Any]]:
+        needle = _needle(job_title)
+        with self._lock:
+            ranked = [(rank, n, job) for n, job in enumerate(self.jobs.values())
+                      if (rank := text_rank(needle, job["title"])) is not None]
+            if not ranked:
+                return None
+            job = min(ranked, key=lambda row: row[:2])[2]
+            return {"JobTitle": job["title"],
+                    "Skills": [self.skills[skill["key"]] for skill in job["skills"]],
+                    "Tools": list(job["tools"])}
+
+    def skill_weights(self, since: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Every skill with its current job count; `since` is ignored (nothing is stamped here)"""
+        with self._lock:
+            counts = dict.fromkeys(self.skills, 0)
+            for job in self.jobs.values():
+                for skill in job["skills"]:
+                    counts[skill["key"]] += 1
+            return [{"key": key, "name": self.skills[key], "job_count": count} for key, count in counts.items()]
+
+    def graph_version(self) -> int:
+        return self._version
+
+
+def _read_rows(tx, query: str, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return tx.run(query, **params).data()
+
+
+async def _read_rows_async(tx, query: str, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+    result = await tx.run(query, **params)
+    return await result.data()
+
+
+_graph_store = None
+_graph_store_lock = threading.Lock()
+
+
+def get_graph_store() -> GraphStore:
+    """Process-wide store for config.GRAPH_BACKEND ("neo4j" or "memory")"""
+    global _graph_store
+    with _graph_store_lock:
+        if _graph_store is None:
+            if config.GRAPH_BACKEND == "memory":
+                _graph_store = InMemoryGraphStore()
+            elif config.GRAPH_BACKEND == "neo4j":
+                _graph_store = Neo4jGraphStore()
+            else:
+                raise ValueError(f"Unknown GRAPH_BACKEND: {config.GRAPH_BACKEND}")
+    return _graph_store
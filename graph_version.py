@@ -0,0 +1,33 @@
+"""
+Monotonic graph version stored on a single (:GraphMeta {id: 'graph'}) node.
+
+Every ingest transaction (jd_to_neo4j, neo4j_manager, the materialized
+MATCHES updates in matching) calls bump_graph_version(tx) before it commits,
+so caches can key results on get_graph_version() and never serve matches
+computed against an older graph.
+"""
+
+from graph_driver import get_driver
+
+BUMP_GRAPH_VERSION_QUERY = """
+MERGE (meta:GraphMeta {id: 'graph'})
+SET meta.version = coalesce(meta.version, 0) + 1
+RETURN meta.version AS version
+"""
+
+GRAPH_VERSION_QUERY = """
+OPTIONAL MATCH (meta:GraphMeta {id: 'graph'})
+RETURN coalesce(meta.version, 0) AS version
+"""
+
+
+def bump_graph_version(tx) -> int:
+    """Increment the graph version inside an open write transaction"""
+    return tx.run(BUMP_GRAPH_VERSION_QUERY).single()["version"]
+
+
+def get_graph_version(driver=None) -> int:
+    """Current graph version (0 before the first ingest)"""
+    with (driver or get_driver()).session() as session:
+        return session.run(GRAPH_VERSION_QUERY).single()["version"]
+
@@ -0,0 +1,137 @@
+"""
+Cache in front of matching.get_top_job_matches_for_resume.
+
+Results are keyed on (resume_id, limit, engine/scoring params) plus the
+graph version from graph_version.py. Ingest bumps that version, so a cached
+entry can never outlive the graph it was computed from; stale entries are
+simply never asked for again and age out of the LRU. The index and lsh
+engines are not cached: they score against this process's in-memory
+SkillIndex snapshot, which other processes' ingests do not refresh.
+
+Two tiers: an in-process LRU (OrderedDict) and, when MATCH_CACHE_PATH is
+set, a DiskCache shared by every process on the machine (run_matching.py
+runs, the Streamlit app, ...). get_match_cache() keeps one cache per set
+of Neo4j credentials, and disk keys carry the uri/user so databases sharing
+the file never serve each other's results.
+"""
+
+import functools
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import config
+from disk_cache import DiskCache
+from graph_driver import get_driver
+from graph_version import get_graph_version
+from matching import get_top_job_matches_for_resume
+
+# Engines that read the in-process skill index rather than the graph
+UNCACHED_ENGINES = ("index", "lsh")
+
+
+class MatchCache:
+    """LRU of match lists, optionally backed by a shared DiskCache."""
+
+    def __init__(self, max_entries: int = 1024, disk: Optional[DiskCache] = None,
+                 compute: Callable[..., List[Dict[str, Any]]] = get_top_job_matches_for_resume,
+                 version: Callable[[], int] = get_graph_version, namespace: str = ""):
+        self.max_entries = max_entries
+        self.disk = disk
+        self.namespace = namespace
+        self._compute = compute
+        self._version = version
+        self._entries: "OrderedDict[str, List[Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def key(self, resume_id: str, limit: int, version: int, params: Dict[str, Any]) -> str:
+        return json.dumps(["matches", self.namespace, resume_id, limit, version, sorted(params.items())])
+
+    def get_matches(self, resume_id: str, limit: int = 5, **params) -> List[Dict[str, Any]]:
+        """
+        Same result as get_top_job_matches_for_resume(resume_id, limit, **params),
+        served from cache while the graph version is unchanged (index and lsh
+        engine results are always recomputed, see UNCACHED_ENGINES).
+        """
+        if params.get("engine") in UNCACHED_ENGINES:
+            return self._compute(resume_id, limit=limit, **params)
+        key = self.key(resume_id, limit, self._version(), params)
+
+        with self._lock:
+            matches = self._entries.get(key)
+            if matches is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return matches
+
+        matches = self.disk.get(key) if self.disk is not None else None
+        if matches is not None:
+            with self._lock:
+                self.disk_hits += 1
+        else:
+            matches = self._compute(resume_id, limit=limit, **params)
+            with self._lock:
+                self.misses += 1
+            if self.disk is not None:
+                self.disk.put(key, matches)
+
+        with self._lock:
+            self._entries[key] = matches
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return matches
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+        if self.disk is not None:
+            self.disk.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            stats = {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+            }
+        if self.disk is not None:
+            stats["disk"] = self.disk.stats()
+        return stats
+
+
+_match_caches: Dict[Tuple[str, str, str], MatchCache] = {}
+_disk_cache: Optional[DiskCache] = None
+_match_cache_lock = threading.Lock()
+
+
+def get_match_cache(uri: Optional[str] = None, user: Optional[str] = None,
+                    password: Optional[str] = None) -> MatchCache:
+    """
+    Match cache for the graph at (uri, user, password), defaulting to config.py,
+    computing and versioning through that graph's shared driver. Sized from
+    config.py; the disk tier is off when MATCH_CACHE_PATH is empty.
+    """
+    global _disk_cache
+    credentials = (uri or config.NEO4J_URI, user or config.NEO4J_USER,
+                   config.NEO4J_PASSWORD if password is None else password)
+    with _match_cache_lock:
+        cache = _match_caches.get(credentials)
+        if cache is None:
+            if config.MATCH_CACHE_PATH and _disk_cache is None:
+                _disk_cache = DiskCache(config.MATCH_CACHE_PATH, config.MATCH_CACHE_MAX_MB * 1024 * 1024)
+            driver = get_driver(*credentials)
+            cache = _match_caches[credentials] = MatchCache(
+                config.MATCH_CACHE_SIZE, _disk_cache,
+                compute=functools.partial(get_top_job_matches_for_resume, driver=driver),
+                version=functools.partial(get_graph_version, driver),
+                namespace=f"{credentials[1]}@{credentials[0]}")
+    return cache
@@ -1,46 +1,200 @@
-from neo4j import GraphDatabase
-from dotenv import load_dotenv
-import os
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import atexit
+import itertools
+import threading
 
-load_dotenv()
+import config
+from graph_driver import get_driver
+from graph_version import bump_graph_version
+from skill_index import SCORING_MODES, PartitionedSkillIndex, SkillIndex
+from skill_keys import split_skill_names
+from skill_lsh import SkillLSH
 
-NEO4J_URI = os.getenv("NEO4J_URI", "neo4j://127.0.0.1:7687")
-NEO4J_USER = os.getenv("NEO4J_USER", "neo4j")
-NEO4J_PASS = os.getenv("NEO4J_PASSWORD")
+MATCH_ENGINES = ("cypher", "index", "materialized", "lsh")
 
-driver = GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASS))
+_skill_index = None
+_skill_lsh = None
+_skill_index_lock = threading.Lock()
+
+def _load_skill_index():
+    if config.MATCH_PARTITIONS > 1:
+        return PartitionedSkillIndex.load(get_driver(), config.MATCH_PARTITIONS).start()
+    return SkillIndex.load(get_driver())
+
+def get_skill_index():
+    """
+    Return the in-process job skill index, loading it on first use. With
+    MATCH_PARTITIONS > 1 this is a PartitionedSkillIndex scored in worker
+    processes; both expose top_jobs/top_jobs_many.
+    """
+    global _skill_index
+    if _skill_index is None:
+        with _skill_index_lock:
+            if _skill_index is None:
+                _skill_index = _load_skill_index()
+    return _skill_index
+
+def get_skill_lsh() -> SkillLSH:
+    """MinHash/LSH candidate index for engine="lsh", built on first use."""
+    global _skill_lsh
+    if _skill_lsh is None:
+        index = get_skill_index()
+        if not isinstance(index, SkillIndex):
+            index = SkillIndex.load(get_driver())
+        with _skill_index_lock:
+            if _skill_lsh is None:
+                _skill_lsh = SkillLSH(index, bands=config.LSH_BANDS, rows=config.LSH_ROWS)
+    return _skill_lsh
+
+def refresh_skill_index():
+    """Reload the job skill index; call after ingesting jobs in this process."""
+    global _skill_index, _skill_lsh
+    index = _load_skill_index()
+    with _skill_index_lock:
+        previous, _skill_index = _skill_index, index
+        _skill_lsh = None
+    if isinstance(previous, PartitionedSkillIndex):
+        previous.close()
+    return index
+
+def invalidate_skill_index() -> None:
+    """Drop the loaded skill index (if any) so the next use reloads it; job ingestion calls this."""
+    global _skill_index, _skill_lsh
+    with _skill_index_lock:
+        previous, _skill_index = _skill_index, None
+        _skill_lsh = None
+    if isinstance(previous, PartitionedSkillIndex):
+        previous.close()
+
+@atexit.register
+def _close_skill_index() -> None:
+    if isinstance(_skill_index, PartitionedSkillIndex):
+        _skill_index.close()
+
+def get_resume_skills(resume_id: str, driver=None) -> List[str]:
+    """Individual skill names of a resume (legacy comma-joined names are split)."""
+    query = """
+    MATCH (:Resume {id: $resume_id})-[:HAS_SKILL]->(s:Skill)
+    RETURN s.name AS name
+    """
+    with (driver or get_driver()).session() as session:
+        names = [record["name"] for record in session.run(query, resume_id=resume_id)]
+    return _split_skill_names(names)
+
+def _split_skill_names(names: List[Optional[str]]) -> List[str]:
+    skills = []
+    for name in names:
+        skills.extend(split_skill_names(name))
+    return skills
+
+def iter_resume_skills(resume_ids: Optional[List[str]] = None,
+                       emails: Optional[List[str]] = None) -> Iterator[Tuple[Dict[str, Any], List[str]]]:
+    """
+    Stream (resume, skill names) for every Resume node, or only the given
+    ids/emails, from a single query. Records are pulled lazily, so the
+    caller never holds the whole result set.
+    """
+    query = """
+    MATCH (r:Resume)
+    WHERE ($resume_ids IS NULL OR r.id IN $resume_ids)
+      AND ($emails IS NULL OR r.email IN $emails)
+    OPTIONAL MATCH (r)-[:HAS_SKILL]->(s:Skill)
+    RETURN r.id AS resume_id, r.name AS name, r.email AS email,
+           collect(s.name) AS skills
+    """
+    with get_driver().session() as session:
+        result = session.run(query, resume_ids=resume_ids, emails=emails)
+        for record in result:
+            resume = {"resume_id": record["resume_id"], "name": record["name"], "email": record["email"]}
+            yield resume, _split_skill_names(record["skills"])
+
+def iter_matches_for_all_resumes(limit: int = 5,
+                                 resume_ids: Optional[List[str]] = None,
+                                 emails: Optional[List[str]] = None,
+                                 batch_size: int = 256,
+                                 scoring: str = "overlap") -> Iterator[Tuple[Dict[str, Any], List[Dict[str, Any]]]]:
+    """
+    Batch counterpart of get_top_job_matches_for_resume: yields
+    (resume, matches) for each resume. The job side (skill postings and
+    per-job skill totals) is expanded once in the SkillIndex and shared by
+    every resume instead of being recomputed per query. Resumes are scored
+    `batch_size` at a time, so a partitioned index makes one round trip per
+    worker per batch.
+    """
+    index = get_skill_index()
+    resumes = iter_resume_skills(resume_ids=resume_ids, emails=emails)
+    while True:
+        batch = list(itertools.islice(resumes, batch_size))
+        if not batch:
+            return
+        results = index.top_jobs_many([skills for _, skills in batch], limit=limit, scoring=scoring)
+        for (resume, _), matches in zip(batch, results):
+            yield resume, matches
+
+def get_top_job_matches_for_resume(resume_id: str, limit: int = 5, engine: str = "cypher",
+                                   scoring: str = "overlap", driver=None):
+    """
+    Rank jobs for a resume by score, then coverage, then title. The score is
+    the skill overlap, or with scoring="idf" the sum of log(1 + jobs /
+    Skill.job_count) over matching skills, so rare skills outweigh
+    ubiquitous ones; job_count is maintained at ingest, so weighting reads
+    one property per matched skill and adds no aggregation.
+    engine="index" scores against the in-process SkillIndex instead of
+    running the full matching query in Neo4j; engine="materialized" reads
+    the precomputed MATCHES edges (top MATCHES_TOP_N jobs only); engine="lsh"
+    re-scores only MinHash/LSH candidates (approximate, see skill_lsh.py).
+    `driver` defaults to the shared config.py driver; the index and lsh
+    engines always score against the jobs loaded from that one.
+    """
+    if scoring not in SCORING_MODES:
+        raise ValueError(f"Unknown scoring mode: {scoring}")
+    if engine == "index":
+        return get_skill_index().top_jobs(get_resume_skills(resume_id, driver), limit=limit, scoring=scoring)
+    if engine == "lsh":
+        return get_skill_lsh().top_jobs(get_resume_skills(resume_id, driver), limit=limit, scoring=scoring)
+    if engine == "materialized":
+        if scoring != "overlap":
+            raise ValueError("Materialized matches are scored by overlap only")
+        return get_materialized_matches(resume_id, limit=limit, driver=driver)
+    if engine != "cypher":
+        raise ValueError(f"Unknown matching engine: {engine}")
 
-def get_top_job_matches_for_resume(resume_id: str, limit: int = 5):
     query = """
-    // 1) Resume skills -> split comma list into individual names
-    MATCH (resume:Resume {id: $resume_id})-[:HAS_SKILL]->(resumeSkillNode:Skill)
-    UNWIND split(resumeSkillNode.name, ",") AS rawSkill
-    WITH DISTINCT trim(rawSkill) AS resumeSkill
-    WHERE resumeSkill <> ""
+    // 0) Corpus size for idf: live jobs = all jobs - retired jobs (both served from the count store)
+    CALL { MATCH (counted:Job) RETURN count(counted) AS allJobs }
+    CALL { MATCH (retired:RetiredJob) RETURN count(retired) AS retiredJobs }
+    WITH allJobs - retiredJobs AS jobCount
 
-    // 2) Jobs that require any of those skills (join by name, case-insensitive)
-    MATCH (job:Job)-[:REQUIRES_SKILL]->(jobSkill:Skill)
-    WHERE toLower(jobSkill.name) = toLower(resumeSkill)
+    // 1) Resume skills -> canonical keys (set at ingest, see skill_keys.py)
+    MATCH (resume:Resume {id: $resume_id})-[:HAS_SKILL]->(resumeSkill:Skill)
+    WITH DISTINCT jobCount, resumeSkill.key AS skillKey
+    WHERE skillKey IS NOT NULL
+
+    // 2) Live jobs that require any of those skills (index-backed equality on Skill.key)
+    MATCH (jobSkill:Skill {key: skillKey})<-[:REQUIRES_SKILL]-(job:Job)
+    WHERE NOT job:RetiredJob
 
     OPTIONAL MATCH (job)<-[:POSTS]-(company:Company)
     OPTIONAL MATCH (job)-[:LOCATED_AT]->(location:Location)
 
     WITH job, company, location,
          collect(DISTINCT jobSkill.name) AS matching_skills,
-         count(DISTINCT jobSkill)        AS skill_overlap
+         count(DISTINCT jobSkill)        AS skill_overlap,
+         sum(log(1 + toFloat(jobCount) / coalesce(jobSkill.job_count, 1))) AS idf_score
 
     // 3) Total skills required by the job
     MATCH (job)-[:REQUIRES_SKILL]->(allJobSkill:Skill)
-    WITH job, company, location, matching_skills, skill_overlap,
+    WITH job, company, location, matching_skills, skill_overlap, idf_score,
          count(DISTINCT allJobSkill) AS total_required
 
     WITH job, company, location, matching_skills, skill_overlap, total_required,
          CASE WHEN total_required = 0
               THEN 0.0
               ELSE toFloat(skill_overlap) / total_required
-         END AS coverage
+         END AS coverage,
+         CASE $scoring WHEN "idf" THEN idf_score ELSE skill_overlap END AS score
 
-    ORDER BY skill_overlap DESC, coverage DESC, job.title
+    ORDER BY score DESC, coverage DESC, job.title
     LIMIT $limit
 
     RETURN
@@ -53,11 +207,195 @@ def get_top_job_matches_for_resume(resume_id: str, limit: int = 5):
         skill_overlap                        AS matching_skill_count,
         total_required                       AS total_skill_required,
         coverage                             AS coverage,
-        skill_overlap                        AS score
+        score                                AS score
     """
 
-    with driver.session() as session:
-        result = session.run(query, resume_id=resume_id, limit=limit)
+    with (driver or get_driver()).session() as session:
+        result = session.run(query, resume_id=resume_id, limit=limit, scoring=scoring)
         matches = [record.data() for record in result]
 
     return matches
+
+def get_top_resume_matches_for_job(job_id: str, limit: int = 5):
+    """
+    Reverse of get_top_job_matches_for_resume: rank resumes for a job with the
+    same overlap/coverage scoring (coverage = share of the job's skills the
+    resume has). Starts from the job's skills and follows Skill.key into
+    HAS_SKILL edges, so only resumes sharing a skill are ever touched; the
+    ORDER BY ... LIMIT keeps just the top `limit` rows.
+    """
+    query = """
+    // 1) The job's skills, counted once (nothing for a retired job)
+    MATCH (job:Job {id: $job_id})-[:REQUIRES_SKILL]->(jobSkill:Skill)
+    WHERE NOT job:RetiredJob
+    WITH collect(DISTINCT jobSkill) AS jobSkills
+    WITH jobSkills, size(jobSkills) AS total_required
+    UNWIND jobSkills AS jobSkill
+
+    // 2) Resumes having any of them (index-backed equality on Skill.key)
+    MATCH (resumeSkill:Skill {key: jobSkill.key})<-[:HAS_SKILL]-(resume:Resume)
+
+    WITH resume, total_required,
+         collect(DISTINCT jobSkill.name) AS matching_skills,
+         count(DISTINCT jobSkill)        AS skill_overlap
+
+    WITH resume, matching_skills, skill_overlap, total_required,
+         toFloat(skill_overlap) / total_required AS coverage
+
+    ORDER BY skill_overlap DESC, coverage DESC, resume.name
+    LIMIT $limit
+
+    RETURN
+        resume.id                            AS resume_id,
+        coalesce(resume.name, "Unknown")     AS name,
+        resume.email                         AS email,
+        matching_skills                      AS matching_skills,
+        skill_overlap                        AS matching_skill_count,
+        total_required                       AS total_skill_required,
+        coverage                             AS coverage,
+        skill_overlap                        AS score
+    """
+
+    with get_driver().session() as session:
+        result = session.run(query, job_id=job_id, limit=limit)
+        return [record.data() for record in result]
+
+# Materialized (:Resume)-[:MATCHES]->(:Job) edges for each resume's top
+# MATCHES_TOP_N jobs, with the same scoring and ordering as the query above.
+# Kept up to date on ingest when config.MATERIALIZE_MATCHES is set.
+
+# Drop and recompute every MATCHES edge of the given resumes
+RESCORE_RESUMES_QUERY = """
+UNWIND $resume_ids AS resume_id
+MATCH (resume:Resume {id: resume_id})
+OPTIONAL MATCH (resume)-[old:MATCHES]->(:Job)
+DELETE old
+WITH DISTINCT resume
+CALL {
+    WITH resume
+    MATCH (resume)-[:HAS_SKILL]->(resumeSkill:Skill)
+    WITH DISTINCT resume, resumeSkill.key AS skillKey
+    WHERE skillKey IS NOT NULL
+    MATCH (jobSkill:Skill {key: skillKey})<-[:REQUIRES_SKILL]-(job:Job)
+    WHERE NOT job:RetiredJob
+    WITH resume, job,
+         collect(DISTINCT jobSkill.name) AS matching_skills,
+         count(DISTINCT jobSkill)        AS skill_overlap
+    MATCH (job)-[:REQUIRES_SKILL]->(allJobSkill:Skill)
+    WITH resume, job, matching_skills, skill_overlap,
+         count(DISTINCT allJobSkill) AS total_required
+    WITH resume, job, matching_skills, skill_overlap, total_required,
+         toFloat(skill_overlap) / total_required AS coverage
+    ORDER BY skill_overlap DESC, coverage DESC, job.title
+    LIMIT $top_n
+    MERGE (resume)-[m:MATCHES]->(job)
+    SET m.score = skill_overlap, m.overlap = skill_overlap, m.coverage = coverage,
+        m.total_required = total_required, m.matching_skills = matching_skills
+    RETURN count(m) AS written
+}
+RETURN count(DISTINCT resume) AS resumes
+"""
+
+# Remove a job's MATCHES edges, returning the resumes that had one
+CLEAR_JOB_MATCHES_QUERY = """
+MATCH (resume:Resume)-[old:MATCHES]->(:Job {id: $job_id})
+DELETE old
+RETURN collect(DISTINCT resume.id) AS resume_ids
+"""
+
+# Add an edge from every resume sharing a skill with the job, then trim each
+# of those resumes back to its top N edges
+INSERT_JOB_MATCHES_QUERY = """
+MATCH (job:Job {id: $job_id})-[:REQUIRES_SKILL]->(jobSkill:Skill)
+WHERE NOT job:RetiredJob
+WITH job, collect(DISTINCT jobSkill) AS jobSkills
+WITH job, jobSkills, size(jobSkills) AS total_required
+UNWIND jobSkills AS jobSkill
+MATCH (resumeSkill:Skill {key: jobSkill.key})<-[:HAS_SKILL]-(resume:Resume)
+WHERE NOT resume.id IN $skip
+WITH job, resume, total_required,
+     collect(DISTINCT jobSkill.name) AS matching_skills,
+     count(DISTINCT jobSkill)        AS skill_overlap
+MERGE (resume)-[m:MATCHES]->(job)
+SET m.score = skill_overlap, m.overlap = skill_overlap,
+    m.coverage = toFloat(skill_overlap) / total_required,
+    m.total_required = total_required, m.matching_skills = matching_skills
+
+WITH resume
+MATCH (resume)-[m:MATCHES]->(matched:Job)
+WITH resume, m, matched
+ORDER BY m.score DESC, m.coverage DESC, matched.title
+WITH resume, collect(m) AS edges
+FOREACH (edge IN edges[$top_n..] | DELETE edge)
+RETURN count(resume) AS resumes
+"""
+
+def update_matches_for_resumes(resume_ids: List[str], top_n: Optional[int] = None, driver=None) -> int:
+    """Recompute the MATCHES edges of the given resumes only. Returns how many were scored."""
+    if not resume_ids:
+        return 0
+    top_n = top_n or config.MATCHES_TOP_N
+    with (driver or get_driver()).session() as session:
+        return session.execute_write(_rescore_resumes_tx, list(resume_ids), top_n)
+
+def _rescore_resumes_tx(tx, resume_ids: List[str], top_n: int) -> int:
+    record = tx.run(RESCORE_RESUMES_QUERY, resume_ids=resume_ids, top_n=top_n).single()
+    bump_graph_version(tx)
+    return record["resumes"] if record else 0
+
+def update_matches_for_resume(resume_id: str, top_n: Optional[int] = None) -> int:
+    return update_matches_for_resumes([resume_id], top_n=top_n)
+
+def _update_job_matches_tx(tx, job_id: str, top_n: int) -> Tuple[List[str], int]:
+    previous = tx.run(CLEAR_JOB_MATCHES_QUERY, job_id=job_id).single()["resume_ids"]
+    # Resumes that matched an older version of this job are rescored in full
+    # below: its new score may rank below a job that was previously trimmed.
+    record = tx.run(INSERT_JOB_MATCHES_QUERY, job_id=job_id, top_n=top_n, skip=previous).single()
+    bump_graph_version(tx)
+    return previous, record["resumes"] if record else 0
+
+def update_matches_for_job(job_id: str, top_n: Optional[int] = None) -> int:
+    """
+    Incremental update after a job was written: only resumes sharing at
+    least one skill with it gain an edge (and are trimmed back to their top
+    N). Resumes that matched a previous version of the job are rescored.
+    Returns the number of resumes touched.
+    """
+    top_n = top_n or config.MATCHES_TOP_N
+    with get_driver().session() as session:
+        previous, inserted = session.execute_write(_update_job_matches_tx, job_id, top_n)
+    return inserted + update_matches_for_resumes(previous, top_n=top_n)
+
+def rebuild_all_matches(top_n: Optional[int] = None, batch_size: int = 100) -> int:
+    """Recompute MATCHES edges for every resume, `batch_size` resumes per transaction."""
+    with get_driver().session() as session:
+        resume_ids = [record["id"] for record in session.run("MATCH (r:Resume) RETURN r.id AS id")]
+    scored = 0
+    for start in range(0, len(resume_ids), batch_size):
+        scored += update_matches_for_resumes(resume_ids[start:start + batch_size], top_n=top_n)
+    return scored
+
+def get_materialized_matches(resume_id: str, limit: int = 5, driver=None):
+    """Top jobs for a resume from its MATCHES edges; same row shape as the cypher engine."""
+    query = """
+    MATCH (:Resume {id: $resume_id})-[m:MATCHES]->(job:Job)
+    OPTIONAL MATCH (job)<-[:POSTS]-(company:Company)
+    OPTIONAL MATCH (job)-[:LOCATED_AT]->(location:Location)
+    RETURN
+        job.id                               AS job_id,
+        job.title                            AS title,
+        coalesce(company.name,  "Unknown")   AS company,
+        coalesce(location.name, "Unknown")   AS location,
+        coalesce(job.employment_type, "Not specified") AS employment_type,
+        m.matching_skills                    AS matching_skills,
+        m.overlap                            AS matching_skill_count,
+        m.total_required                     AS total_skill_required,
+        m.coverage                           AS coverage,
+        m.score                              AS score
+    ORDER BY score DESC, coverage DESC, title
+    LIMIT $limit
+    """
+
+    with (driver or get_driver()).session() as session:
+        result = session.run(query, resume_id=resume_id, limit=limit)
+        return [record.data() for record in result]
@@ -1,18 +1,24 @@
 import argparse
-from matching import get_top_job_matches_for_resume, driver
+import csv
+import json
+import time
+import config
+from graph_driver import get_driver
+from graph_store import get_graph_store
+from match_cache import get_match_cache
+from matching import (get_top_job_matches_for_resume, get_top_resume_matches_for_job,
+                      iter_matches_for_all_resumes, iter_resume_skills, rebuild_all_matches,
+                      get_skill_lsh, MATCH_ENGINES, SCORING_MODES)
+from skill_lsh import recall_report
+
+CSV_FIELDS = [
+    "resume_id", "resume_name", "resume_email", "rank",
+    "job_id", "title", "company", "location", "employment_type",
+    "matching_skills", "matching_skill_count", "total_skill_required", "coverage", "score",
+]
 
 def list_resumes(limit: int = 25):
-    q = """
-    MATCH (r:Resume)
-    OPTIONAL MATCH (r)-[hs:HAS_SKILL]->(:Skill)
-    WITH r, count(hs) AS skill_count
-    RETURN r.id AS id, r.name AS name, r.email AS email, skill_count
-    ORDER BY coalesce(r.name, ''), coalesce(r.email, ''), coalesce(r.id, '')
-    LIMIT $limit
-    """
-    with driver.session() as session:
-        result = session.run(q, limit=limit)
-        return [record.data() for record in result]
+    return get_graph_store().list_resumes(limit=limit)
 
 def print_resumes():
     rows = list_resumes()
@@ -26,10 +32,7 @@ def print_resumes():
         print(f"- id={r['id']} | name={r.get('name')} | email={r.get('email')}")
 
 def get_resume_id_by_email(email: str):
-    q = "MATCH (r:Resume {email: $email}) RETURN r.id AS id LIMIT 1"
-    with driver.session() as session:
-        rec = session.run(q, email=email).single()
-        return rec["id"] if rec else None
+    return get_graph_store().resume_id_by_email(email)
 
 def get_latest_resume_id():
     q = """
@@ -38,16 +41,133 @@ def get_latest_resume_id():
     ORDER BY coalesce(r.created, datetime({epochMillis:0})) DESC
     LIMIT 1
     """
-    with driver.session() as session:
+    with get_driver().session() as session:
         rec = session.run(q).single()
         return rec["id"] if rec else None
 
+def _split_arg(value):
+    if not value:
+        return None
+    return [v.strip() for v in value.split(",") if v.strip()]
+
+def run_batch(output: str, fmt: str = None, limit: int = 5, resume_ids=None, emails=None,
+              scoring: str = "overlap"):
+    """
+    Match every resume (or the given ids/emails) and stream the results to
+    `output`: one JSON object per resume for .jsonl, one row per match for .csv.
+    """
+    fmt = fmt or ("csv" if output.lower().endswith(".csv") else "jsonl")
+    resumes = 0
+    rows = 0
+    started = time.perf_counter()
+
+    with open(output, "w", newline="", encoding="utf-8") as fh:
+        writer = None
+        if fmt == "csv":
+            writer = csv.DictWriter(fh, fieldnames=CSV_FIELDS)
+            writer.writeheader()
+
+        for resume, matches in iter_matches_for_all_resumes(limit=limit, resume_ids=resume_ids, emails=emails,
+                                                            scoring=scoring):
+            resumes += 1
+            rows += len(matches)
+            if writer is None:
+                fh.write(json.dumps({**resume, "matches": matches}) + "\n")
+                continue
+            for rank, m in enumerate(matches, start=1):
+                writer.writerow({
+                    "resume_id": resume["resume_id"],
+                    "resume_name": resume["name"],
+                    "resume_email": resume["email"],
+                    "rank": rank,
+                    **{k: m[k] for k in CSV_FIELDS[4:] if k != "matching_skills"},
+                    "matching_skills": "; ".join(m["matching_skills"]),
+                })
+
+    elapsed = time.perf_counter() - started
+    rate = resumes / elapsed if elapsed > 0 else 0.0
+    print(f"Matched {resumes} resumes ({rows} matches) in {elapsed:.2f}s "
+          f"-> {rate:.1f} resumes/sec. Output: {output}")
+
+def print_lsh_report(limit: int = 5):
+    """Recall@k and latency of the lsh engine against exact index scoring, over every resume"""
+    lsh = get_skill_lsh()
+    skill_lists = [skills for _, skills in iter_resume_skills()]
+    report = recall_report(lsh.index, lsh, skill_lists, k=limit)
+    print(f"LSH ({lsh.bands} bands x {lsh.rows} rows) over {report['queries']} resumes, "
+          f"{len(lsh.index)} jobs:")
+    print(f"Recall@{limit}: {report['recall_at_k']:.3f}")
+    print(f"Latency: exact {report['exact_ms']:.2f} ms/resume, lsh {report['lsh_ms']:.2f} ms/resume")
+
+def print_resume_matches_for_job(job_id: str, limit: int = 5):
+    print(f"=== Best resumes for JOB_ID = {job_id} ===")
+    matches = get_top_resume_matches_for_job(job_id, limit=limit)
+    print(f"Found {len(matches)} matching resumes.\n")
+
+    if not matches:
+        print("No resume matches found. Possible reasons:")
+        print(" - The job id is wrong or not in this database")
+        print(" - The job has no REQUIRES_SKILL edges")
+        print(" - No resume shares a skill with the job")
+        return
+
+    for m in matches:
+        print("------------------------------------------------")
+        print(f"{m.get('name')} <{m.get('email') or 'no email'}> (id={m.get('resume_id')})")
+        print(f"Skill overlap: {m['matching_skill_count']}/{m['total_skill_required']} "
+              f"({m['coverage']:.2f} coverage)")
+        print("Matching skills:", ", ".join(m.get("matching_skills") or []) or "(none)")
+
 def main():
     ap = argparse.ArgumentParser(description="Find top job matches for a resume.")
     ap.add_argument("--email", help="Resume owner email to look up (preferred)")
     ap.add_argument("--resume-id", help="Resume node id (overrides --email)")
     ap.add_argument("--limit", type=int, default=5, help="How many matches to return")
+    ap.add_argument("--job-id", help="Reverse mode: rank resumes for this Job id")
+    ap.add_argument("--engine", choices=MATCH_ENGINES, default="cypher",
+                    help="cypher = query Neo4j directly, index = in-process skill index, "
+                         "materialized = precomputed MATCHES edges, lsh = approximate MinHash/LSH candidates")
+    ap.add_argument("--scoring", choices=SCORING_MODES, default="overlap",
+                    help="overlap = shared skill count, idf = shared skills weighted by rarity")
+    ap.add_argument("--partitions", type=int,
+                    help="Shard the skill index across N worker processes (index engine and batch mode)")
+    ap.add_argument("--no-cache", action="store_true",
+                    help="Always recompute matches instead of using the match cache")
+    ap.add_argument("--lsh-report", action="store_true",
+                    help="Report recall@--limit and latency of the lsh engine vs. exact matching and exit")
+    ap.add_argument("--rebuild-matches", action="store_true",
+                    help="Recompute the materialized MATCHES edges for every resume and exit")
+    ap.add_argument("--all", action="store_true",
+                    help="Batch mode: match every resume (or --resume-ids/--emails) and write --output")
+    ap.add_argument("--resume-ids", help="Batch mode: comma-separated resume ids to match")
+    ap.add_argument("--emails", help="Batch mode: comma-separated resume emails to match")
+    ap.add_argument("--output", help="Batch mode: output file (.jsonl or .csv)")
+    ap.add_argument("--format", choices=("jsonl", "csv"), help="Batch mode: override output format")
     args = ap.parse_args()
+    if args.partitions:
+        config.MATCH_PARTITIONS = args.partitions
+
+    if args.lsh_report:
+        print_lsh_report(limit=args.limit)
+        return
+
+    if args.rebuild_matches:
+        started = time.perf_counter()
+        scored = rebuild_all_matches()
+        print(f"Rebuilt MATCHES edges for {scored} resumes in {time.perf_counter() - started:.1f}s.")
+        return
+
+    if args.all or args.resume_ids or args.emails:
+        if not args.output:
+            ap.error("batch mode needs --output")
+        run_batch(args.output, fmt=args.format, limit=args.limit,
+                  resume_ids=_split_arg(args.resume_ids), emails=_split_arg(args.emails),
+                  scoring=args.scoring)
+        return
+
+    if args.job_id:
+        print_resume_matches_for_job(args.job_id, limit=args.limit)
+        return
 
     # Always print resume list (your requested behavior)
     print_resumes()
@@ -68,7 +188,14 @@ def main():
             return
 
     print(f"=== Looking for matches for RESUME_ID = {resume_id} ===")
-    matches = get_top_job_matches_for_resume(resume_id, limit=args.limit)
+    if args.no_cache:
+        matches = get_top_job_matches_for_resume(resume_id, limit=args.limit, engine=args.engine,
+                                                 scoring=args.scoring)
+    else:
+        cache = get_match_cache()
+        matches = cache.get_matches(resume_id, limit=args.limit, engine=args.engine, scoring=args.scoring)
+        stats = cache.stats()
+        print(f"(match cache: {stats['hits'] + stats['disk_hits']} hits, {stats['misses']} misses)")
     print(f"Found {len(matches)} matching jobs.\n")
 
     if not matches:
@@ -91,6 +218,8 @@ def main():
         print(f"{title} at {company} ({location})")
         print(f"Employment type: {emp_type}")
         print(f"Skill overlap: {overlap}/{total} ({coverage:.2f} coverage)")
+        if args.scoring == "idf":
+            print(f"IDF score: {m.get('score', 0.0):.2f}")
         print("Matching skills:", ", ".join(skills) if skills else "(none)")
 
 if __name__ == "__main__":
@@ -0,0 +1,303 @@
+"""
+In-process inverted index over the Job/Skill graph.
+
+Loads a snapshot of (:Job)-[:REQUIRES_SKILL]->(:Skill) once and scores
+resumes against it without another round trip to Neo4j. For very large
+corpora PartitionedSkillIndex shards jobs by crc32(job_id) and scores each
+shard in its own worker process.
+"""
+
+import heapq
+import itertools
+import math
+import multiprocessing
+import zlib
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional
+
+from skill_keys import canonical_skill_key
+
+SCORING_MODES = ("overlap", "idf")
+
+JOB_SNAPSHOT_QUERY = """
+MATCH (job:Job)-[:REQUIRES_SKILL]->(skill:Skill)
+WHERE NOT job:RetiredJob
+WITH job, collect(DISTINCT skill.name) AS skills
+OPTIONAL MATCH (job)<-[:POSTS]-(company:Company)
+OPTIONAL MATCH (job)-[:LOCATED_AT]->(location:Location)
+RETURN
+    job.id                          AS job_id,
+    job.title                       AS title,
+    head(collect(company.name))     AS company,
+    head(collect(location.name))    AS location,
+    job.employment_type             AS employment_type,
+    skills
+"""
+
+# Live jobs, both counts served from the count store
+JOB_COUNT_QUERY = """
+CALL { MATCH (job:Job) RETURN count(job) AS allJobs }
+CALL { MATCH (retired:RetiredJob) RETURN count(retired) AS retiredJobs }
+RETURN allJobs - retiredJobs AS jobs
+"""
+
+
+class SkillIndex:
+    """Skill -> job posting lists with skills interned by canonical key.
+
+    Jobs are numbered 0..n-1 in load order; posting lists and per-job skill
+    lists are stored as int arrays so a warm index stays compact.
+    """
+
+    def __init__(self):
+        self.skill_ids: Dict[str, int] = {}
+        self.skill_names: List[str] = []
+        self.postings: List[array] = []
+        self.job_skills: List[array] = []
+        self.job_ids: List[str] = []
+        self.titles: List[Optional[str]] = []
+        self.companies: List[Optional[str]] = []
+        self.locations: List[Optional[str]] = []
+        self.employment_types: List[Optional[str]] = []
+        # IDF inputs: every Job node counts toward total_jobs, even without
+        # skills. doc_freqs overrides the local posting-list lengths when
+        # the index is one partition of a larger corpus.
+        self.total_jobs = 0
+        self.doc_freqs: Optional[array] = None
+
+    def __len__(self) -> int:
+        return len(self.job_ids)
+
+    @classmethod
+    def build(cls, rows: Iterable[Dict[str, Any]]) -> "SkillIndex":
+        """Build an index from job rows shaped like JOB_SNAPSHOT_QUERY output"""
+        index = cls()
+        for row in rows:
+            index._add_job(row)
+        return index
+
+    @classmethod
+    def load(cls, driver) -> "SkillIndex":
+        """Snapshot every job that requires at least one skill"""
+        with driver.session() as session:
+            index = cls.build(record.data() for record in session.run(JOB_SNAPSHOT_QUERY))
+            index.total_jobs = session.run(JOB_COUNT_QUERY).single()["jobs"]
+        return index
+
+    def _intern(self, name: str) -> int:
+        key = canonical_skill_key(name)
+        skill_id = self.skill_ids.get(key)
+        if skill_id is None:
+            skill_id = len(self.skill_names)
+            self.skill_ids[key] = skill_id
+            self.skill_names.append(name)
+            self.postings.append(array("i"))
+        return skill_id
+
+    def _add_job(self, row: Dict[str, Any]) -> None:
+        self.total_jobs += 1
+        # Deduplicated in the job's own skill order, so matching_skills do not
+        # depend on interning order (which differs between partitions)
+        skill_ids = list(dict.fromkeys(self._intern(name) for name in row.get("skills") or []
+                                       if name and name.strip()))
+        if not skill_ids:
+            return
+
+        job_no = len(self.job_ids)
+        for skill_id in skill_ids:
+            self.postings[skill_id].append(job_no)
+
+        self.job_skills.append(array("i", skill_ids))
+        self.job_ids.append(row.get("job_id"))
+        self.titles.append(row.get("title"))
+        self.companies.append(row.get("company"))
+        self.locations.append(row.get("location"))
+        self.employment_types.append(row.get("employment_type"))
+
+    def lookup(self, skill_names: Iterable[str]) -> set:
+        """Map raw skill names to the ids of skills known to the index"""
+        found = set()
+        for name in skill_names:
+            if not name:
+                continue
+            skill_id = self.skill_ids.get(canonical_skill_key(name))
+            if skill_id is not None:
+                found.add(skill_id)
+        return found
+
+    def doc_freq(self, skill_id: int) -> int:
+        """Number of jobs requiring the skill (Skill.job_count in the graph)"""
+        if self.doc_freqs is not None:
+            return self.doc_freqs[skill_id]
+        return len(self.postings[skill_id])
+
+    def weights(self, skill_ids: Iterable[int], scoring: str = "overlap") -> Dict[int, float]:
+        """Per-skill score contribution: 1 for overlap, log(1 + jobs / job_count) for idf"""
+        if scoring == "overlap":
+            return {skill_id: 1 for skill_id in skill_ids}
+        if scoring == "idf":
+            return {skill_id: math.log(1 + self.total_jobs / max(self.doc_freq(skill_id), 1))
+                    for skill_id in skill_ids}
+        raise ValueError(f"Unknown scoring mode: {scoring}")
+
+    def _rank_key(self, job_no: int, overlap: int, score: float):
+        # Same ordering as the Cypher matcher: score DESC, coverage DESC, title
+        # (nulls last); job id only breaks the remaining ties deterministically.
+        # idf sums are rounded so summation order cannot split ties.
+        title = self.titles[job_no]
+        coverage = overlap / len(self.job_skills[job_no])
+        return (-round(score, 9), -coverage, title is None, title or "", self.job_ids[job_no] or "")
+
+    def top_jobs(self, skill_names: Iterable[str], limit: int = 5, scoring: str = "overlap") -> List[Dict[str, Any]]:
+        """Score every job sharing a skill with `skill_names` and return the best `limit`"""
+        wanted = self.lookup(skill_names)
+        weights = self.weights(wanted, scoring)
+        if not wanted or limit <= 0:
+            return []
+
+        overlaps: Dict[int, int] = {}
+        scores = overlaps if scoring == "overlap" else {}
+        for skill_id in wanted:
+            postings = self.postings[skill_id]
+            for job_no in postings:
+                overlaps[job_no] = overlaps.get(job_no, 0) + 1
+            if scores is not overlaps:
+                weight = weights[skill_id]
+                for job_no in postings:
+                    scores[job_no] = scores.get(job_no, 0.0) + weight
+
+        return self.best_rows(overlaps, scores, wanted, limit)
+
+    def best_rows(self, overlaps: Dict[int, int], scores: Dict[int, float], wanted: set,
+                  limit: int) -> List[Dict[str, Any]]:
+        """Top `limit` match rows from per-job overlap counts and scores"""
+        best = heapq.nsmallest(limit, overlaps.items(),
+                               key=lambda item: self._rank_key(item[0], item[1], scores[item[0]]))
+        return [self._match_row(job_no, overlap, scores[job_no], wanted) for job_no, overlap in best]
+
+    def top_jobs_many(self, skill_lists: List[List[str]], limit: int = 5,
+                      scoring: str = "overlap") -> List[List[Dict[str, Any]]]:
+        return [self.top_jobs(skill_names, limit=limit, scoring=scoring) for skill_names in skill_lists]
+
+    def _match_row(self, job_no: int, overlap: int, score: float, wanted: set) -> Dict[str, Any]:
+        job_skills = self.job_skills[job_no]
+        total = len(job_skills)
+        return {
+            "job_id": self.job_ids[job_no],
+            "title": self.titles[job_no],
+            "company": self.companies[job_no] or "Unknown",
+            "location": self.locations[job_no] or "Unknown",
+            "employment_type": self.employment_types[job_no] or "Not specified",
+            "matching_skills": [self.skill_names[s] for s in job_skills if s in wanted],
+            "matching_skill_count": overlap,
+            "total_skill_required": total,
+            "coverage": overlap / total,
+            "score": round(score, 9),
+        }
+
+
+def match_rank_key(row: Dict[str, Any]):
+    """SkillIndex._rank_key for an already built match row"""
+    title = row["title"]
+    return (-row["score"], -row["coverage"], title is None, title or "", row["job_id"] or "")
+
+
+def merge_top_jobs(partials: Iterable[List[Dict[str, Any]]], limit: int) -> List[Dict[str, Any]]:
+    """Global top `limit` from per-partition top lists; exact because each partition keeps its own top `limit`"""
+    return heapq.nsmallest(limit, itertools.chain.from_iterable(partials), key=match_rank_key)
+
+
+def partition_of(job_id: Optional[str], partitions: int) -> int:
+    return zlib.crc32((job_id or "").encode("utf-8")) % partitions
+
+
+# Worker-process state: the one partition this process scores
+_worker_partition: Optional[SkillIndex] = None
+
+
+def _init_worker(partition: SkillIndex) -> None:
+    global _worker_partition
+    _worker_partition = partition
+
+
+def _score_partition(skill_lists: List[List[str]], limit: int, scoring: str) -> List[List[Dict[str, Any]]]:
+    return _worker_partition.top_jobs_many(skill_lists, limit=limit, scoring=scoring)
+
+
+class PartitionedSkillIndex:
+    """
+    N SkillIndex shards split by crc32(job_id) % N. After start(), every
+    shard lives in its own single-worker process, so a batch of resumes is
+    scored on all shards in parallel and only each shard's local top-k
+    crosses the process boundary. Results match SkillIndex.top_jobs exactly.
+    """
+
+    def __init__(self, partitions: List[SkillIndex]):
+        self.partitions = partitions
+        self._executors: List[ProcessPoolExecutor] = []
+
+    def __len__(self) -> int:
+        return sum(len(partition) for partition in self.partitions)
+
+    @classmethod
+    def build(cls, rows: Iterable[Dict[str, Any]], partitions: int) -> "PartitionedSkillIndex":
+        shards = [SkillIndex() for _ in range(partitions)]
+        for row in rows:
+            shards[partition_of(row.get("job_id"), partitions)]._add_job(row)
+        index = cls(shards)
+        index.share_doc_freqs()
+        return index
+
+    @classmethod
+    def load(cls, driver, partitions: int) -> "PartitionedSkillIndex":
+        with driver.session() as session:
+            index = cls.build((record.data() for record in session.run(JOB_SNAPSHOT_QUERY)), partitions)
+            index.share_doc_freqs(session.run(JOB_COUNT_QUERY).single()["jobs"])
+        return index
+
+    def share_doc_freqs(self, total_jobs: Optional[int] = None) -> None:
+        """Give every partition corpus-wide IDF inputs, so idf scores match a single index"""
+        if total_jobs is None:
+            total_jobs = sum(partition.total_jobs for partition in self.partitions)
+        doc_freqs: Dict[str, int] = {}
+        for partition in self.partitions:
+            for key, skill_id in partition.skill_ids.items():
+                doc_freqs[key] = doc_freqs.get(key, 0) + len(partition.postings[skill_id])
+        for partition in self.partitions:
+            partition.total_jobs = total_jobs
+            partition.doc_freqs = array("i", [0] * len(partition.skill_names))
+            for key, skill_id in partition.skill_ids.items():
+                partition.doc_freqs[skill_id] = doc_freqs[key]
+
+    def start(self) -> "PartitionedSkillIndex":
+        """Move each partition into its own worker process"""
+        if not self._executors:
+            # spawn, not fork: the parent may hold live Neo4j driver threads
+            context = multiprocessing.get_context("spawn")
+            self._executors = [
+                ProcessPoolExecutor(max_workers=1, mp_context=context,
+                                    initializer=_init_worker, initargs=(partition,))
+                for partition in self.partitions
+            ]
+        return self
+
+    def close(self) -> None:
+        executors, self._executors = self._executors, []
+        for executor in executors:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def top_jobs(self, skill_names: Iterable[str], limit: int = 5, scoring: str = "overlap") -> List[Dict[str, Any]]:
+        return self.top_jobs_many([list(skill_names)], limit=limit, scoring=scoring)[0]
+
+    def top_jobs_many(self, skill_lists: List[List[str]], limit: int = 5,
+                      scoring: str = "overlap") -> List[List[Dict[str, Any]]]:
+        """Top jobs for each skill list; one round trip per partition for the whole batch"""
+        if self._executors:
+            futures = [executor.submit(_score_partition, skill_lists, limit, scoring)
+                       for executor in self._executors]
+            partials = [future.result() for future in futures]
+        else:
+            partials = [partition.top_jobs_many(skill_lists, limit=limit, scoring=scoring)
+                        for partition in self.partitions]
+        return [merge_top_jobs((partial[i] for partial in partials), limit) for i in range(len(skill_lists))]
@@ -0,0 +1,155 @@
+"""
+Canonical skill keys shared by job ingestion, resume ingestion and matching.
+
+Skill nodes are merged on `key` (trimmed, whitespace-collapsed, case-folded
+name) so jobs and resumes meet on the same node and matching is a plain
+index-backed equality join. Each Skill also carries `job_count`, the
+number of live (not :RetiredJob) jobs requiring it (document frequency for
+idf scoring), which job ingestion keeps up to date. Run this module once to
+migrate an existing graph and recompute those counts (it also backfills
+Job.title_key for graphs written before that existed):
+
+    python skill_keys.py
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from graph_schema import ensure_schema, print_schema_report
+
+# Relationship types that point at Skill nodes, for re-linking during migration
+SKILL_RELATIONSHIPS = ("HAS_SKILL", "REQUIRES_SKILL", "USES_SKILL")
+
+
+def canonical_skill_key(name: str) -> str:
+    """'  Machine   Learning ' -> 'machine learning'"""
+    return " ".join(name.split()).casefold()
+
+
+def split_skill_names(raw: Optional[str]) -> List[str]:
+    """Split a possibly comma-joined skill string into trimmed names"""
+    return [" ".join(part.split()) for part in (raw or "").split(",") if part.strip()]
+
+
+def canonical_skills(names: Iterable[Optional[str]]) -> List[Tuple[str, str]]:
+    """(key, display name) pairs for a list of raw skill strings, deduplicated by key"""
+    seen: Dict[str, str] = {}
+    for raw in names:
+        for name in split_skill_names(raw):
+            seen.setdefault(canonical_skill_key(name), name)
+    return list(seen.items())
+
+
+def _relink(tx, old_ids: List[str], new_id: str) -> None:
+    """Point every skill relationship of `old_ids` at `new_id` and delete the old ones"""
+    for rel_type in SKILL_RELATIONSHIPS:
+        tx.run(f"""
+            MATCH (new:Skill) WHERE elementId(new) = $new_id
+            MATCH (src)-[rel:{rel_type}]->(old:Skill)
+            WHERE elementId(old) IN $old_ids
+            MERGE (src)-[:{rel_type}]->(new)
+            DELETE rel
+        """, old_ids=old_ids, new_id=new_id)
+
+
+def _merge_group(tx, key: str, name: str, node_ids: List[str], split_ids: List[str]) -> None:
+    """Make one Skill node own `key`, folding in duplicates and comma-joined nodes"""
+    if node_ids:
+        survivor = node_ids[0]
+        tx.run("MATCH (s:Skill) WHERE elementId(s) = $id SET s.key = $key",
+               id=survivor, key=key)
+    else:
+        survivor = tx.run("""
+            CREATE (s:Skill {key: $key, name: $name})
+            RETURN elementId(s) AS id
+        """, key=key, name=name).single()["id"]
+
+    duplicates = node_ids[1:]
+    if duplicates:
+        _relink(tx, duplicates, survivor)
+        tx.run("MATCH (s:Skill) WHERE elementId(s) IN $ids DETACH DELETE s", ids=duplicates)
+
+    # Comma-joined nodes keep their relationships until every part is linked
+    for split_id in split_ids:
+        for rel_type in SKILL_RELATIONSHIPS:
+            tx.run(f"""
+                MATCH (new:Skill) WHERE elementId(new) = $new_id
+                MATCH (src)-[:{rel_type}]->(old:Skill) WHERE elementId(old) = $old_id
+                MERGE (src)-[:{rel_type}]->(new)
+            """, old_id=split_id, new_id=survivor)
+
+
+# Bulk document-frequency recompute, batched so large graphs do not need one huge transaction
+RECOMPUTE_JOB_COUNTS_QUERY = """
+MATCH (s:Skill)
+CALL {
+    WITH s
+    SET s.job_count = COUNT { (s)<-[:REQUIRES_SKILL]-(j:Job) WHERE NOT j:RetiredJob },
+        s.version = $version
+} IN TRANSACTIONS OF 10000 ROWS
+"""
+
+
+def recompute_skill_job_counts(driver) -> None:
+    """
+    Set Skill.job_count from scratch (e.g. after a migration or manual edits),
+    under a new graph version so caches and skill_suggest pick the counts up.
+    """
+    from graph_version import bump_graph_version
+
+    with driver.session() as session:
+        version = session.execute_write(bump_graph_version)
+        session.run(RECOMPUTE_JOB_COUNTS_QUERY, version=version).consume()
+
+
+def migrate_skill_keys(driver) -> Dict[str, int]:
+    """
+    One-off migration for graphs written before skill keys existed:
+    split comma-joined skill nodes into one node per skill, set `key`
+    everywhere, merge nodes that share a key, then add the Skill.key
+    uniqueness constraint (see graph_schema.py).
+    """
+    with driver.session() as session:
+        rows = [record.data() for record in session.run(
+            "MATCH (s:Skill) RETURN elementId(s) AS id, s.name AS name ORDER BY id"
+        )]
+
+    groups: Dict[str, Dict[str, List]] = {}
+    split_nodes = []
+    for row in rows:
+        parts = canonical_skills([row["name"]])
+        if not parts:
+            continue
+        is_split = len(parts) > 1 or "," in row["name"]
+        if is_split:
+            split_nodes.append(row["id"])
+        for key, name in parts:
+            group = groups.setdefault(key, {"name": name, "nodes": [], "splits": []})
+            group["splits" if is_split else "nodes"].append(row["id"])
+
+    stats = {"keys": len(groups), "merged": 0, "split": len(split_nodes)}
+    with driver.session() as session:
+        for key, group in groups.items():
+            stats["merged"] += max(len(group["nodes"]) - 1, 0)
+            session.execute_write(_merge_group, key, group["name"], group["nodes"], group["splits"])
+        if split_nodes:
+            session.run("MATCH (s:Skill) WHERE elementId(s) IN $ids DETACH DELETE s", ids=split_nodes)
+
+    print_schema_report(ensure_schema(driver))
+    # Merging and splitting moved REQUIRES_SKILL edges between nodes
+    recompute_skill_job_counts(driver)
+    return stats
+
+
+if __name__ == "__main__":
+    from graph_driver import get_driver
+
+    driver = get_driver()
+
+    print("Migrating Skill nodes to canonical keys ...")
+    print(migrate_skill_keys(driver))
+    print("Skill.job_count recomputed.")
+
+    import graph_store   # noqa: F401  (puts JobParser/src on sys.path)
+    from jd_to_neo4j import backfill_title_keys
+
+    print(f"Job.title_key set on {backfill_title_keys(driver)} jobs.")
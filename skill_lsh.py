@@ -0,0 +1,118 @@
+"""
+Approximate candidate generation for the "lsh" matching engine.
+
+Every job's canonical skill set gets a MinHash signature, split into bands
+of `rows` values; jobs are bucketed by each band. A resume only looks at the
+jobs sharing at least one band bucket with its own signature and re-scores
+those exactly with the SkillIndex ranking, instead of walking the posting
+list of every skill it has (which for "Python" or "SQL" is most of the
+corpus). recall_report() measures what that costs against exact matching.
+"""
+
+import random
+import time
+import zlib
+from array import array
+from typing import Any, Dict, Iterable, List
+
+from skill_index import SkillIndex
+
+# Mersenne prime modulus for the (a * x + b) mod p hash family
+_PRIME = (1 << 61) - 1
+
+
+class SkillLSH:
+    """MinHash/LSH banding index over the jobs of a SkillIndex."""
+
+    def __init__(self, index: SkillIndex, bands: int = 32, rows: int = 2, seed: int = 1):
+        self.index = index
+        self.bands = bands
+        self.rows = rows
+        rng = random.Random(seed)
+        self._coeffs = [(rng.randrange(1, _PRIME), rng.randrange(0, _PRIME)) for _ in range(bands * rows)]
+
+        # Per-skill hash vectors, keyed by the canonical key so they are
+        # stable across reloads and partitionings
+        self._skill_hashes: List[List[int]] = [[] for _ in index.skill_names]
+        for key, skill_id in index.skill_ids.items():
+            x = zlib.crc32(key.encode("utf-8"))
+            self._skill_hashes[skill_id] = [(a * x + b) % _PRIME for a, b in self._coeffs]
+
+        self.buckets: List[Dict[tuple, array]] = [{} for _ in range(bands)]
+        for job_no, skill_ids in enumerate(index.job_skills):
+            for band, bucket_key in enumerate(self._band_keys(skill_ids)):
+                bucket = self.buckets[band].get(bucket_key)
+                if bucket is None:
+                    bucket = self.buckets[band][bucket_key] = array("i")
+                bucket.append(job_no)
+
+    def signature(self, skill_ids: Iterable[int]) -> List[int]:
+        return list(map(min, *(self._skill_hashes[s] for s in skill_ids)))
+
+    def _band_keys(self, skill_ids) -> List[tuple]:
+        if len(skill_ids) == 1:
+            signature = self._skill_hashes[next(iter(skill_ids))]
+        else:
+            signature = self.signature(skill_ids)
+        rows = self.rows
+        return [tuple(signature[band * rows:(band + 1) * rows]) for band in range(self.bands)]
+
+    def candidates(self, skill_ids: set) -> set:
+        found = set()
+        for band, bucket_key in enumerate(self._band_keys(skill_ids)):
+            bucket = self.buckets[band].get(bucket_key)
+            if bucket is not None:
+                found.update(bucket)
+        return found
+
+    def top_jobs(self, skill_names: Iterable[str], limit: int = 5, scoring: str = "overlap") -> List[Dict[str, Any]]:
+        """Same rows and ordering as SkillIndex.top_jobs, over LSH candidates only"""
+        wanted = self.index.lookup(skill_names)
+        weights = self.index.weights(wanted, scoring)
+        if not wanted or limit <= 0:
+            return []
+
+        overlaps: Dict[int, int] = {}
+        scores: Dict[int, float] = {}
+        job_skills = self.index.job_skills
+        for job_no in self.candidates(wanted):
+            matched = [s for s in job_skills[job_no] if s in wanted]
+            if matched:
+                overlaps[job_no] = len(matched)
+                scores[job_no] = sum(weights[s] for s in matched)
+
+        return self.index.best_rows(overlaps, scores, wanted, limit)
+
+    def top_jobs_many(self, skill_lists: List[List[str]], limit: int = 5,
+                      scoring: str = "overlap") -> List[List[Dict[str, Any]]]:
+        return [self.top_jobs(skill_names, limit=limit, scoring=scoring) for skill_names in skill_lists]
+
+
+def recall_report(index: SkillIndex, lsh: SkillLSH, skill_lists: List[List[str]], k: int = 5) -> Dict[str, Any]:
+    """
+    Recall@k of the LSH engine against exact SkillIndex scoring (share of
+    the exact top-k job ids the approximate top-k also returns, averaged
+    over resumes with at least one exact match), plus mean latencies.
+    """
+    started = time.perf_counter()
+    exact = index.top_jobs_many(skill_lists, limit=k)
+    exact_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    approx = lsh.top_jobs_many(skill_lists, limit=k)
+    approx_seconds = time.perf_counter() - started
+
+    recalls = []
+    for exact_rows, approx_rows in zip(exact, approx):
+        if exact_rows:
+            expected = {row["job_id"] for row in exact_rows}
+            recalls.append(len(expected & {row["job_id"] for row in approx_rows}) / len(expected))
+
+    queries = len(skill_lists)
+    return {
+        "queries": queries,
+        "k": k,
+        "recall_at_k": sum(recalls) / len(recalls) if recalls else 1.0,
+        "exact_ms": exact_seconds * 1000 / queries if queries else 0.0,
+        "lsh_ms": approx_seconds * 1000 / queries if queries else 0.0,
+    }
@@ -0,0 +1,101 @@
+"""
+In-process type-ahead over skill names.
+
+Canonical skill keys are kept in one sorted list (names and job counts in
+parallel lists), so the skills starting with a prefix are a contiguous
+slice found with two bisects. Suggestions are the slice's most-required
+skills (Skill.job_count), so "py" offers "Python" before "PyQt".
+
+Only skills at least one job requires are indexed. After the initial load
+the index is kept current from the Skill.version stamps that job ingest
+writes (see jd_to_neo4j): update() applies just the skills stamped since
+the version it last saw. Skill nodes deleted outside ingest (e.g. by
+skill_keys.migrate_skill_keys) need a full load().
+"""
+
+import heapq
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, List, Optional
+
+from skill_keys import canonical_skill_key
+
+ALL_SKILL_WEIGHTS_QUERY = """
+MATCH (s:Skill) WHERE s.job_count > 0
+RETURN s.key AS key, s.name AS name, s.job_count AS job_count
+"""
+
+# Also returns skills whose count dropped to 0, so update() can remove them
+SKILL_WEIGHTS_SINCE_QUERY = """
+MATCH (s:Skill) WHERE s.version > $since
+RETURN s.key AS key, s.name AS name, coalesce(s.job_count, 0) AS job_count
+"""
+
+# Prefixes matching more skills than this get their ranking memoized until the next change
+_MEMO_MIN_SPAN = 256
+MAX_SUGGESTIONS = 50
+
+
+class SkillSuggester:
+    """Sorted prefix index of skill names weighted by job count."""
+
+    def __init__(self):
+        self.keys: List[str] = []
+        self.names: List[str] = []
+        self.job_counts: List[int] = []
+        self.version: Optional[int] = None
+        self._memo: Dict[str, List[int]] = {}
+
+    def load(self, rows: Iterable[Dict[str, Any]], version: Optional[int] = None) -> None:
+        """Replace the index with `rows` (key, name, job_count)"""
+        skills = sorted((row["key"], row["name"], row["job_count"]) for row in rows if row["job_count"] > 0)
+        self.keys = [key for key, _, _ in skills]
+        self.names = [name for _, name, _ in skills]
+        self.job_counts = [count for _, _, count in skills]
+        self.version = version
+        self._memo.clear()
+
+    def update(self, rows: Iterable[Dict[str, Any]], version: Optional[int] = None) -> int:
+        """Apply changed skills in place; returns how many were added, changed or removed"""
+        changed = 0
+        for row in rows:
+            key, count = row["key"], row["job_count"]
+            i = bisect_left(self.keys, key)
+            present = i < len(self.keys) and self.keys[i] == key
+            if present and count > 0:
+                if self.job_counts[i] != count:
+                    self.job_counts[i] = count
+                    changed += 1
+            elif present:
+                del self.keys[i], self.names[i], self.job_counts[i]
+                changed += 1
+            elif count > 0:
+                self.keys.insert(i, key)
+                self.names.insert(i, row["name"])
+                self.job_counts.insert(i, count)
+                changed += 1
+        if changed:
+            self._memo.clear()
+        self.version = version
+        return changed
+
+    def _ranked(self, key: str, limit: int) -> List[int]:
+        lo = bisect_left(self.keys, key)
+        hi = bisect_left(self.keys, key[:-1] + chr(ord(key[-1]) + 1), lo)   # first key past the prefix
+        if hi - lo <= _MEMO_MIN_SPAN:
+            return heapq.nsmallest(limit, range(lo, hi), key=lambda i: (-self.job_counts[i], self.keys[i]))
+        ranked = self._memo.get(key)
+        if ranked is None:
+            ranked = self._memo[key] = heapq.nsmallest(
+                MAX_SUGGESTIONS, range(lo, hi), key=lambda i: (-self.job_counts[i], self.keys[i]))
+        return ranked[:limit]
+
+    def suggest(self, prefix: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Skills whose canonical key starts with `prefix`, most-required first"""
+        key = canonical_skill_key(prefix)
+        if not key or limit <= 0:
+            return []
+        return [{"name": self.names[i], "key": self.keys[i], "job_count": self.job_counts[i]}
+                for i in self._ranked(key, min(limit, MAX_SUGGESTIONS))]
+
+    def stats(self) -> Dict[str, Any]:
+        return {"skills": len(self.keys), "version": self.version, "memoized_prefixes": len(self._memo)}
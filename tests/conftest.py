@@ -0,0 +1,8 @@
+import os
+import sys
+
+# Root-level modules (matching, skill_index, ...) are imported as top-level names
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+# JobParser modules (jobs_api, staged_pipeline, ...) import each other as top-level names
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'JobParser', 'src'))
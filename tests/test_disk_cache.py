@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Test the SQLite parse cache (content-addressed keys, LRU eviction, counters)
+"""
+
+import os
+import tempfile
+
+from disk_cache import DiskCache, parse_cache_key
+
+def test_get_put_and_counters():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = DiskCache(os.path.join(tmp, "cache.sqlite"), max_bytes=1024 * 1024)
+        assert cache.get("missing") is None
+        cache.put("k", {"job_title": "Engineer", "skills_required": ["Python"]})
+        assert cache.get("k") == {"job_title": "Engineer", "skills_required": ["Python"]}
+
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+        assert stats["hit_rate"] == 0.5
+
+def test_lru_eviction_keeps_recently_used():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = DiskCache(os.path.join(tmp, "cache.sqlite"), max_bytes=250)
+        for key in ("a", "b"):
+            cache.put(key, "x" * 100)
+        cache.get("a")               # "b" is now least recently used
+        cache.put("c", "x" * 100)    # pushes the total over the cap
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.get("c") is not None
+        assert cache.stats()["bytes"] <= 250
+
+def test_parse_cache_key_is_content_addressed():
+    base = parse_cache_key("Senior  Engineer\n\nPython", "OpenAI", "gpt-4o-mini", "v1")
+    assert base == parse_cache_key("Senior Engineer Python ", "OpenAI", "gpt-4o-mini", "v1")
+    assert base != parse_cache_key("Senior Engineer Python", "OpenAI", "gpt-4o", "v1")
+    assert base != parse_cache_key("Senior Engineer Python", "OpenAI", "gpt-4o-mini", "v2")
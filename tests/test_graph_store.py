@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Test the in-memory GraphStore backend (no database needed)
+"""
+
+import pytest
+
+pytest.importorskip("pydantic")   # ResumeData
+pytest.importorskip("neo4j")      # jd_to_neo4j flattens the jobs
+pytest.importorskip("dotenv")
+
+from graph_store import InMemoryGraphStore
+from resume_schema import ResumeData, Skill
+
+JOBS = [
+    {"job_id": "j1", "job_title": "Backend Engineer", "company": "Acme", "location": "Remote",
+     "skills_required": ["Python", "SQL", "Docker"], "tools_and_technologies": ["Git"]},
+    {"job_id": "j2", "job_title": "Data Analyst", "skills_required": ["sql", "Excel"]},
+    {"job_id": "j3", "job_title": "ML Engineer", "company": "Globex", "location": "NYC",
+     "skills_required": ["Python", "SQL"]},
+]
+
+def resume(name, email, skills):
+    return ResumeData(personal_info={"name": name, "email": email},
+                      skills=[Skill(name=skill, category="Technical") for skill in skills])
+
+def make_store():
+    store = InMemoryGraphStore()
+    store.upsert_jobs(JOBS)
+    store.upsert_resume(resume("Ada", "ada@example.com", [" python", "SQL, Rust"]), "r1")
+    store.upsert_resume(resume("Bob", "bob@example.com", ["Excel"]), "r2")
+    return store
+
+def test_match_and_lookup():
+    store = make_store()
+    assert [m["job_id"] for m in store.match_jobs("r1")] == ["j3", "j1", "j2"]
+    assert store.match_jobs("r1")[2]["company"] == "Unknown Company"   # jd_to_neo4j default
+    assert [m["job_id"] for m in store.match_jobs("r2")] == ["j2"]
+    assert store.match_jobs("missing") == []
+
+    assert [r["id"] for r in store.list_resumes()] == ["r1", "r2"]
+    assert store.list_resumes()[0]["skill_count"] == 3
+    assert store.resume_id_by_email("bob@example.com") == "r2"
+
+def test_search_details_and_version():
+    store = make_store()
+    assert {row["title"] for row in store.search_jobs_by_skill("SQL")} == {
+        "Backend Engineer", "Data Analyst", "ML Engineer"}
+    assert store.job_details("backend") == {"JobTitle": "Backend Engineer",
+                                            "Skills": ["Python", "SQL", "Docker"], "Tools": ["Git"]}
+    assert store.job_details("Chef") is None
+
+    version = store.graph_version()
+    store.upsert_job({"job_id": "j2", "job_title": "Senior Data Analyst", "skills_required": ["Rust"]})
+    assert store.graph_version() > version
+    # Re-upserting replaces the job's lists like jd_to_neo4j does, and invalidates the index
+    assert store.job_details("Senior Data")["Skills"] == ["Rust"]
+    j2 = next(m for m in store.match_jobs("r1") if m["job_id"] == "j2")
+    assert j2["matching_skills"] == ["Rust"]
+    counts = {row["key"]: row["job_count"] for row in store.skill_weights()}
+    assert (counts["excel"], counts["sql"], counts["rust"]) == (0, 2, 1)
+    # skills keep the name they were first written with ("SQL" from j1, not "sql" from j2)
+    store.upsert_job({"job_id": "j2", "job_title": "Data Analyst", "skills_required": ["sql"]})
+    assert store.job_details("Data Analyst")["Skills"] == ["SQL"]
+
+def test_ranked_bounded_text_search():
+    store = make_store()
+    store.upsert_job({"job_id": "j4", "job_title": "Engineering Manager", "location": "Remote",
+                      "skills_required": ["PostgreSQL", "People management"]})
+    # exact skill name ranks before names that merely contain it
+    rows = store.search_jobs_by_skill("sql")
+    assert rows[-1] == {"title": "Engineering Manager", "location": "Remote", "skill_match": "PostgreSQL"}
+    assert len(store.search_jobs_by_skill("sql", limit=2)) == 2
+    # a title starting with the text beats one merely containing it
+    assert store.job_details("engineer")["JobTitle"] == "Engineering Manager"
+
+def test_fulltext_query_escapes_lucene_syntax():
+    from graph_store import fulltext_query
+
+    assert fulltext_query("  ") is None
+    assert fulltext_query("Go") == "(go^2 OR go*)"
+    assert fulltext_query("C++ Java") == "(c\\+\\+^2 OR c\\+\\+*) AND (java^2 OR java* OR java~1)"
+
+def test_retired_jobs_leave_matching_and_come_back_on_upsert():
+    store = make_store()
+    assert store.retire_jobs(["j3", "j3", "missing"]) == ["j3"]
+    assert [m["job_id"] for m in store.match_jobs("r1")] == ["j1", "j2"]
+    assert "ML Engineer" not in {row["title"] for row in store.search_jobs_by_skill("python")}
+    assert {row["key"]: row["job_count"] for row in store.skill_weights()}["python"] == 1
+
+    store.upsert_job(JOBS[2])
+    assert [m["job_id"] for m in store.match_jobs("r1")][0] == "j3"
+
+def test_neo4j_text_search_falls_back_to_substrings(monkeypatch):
+    import graph_store
+
+    store = object.__new__(graph_store.Neo4jGraphStore)   # no driver: _read is replaced below
+    calls = []
+    def fake_read(cypher, **params):
+        calls.append((cypher, params))
+        return [{"JobTitle": "Data Engineer"}] if cypher is graph_store.JOB_DETAILS_SUBSTRING_QUERY else []
+    monkeypatch.setattr(store, "_read", fake_read, raising=False)
+
+    store.search_jobs_by_skill("  SQL ")
+    assert calls[-1][1]["needle"] == "sql" and "CONTAINS $needle" in calls[-1][0]
+    assert store.job_details("Data  ENG") == {"JobTitle": "Data Engineer"}
+    assert [cypher for cypher, _ in calls[1:]] == [graph_store.JOB_DETAILS_QUERY,
+                                                 graph_store.JOB_DETAILS_SUBSTRING_QUERY]
+    assert calls[-1][1] == {"needle": "data eng"}
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Test the directory manifest used by run_pipeline --dir
+"""
+
+import os
+
+from ingest_manifest import IngestManifest
+
+def write(path, text):
+    path.write_text(text, encoding="utf-8")
+
+def ingest_all(manifest, scan, job_ids):
+    for change in scan["changed"]:
+        manifest.record(change, job_ids[change["path"].name])
+
+def test_new_changed_touched_and_deleted(tmp_path):
+    data = tmp_path / "data"
+    (data / "nested").mkdir(parents=True)
+    write(data / "a.txt", "Backend Engineer")
+    write(data / "nested" / "b.txt", "Data Analyst")
+    write(data / "notes.md", "not a posting")
+
+    manifest = IngestManifest(tmp_path / "manifest.json")
+    scan = manifest.scan(data)
+    assert sorted(c["path"].name for c in scan["changed"]) == ["a.txt", "b.txt"]
+    ingest_all(manifest, scan, {"a.txt": "job-a", "b.txt": "job-b"})
+    manifest.save()
+
+    # A fresh process sees nothing to do
+    manifest = IngestManifest(tmp_path / "manifest.json")
+    assert manifest.scan(data) == {"changed": [], "deleted": [], "unchanged": 2}
+
+    # Touched without a content change: not re-ingested
+    stat = (data / "a.txt").stat()
+    os.utime(data / "a.txt", ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert manifest.scan(data)["changed"] == []
+
+    # Modified and deleted files
+    write(data / "a.txt", "Senior Backend Engineer")
+    (data / "nested" / "b.txt").unlink()
+    scan = manifest.scan(data)
+    assert [(c["path"].name, c["previous_job_id"]) for c in scan["changed"]] == [("a.txt", "job-a")]
+    assert scan["deleted"] == [manifest.key(data / "nested" / "b.txt")]
+
+    assert manifest.job_ids_for(scan["deleted"]) == ["job-b"]
+    manifest.forget(scan["deleted"][0])
+    ingest_all(manifest, scan, {"a.txt": "job-a2"})
+    assert manifest.unreferenced(["job-a", "job-b", "job-a2"]) == ["job-a", "job-b"]
+
+def test_deletions_are_scoped_to_the_scanned_directory(tmp_path):
+    for name in ("feed1", "feed2"):
+        (tmp_path / name).mkdir()
+        write(tmp_path / name / "jd.txt", name)
+    manifest = IngestManifest(tmp_path / "manifest.json")
+    for name in ("feed1", "feed2"):
+        ingest_all(manifest, manifest.scan(tmp_path / name), {"jd.txt": name})
+
+    assert manifest.scan(tmp_path / "feed1")["deleted"] == []
+    # the same content under another name maps to the same job, which stays referenced
+    (tmp_path / "feed1" / "jd.txt").rename(tmp_path / "feed1" / "renamed.txt")
+    scan = manifest.scan(tmp_path / "feed1")
+    manifest.forget(scan["deleted"][0])
+    ingest_all(manifest, scan, {"renamed.txt": "feed1"})
+    assert manifest.unreferenced(["feed1"]) == []
+
+def test_retirements_stay_queued_until_done(tmp_path):
+    data = tmp_path / "data"
+    data.mkdir()
+    write(data / "a.txt", "Backend Engineer")
+    write(data / "b.txt", "Data Analyst")
+    manifest = IngestManifest(tmp_path / "manifest.json")
+    ingest_all(manifest, manifest.scan(data), {"a.txt": "job-a", "b.txt": "job-b"})
+    manifest.save()
+
+    (data / "b.txt").unlink()
+    write(data / "a.txt", "Senior Backend Engineer")
+    scan = manifest.scan(data)
+    for key in scan["deleted"]:
+        manifest.forget(key)
+    ingest_all(manifest, scan, {"a.txt": "job-a2"})
+    manifest.save()      # the run fails before the jobs are retired
+
+    manifest = IngestManifest(tmp_path / "manifest.json")
+    assert manifest.scan(data)["deleted"] == []
+    assert manifest.jobs_to_retire() == ["job-b", "job-a"]
+    manifest.retired()
+    manifest.save()
+    assert IngestManifest(tmp_path / "manifest.json").jobs_to_retire() == []
+
+def test_narrower_pattern_does_not_delete_other_files(tmp_path):
+    write(tmp_path / "a.txt", "Backend Engineer")
+    write(tmp_path / "c.txt", "Data Analyst")
+    manifest = IngestManifest(tmp_path / "manifest.json")
+    ingest_all(manifest, manifest.scan(tmp_path), {"a.txt": "job-a", "c.txt": "job-c"})
+
+    assert manifest.scan(tmp_path, "c*")["deleted"] == []
+    (tmp_path / "c.txt").unlink()
+    assert manifest.scan(tmp_path, "c*")["deleted"] == [manifest.key(tmp_path / "c.txt")]
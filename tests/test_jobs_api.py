@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Test the async API endpoints over the in-memory GraphStore, and the limiter
+"""
+
+import asyncio
+import json
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("httpx")      # fastapi.testclient
+pytest.importorskip("neo4j")
+pytest.importorskip("dotenv")
+
+import graph_store   # puts JobParser/src on sys.path
+import jobs_api
+from response_cache import ResponseCache
+from skill_suggest import SkillSuggester
+from fastapi.testclient import TestClient
+
+JOBS = [
+    {"job_id": "j1", "job_title": "Backend Engineer", "location": "Remote",
+     "employment_type": "Full-time", "skills_required": ["Python", "SQL"], "tools_and_technologies": ["Git"]},
+    {"job_id": "j2", "job_title": "Data Analyst", "location": "NYC", "skills_required": ["sql", "Excel"]},
+]
+
+@pytest.fixture
+def client(monkeypatch):
+    store = graph_store.InMemoryGraphStore()
+    store.upsert_jobs(JOBS)
+    monkeypatch.setattr(jobs_api, "get_graph_store", lambda: store)
+    monkeypatch.setattr(jobs_api, "limiter", jobs_api.ConcurrencyLimiter(4))
+    monkeypatch.setattr(jobs_api, "response_cache",
+                        ResponseCache(store.graph_version_async, version_interval=0))
+    monkeypatch.setattr(jobs_api, "suggester", SkillSuggester())
+    monkeypatch.setattr(jobs_api, "suggester_refresh", None)
+    client = TestClient(jobs_api.app)
+    client.store = store
+    return client
+
+def test_read_endpoints(client):
+    assert client.get("/jobs/").json() == [
+        {"id": "j1", "title": "Backend Engineer", "type": "Full-time", "location": "Remote"},
+        {"id": "j2", "title": "Data Analyst", "type": "Not specified", "location": "NYC"},
+    ]
+    assert {row["title"] for row in client.get("/jobs/search_by_skill/sql").json()} == {
+        "Backend Engineer", "Data Analyst"}
+    assert client.get("/jobs/search_by_skill/cobol").status_code == 404
+    assert client.get("/jobs/skills_and_tools/backend").json()["Tools"] == ["Git"]
+
+def test_keyset_pages_and_ndjson_export(client):
+    first = client.get("/jobs/", params={"limit": 1})
+    assert [job["id"] for job in first.json()] == ["j1"]
+    second = client.get("/jobs/", params={"limit": 1, "cursor": first.headers["X-Next-Cursor"]})
+    assert [job["id"] for job in second.json()] == ["j2"]
+    # a full page gets a cursor even when it happens to be the last one; the next page is empty
+    last = client.get("/jobs/", params={"limit": 1, "cursor": second.headers["X-Next-Cursor"]})
+    assert last.json() == [] and "X-Next-Cursor" not in last.headers
+    assert client.get("/jobs/", params={"cursor": "%%%"}).status_code == 400
+
+    export = client.get("/jobs/export")
+    assert export.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in export.text.splitlines()]
+    assert [job["id"] for job in lines] == ["j1", "j2"]
+    assert lines[0]["skills"] == ["Python", "SQL"] and lines[0]["tools"] == ["Git"]
+
+def test_etag_revalidation_and_ingest_invalidation(client):
+    first = client.get("/jobs/search_by_skill/sql")
+    etag = first.headers["ETag"]
+    again = client.get("/jobs/search_by_skill/sql", headers={"If-None-Match": etag})
+    assert again.status_code == 304 and again.content == b""
+
+    client.store.upsert_job({"job_id": "j3", "job_title": "DBA", "location": "Remote", "skills_required": ["SQL"]})
+    changed = client.get("/jobs/search_by_skill/sql", headers={"If-None-Match": etag})
+    assert changed.status_code == 200 and changed.headers["ETag"] != etag
+    assert len(changed.json()) == 3
+
+    stats = client.get("/stats/").json()["response_cache"]
+    assert (stats["hits"], stats["misses"], stats["not_modified"]) == (1, 2, 1)
+
+def test_skill_suggest_follows_ingest(client, monkeypatch):
+    refreshes = []
+    store_weights = client.store.skill_weights_async
+    async def counted_weights(since=None):
+        refreshes.append(since)
+        return await store_weights(since)
+    monkeypatch.setattr(client.store, "skill_weights_async", counted_weights)
+
+    async def refresh_once():
+        # concurrent callers get the same in-flight refresh
+        first, second = jobs_api.schedule_suggester_refresh(), jobs_api.schedule_suggester_refresh()
+        assert first is second
+        await first
+
+    def suggest(prefix="s"):
+        return client.get("/skills/suggest", params={"prefix": prefix})
+
+    with client:   # one event loop for the requests and the background refresh; startup loads the index
+        assert suggest().json() == [{"name": "SQL", "key": "sql", "job_count": 2}]
+        client.portal.call(refresh_once)   # let the refresh that request started settle
+        client.store.upsert_job({"job_id": "j3", "job_title": "DBA", "skills_required": ["SQL", "Snowflake"]})
+        # answered from the index as it stands, without waiting for the refresh it starts
+        assert suggest().json()[0]["job_count"] == 2
+        client.portal.call(refresh_once)
+        assert [row["job_count"] for row in suggest().json()] == [3, 1]
+        assert suggest("").status_code == 422
+    assert refreshes == [None, 1]
+
+def test_saturated_api_returns_503(client, monkeypatch):
+    monkeypatch.setattr(jobs_api, "limiter", jobs_api.ConcurrencyLimiter(0))
+    response = client.get("/jobs/")
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+    assert client.get("/stats/").json()["limiter"]["rejected"] == 1   # /stats/ is not limited
+
+def test_limiter_rejects_instead_of_queueing():
+    async def scenario():
+        limiter = jobs_api.ConcurrencyLimiter(1, queue_timeout=0.01)
+        assert await limiter.acquire()
+        assert not await limiter.acquire()          # waited 10 ms, then gave up
+        limiter.release()
+        assert await limiter.acquire()
+        return limiter.stats()
+
+    assert asyncio.run(scenario()) == {"max_concurrency": 1, "in_flight": 1, "rejected": 1}
+
+def test_export_holds_its_slot_until_the_stream_ends(client):
+    in_flight = []
+    requests = [{"type": "http.request", "body": b"", "more_body": False}]
+
+    async def receive():
+        if requests:
+            return requests.pop()
+        await asyncio.Event().wait()   # the client never disconnects
+
+    async def send(message):
+        if message["type"] == "http.response.body":
+            in_flight.append(jobs_api.limiter.in_flight)
+
+    scope = {"type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+             "scheme": "http", "path": "/jobs/export", "raw_path": b"/jobs/export", "root_path": "",
+             "query_string": b"", "headers": [], "client": ("test", 1), "server": ("test", 80)}
+    asyncio.run(jobs_api.app(scope, receive, send))
+    assert len(in_flight) >= 2 and set(in_flight) == {1}   # every job line and the final chunk
+    assert jobs_api.limiter.in_flight == 0
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Test the match-result cache (graph-version keys, LRU bound, disk tier)
+"""
+
+import os
+import tempfile
+
+from disk_cache import DiskCache
+from match_cache import MatchCache
+
+class FakeGraph:
+    def __init__(self):
+        self.version = 1
+        self.calls = []
+
+    def compute(self, resume_id, limit=5, **params):
+        self.calls.append((resume_id, limit, params))
+        return [{"job_id": f"{resume_id}-job-{i}", "score": limit - i} for i in range(limit)]
+
+def make_cache(graph, **kwargs):
+    return MatchCache(compute=graph.compute, version=lambda: graph.version, **kwargs)
+
+def test_hits_until_graph_version_changes():
+    graph = FakeGraph()
+    cache = make_cache(graph)
+
+    first = cache.get_matches("r1", limit=3, engine="cypher")
+    assert cache.get_matches("r1", limit=3, engine="cypher") == first
+    cache.get_matches("r1", limit=3, scoring="idf")     # different scoring params
+    cache.get_matches("r1", limit=2, engine="cypher")   # different limit
+    assert len(graph.calls) == 3
+
+    graph.version += 1                                  # ingest happened
+    cache.get_matches("r1", limit=3, engine="cypher")
+    assert len(graph.calls) == 4
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 4)
+    assert stats["hit_rate"] == 0.2
+
+def test_lru_bound():
+    graph = FakeGraph()
+    cache = make_cache(graph, max_entries=2)
+    for resume_id in ("a", "b", "a", "c"):   # "b" is least recently used when "c" arrives
+        cache.get_matches(resume_id)
+    assert cache.stats()["entries"] == 2
+
+    cache.get_matches("a")
+    cache.get_matches("b")
+    assert [call[0] for call in graph.calls] == ["a", "b", "c", "b"]
+
+def test_disk_tier_is_shared_between_instances():
+    graph = FakeGraph()
+    with tempfile.TemporaryDirectory() as tmp:
+        disk = DiskCache(os.path.join(tmp, "matches.sqlite"), max_bytes=1024 * 1024)
+        make_cache(graph, disk=disk).get_matches("r1", limit=2)
+
+        other = make_cache(graph, disk=disk)     # e.g. a second process
+        assert other.get_matches("r1", limit=2) == graph.compute("r1", limit=2)
+        assert other.stats()["disk_hits"] == 1
+        assert len(graph.calls) == 2              # only the explicit compute above
+
+def test_index_engines_are_not_cached():
+    """index/lsh read this process's SkillIndex snapshot, which the graph version does not track"""
+    graph = FakeGraph()
+    cache = make_cache(graph)
+    for engine in ("index", "index", "lsh"):
+        cache.get_matches("r1", limit=2, engine=engine)
+    assert len(graph.calls) == 3
+    assert cache.stats()["entries"] == 0
+
+def test_namespaces_do_not_share_disk_entries():
+    graph = FakeGraph()
+    with tempfile.TemporaryDirectory() as tmp:
+        disk = DiskCache(os.path.join(tmp, "matches.sqlite"), max_bytes=1024 * 1024)
+        make_cache(graph, disk=disk, namespace="neo4j@bolt://a").get_matches("r1")
+        other = make_cache(graph, disk=disk, namespace="neo4j@bolt://b")
+        other.get_matches("r1")
+        assert other.stats()["disk_hits"] == 0
+        assert len(graph.calls) == 2
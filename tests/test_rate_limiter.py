@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Test the LLM rate limiter and the 429 backoff against a fake clock
+"""
+
+import asyncio
+import json
+import os
+import types
+
+import pytest
+
+import rate_limiter
+from rate_limiter import AsyncRateLimiter
+
+_real_sleep = asyncio.sleep
+
+class FakeClock:
+    """Stands in for time.monotonic/asyncio.sleep: sleeping advances `now` instantly"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def monotonic(self):
+        return self.now
+
+    async def sleep(self, seconds):
+        self.now += max(seconds, 0.0)
+        await _real_sleep(0)   # still let the other tasks run
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limiter, "time", types.SimpleNamespace(monotonic=clock.monotonic))
+    monkeypatch.setattr(rate_limiter, "asyncio", types.SimpleNamespace(Lock=asyncio.Lock, sleep=clock.sleep))
+    return clock
+
+def grant_times(clock, limiter, n, tokens=1):
+    async def scenario():
+        times = []
+        for _ in range(n):
+            await limiter.acquire(tokens)
+            times.append(clock.now)
+        return times
+    return asyncio.run(scenario())
+
+def test_requests_are_spaced_at_the_rpm_once_the_burst_is_spent(clock):
+    times = grant_times(clock, AsyncRateLimiter(requests_per_minute=60, tokens_per_minute=10**6), 63)
+    assert times[:60] == [0.0] * 60                          # a full bucket allows one minute's burst
+    assert times[60:] == pytest.approx([1.0, 2.0, 3.0])      # then one request per second
+
+def test_token_budget_spaces_large_requests(clock):
+    # 600 tokens/minute = 10/s: after six 100-token requests, one more every 10 s
+    times = grant_times(clock, AsyncRateLimiter(requests_per_minute=1000, tokens_per_minute=600), 8, tokens=100)
+    assert times == pytest.approx([0.0] * 6 + [10.0, 20.0])
+
+def test_pause_holds_back_every_waiting_caller(clock):
+    async def scenario():
+        limiter = AsyncRateLimiter(requests_per_minute=600, tokens_per_minute=10**6)
+        await limiter.acquire(1)
+        limiter.pause(7.0)                 # a 429 with retry-after: 7
+        limiter.pause(2.0)                 # a shorter pause never cuts a longer one short
+        times = []
+
+        async def worker():
+            await limiter.acquire(1)
+            times.append(clock.now)
+
+        await asyncio.gather(*(worker() for _ in range(3)))
+        return times
+
+    assert asyncio.run(scenario()) == [7.0, 7.0, 7.0]
+
+def test_429_retry_after_pauses_all_workers(clock, monkeypatch):
+    pytest.importorskip("openai")
+    pytest.importorskip("httpx")
+    pytest.importorskip("dotenv")
+    if not os.environ.get("OPENAI_API_KEY"):
+        monkeypatch.setenv("OPENAI_API_KEY", "test-key")   # jd_parser builds its sync client at import
+    import httpx
+    import jd_parser
+    from openai import RateLimitError
+
+    monkeypatch.setattr(jd_parser, "get_parse_cache", lambda: None)
+    parsed = {field: "Not specified" for field in ("job_title", "company", "location", "employment_type",
+                                                    "experience_required", "salary_range")}
+    parsed.update({field: [] for field in ("education_required", "certifications_required", "skills_required",
+                                           "tools_and_technologies", "responsibilities")})
+    calls = []
+    rate_limited = asyncio.Event()
+
+    class FakeResponses:
+        async def create(self, **kwargs):
+            await _real_sleep(0)
+            calls.append(clock.now)
+            if len(calls) == 1:
+                rate_limited.set()
+                response = httpx.Response(429, headers={"retry-after": "7"},
+                                          request=httpx.Request("POST", "https://api.openai.com/v1/responses"))
+                raise RateLimitError("Rate limit reached", response=response, body=None)
+            return types.SimpleNamespace(output_text=json.dumps(parsed))
+
+    async def scenario():
+        limiter = AsyncRateLimiter(requests_per_minute=600, tokens_per_minute=10**6)
+        fake_client = types.SimpleNamespace(responses=FakeResponses())
+        first = asyncio.create_task(jd_parser.parse_jd_text_async("JD 0", fake_client, limiter))
+        await rate_limited.wait()          # the other workers queue up behind the 429
+        return await asyncio.gather(first, *(jd_parser.parse_jd_text_async(f"JD {i}", fake_client, limiter)
+                                             for i in (1, 2)))
+
+    results = asyncio.run(scenario())
+    assert all("error" not in result for result in results)
+    # the retry and both other workers all waited out the retry-after delay
+    assert calls == [0.0, 7.0, 7.0, 7.0]
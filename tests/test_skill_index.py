@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Test the in-process skill index used by matching.get_top_job_matches_for_resume
+"""
+
+import random
+
+import matching
+from skill_index import PartitionedSkillIndex, SkillIndex
+
+JOBS = [
+    {"job_id": "j1", "title": "Backend Engineer", "company": "Acme", "location": "Remote",
+     "employment_type": "Full-time", "skills": ["Python", "SQL", "Docker"]},
+    {"job_id": "j2", "title": "Data Analyst", "company": None, "location": None,
+     "employment_type": None, "skills": ["sql", "Excel"]},
+    {"job_id": "j3", "title": "ML Engineer", "company": "Globex", "location": "NYC",
+     "employment_type": "Contract", "skills": ["Python", "SQL"]},
+    {"job_id": "j4", "title": "Designer", "company": "Initech", "location": "LA",
+     "employment_type": "Full-time", "skills": []},
+]
+
+def test_top_jobs_ordering_and_shape():
+    """Jobs are ranked by overlap, then coverage, then title"""
+    index = SkillIndex.build(JOBS)
+    assert len(index) == 3  # jobs without skills can never match
+
+    matches = index.top_jobs([" python", "SQL", "Rust"], limit=5)
+    assert [m["job_id"] for m in matches] == ["j3", "j1", "j2"]
+
+    best = matches[0]
+    assert best["matching_skills"] == ["Python", "SQL"]
+    assert best["matching_skill_count"] == 2
+    assert best["total_skill_required"] == 2
+    assert best["coverage"] == 1.0
+    assert best["score"] == 2
+
+    fallback = matches[2]
+    assert fallback["company"] == "Unknown"
+    assert fallback["location"] == "Unknown"
+    assert fallback["employment_type"] == "Not specified"
+
+def test_top_jobs_limit_and_no_overlap():
+    index = SkillIndex.build(JOBS)
+    assert [m["job_id"] for m in index.top_jobs(["Python", "SQL"], limit=1)] == ["j3"]
+    assert index.top_jobs(["Haskell"]) == []
+    assert index.top_jobs([]) == []
+
+def random_jobs(n, seed=3):
+    rng = random.Random(seed)
+    skills = [f"skill-{i}" for i in range(40)]
+    return [{"job_id": f"job-{i}", "title": rng.choice(["Engineer", "Analyst", None]),
+             "skills": rng.sample(skills, rng.randint(1, 8))} for i in range(n)]
+
+def test_partitioned_index_matches_single_index():
+    jobs = random_jobs(300)
+    single = SkillIndex.build(jobs)
+    partitioned = PartitionedSkillIndex.build(jobs, partitions=4)
+    assert len(partitioned) == len(single)
+    assert all(len(p) for p in partitioned.partitions)
+
+    queries = [random.Random(i).sample([f"skill-{k}" for k in range(40)], 5) for i in range(20)]
+    expected = single.top_jobs_many(queries, limit=10)
+    assert partitioned.top_jobs_many(queries, limit=10) == expected
+
+    with_processes = PartitionedSkillIndex.build(jobs, partitions=2).start()
+    try:
+        assert with_processes.top_jobs_many(queries, limit=10) == expected
+        assert with_processes.top_jobs(queries[0], limit=3) == expected[0][:3]
+    finally:
+        with_processes.close()
+
+def test_idf_scoring_prefers_rare_skills():
+    jobs = [{"job_id": f"common-{i}", "title": "Python Dev", "skills": ["Python", "Git"]} for i in range(9)]
+    jobs.append({"job_id": "rare", "title": "Compiler Engineer", "skills": ["LLVM", "Rust"]})
+    index = SkillIndex.build(jobs)
+    resume = ["Python", "Git", "LLVM"]
+
+    assert index.top_jobs(resume, limit=1)[0]["job_id"] == "common-0"   # 2 shared skills beat 1
+    best = index.top_jobs(resume, limit=1, scoring="idf")[0]
+    assert best["job_id"] == "rare"
+    assert best["matching_skill_count"] == 1
+    assert best["score"] > 2 * index.weights({index.skill_ids["python"]}, "idf")[index.skill_ids["python"]]
+
+def test_partitioned_idf_uses_corpus_wide_frequencies():
+    jobs = random_jobs(300, seed=11)
+    single = SkillIndex.build(jobs)
+    partitioned = PartitionedSkillIndex.build(jobs, partitions=3)
+    queries = [random.Random(i).sample([f"skill-{k}" for k in range(40)], 6) for i in range(20)]
+
+    expected = single.top_jobs_many(queries, limit=8, scoring="idf")
+    actual = partitioned.top_jobs_many(queries, limit=8, scoring="idf")
+    assert [[row["job_id"] for row in rows] for rows in actual] == [[row["job_id"] for row in rows] for rows in expected]
+
+def test_ingest_invalidates_the_loaded_index(monkeypatch):
+    """After invalidate_skill_index() (called by job ingest) the next lookup reloads from the graph"""
+    graphs = [JOBS[:1], JOBS]
+    monkeypatch.setattr(matching, "_load_skill_index", lambda: SkillIndex.build(graphs.pop(0)))
+    monkeypatch.setattr(matching, "_skill_index", None)
+    monkeypatch.setattr(matching, "_skill_lsh", None)
+
+    assert len(matching.get_skill_index()) == 1
+    assert matching.get_skill_index() is matching.get_skill_index()
+    matching.invalidate_skill_index()
+    assert len(matching.get_skill_index()) == 3
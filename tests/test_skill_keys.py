@@ -0,0 +1,20 @@
+#!/usr/bin/env python3
+"""
+Test canonical skill keys computed at ingest time
+"""
+
+from skill_keys import canonical_skill_key, canonical_skills, split_skill_names
+
+def test_canonical_skill_key():
+    assert canonical_skill_key("  Machine   Learning ") == "machine learning"
+    assert canonical_skill_key("PYTHON") == canonical_skill_key("python")
+
+def test_split_and_dedupe():
+    """Comma-joined resume skills become one entry per skill, deduplicated by key"""
+    assert split_skill_names("Python, SQL ,, React") == ["Python", "SQL", "React"]
+    assert split_skill_names(None) == []
+    assert canonical_skills(["Python, SQL", "python", None, "Node.js"]) == [
+        ("python", "Python"),
+        ("sql", "SQL"),
+        ("node.js", "Node.js"),
+    ]
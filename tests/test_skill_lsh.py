@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Test the MinHash/LSH approximate engine against exact SkillIndex scoring
+"""
+
+import random
+
+from skill_index import SkillIndex
+from skill_lsh import SkillLSH, recall_report
+
+def make_jobs(n, seed=5):
+    rng = random.Random(seed)
+    skills = [f"skill-{i}" for i in range(200)]
+    return [{"job_id": f"job-{i}", "title": f"Job {i}", "skills": rng.sample(skills, rng.randint(3, 10))}
+            for i in range(n)]
+
+def test_lsh_rows_are_exact_scores_of_candidates():
+    index = SkillIndex.build(make_jobs(500))
+    lsh = SkillLSH(index, bands=16, rows=2)
+
+    # A resume identical to a job always lands in that job's buckets
+    job_no = 42
+    names = [index.skill_names[s] for s in index.job_skills[job_no]]
+    approx = lsh.top_jobs(names, limit=3)
+    assert approx[0] == index.top_jobs(names, limit=1)[0]
+
+    exact_by_id = {row["job_id"]: row for row in index.top_jobs(names, limit=len(index))}
+    assert all(row == exact_by_id[row["job_id"]] for row in approx)
+    assert lsh.top_jobs(["unknown skill"]) == []
+
+def test_recall_report():
+    index = SkillIndex.build(make_jobs(500))
+    rng = random.Random(9)
+    queries = [[index.skill_names[s] for s in index.job_skills[rng.randrange(len(index))]] for _ in range(50)]
+
+    wide = recall_report(index, SkillLSH(index, bands=64, rows=1), queries, k=5)
+    narrow = recall_report(index, SkillLSH(index, bands=4, rows=4), queries, k=5)
+    assert wide["queries"] == 50
+    assert 0.0 < narrow["recall_at_k"] <= wide["recall_at_k"] <= 1.0
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Test the skill type-ahead index (sorted keys, job-count ranking, incremental updates)
+"""
+
+from skill_suggest import SkillSuggester
+
+ROWS = [
+    {"key": "python", "name": "Python", "job_count": 40},
+    {"key": "pyqt", "name": "PyQt", "job_count": 2},
+    {"key": "pytorch", "name": "PyTorch", "job_count": 9},
+    {"key": "sql", "name": "SQL", "job_count": 30},
+    {"key": "perl", "name": "Perl", "job_count": 0},   # no job requires it any more
+]
+
+def make_suggester():
+    suggester = SkillSuggester()
+    suggester.load(ROWS, version=1)
+    return suggester
+
+def names(rows):
+    return [row["name"] for row in rows]
+
+def test_prefix_ranked_by_job_count():
+    suggester = make_suggester()
+    assert names(suggester.suggest("Py")) == ["Python", "PyTorch", "PyQt"]
+    assert names(suggester.suggest("  PYT", limit=1)) == ["Python"]
+    assert suggester.suggest("p")[0] == {"name": "Python", "key": "python", "job_count": 40}
+    assert suggester.suggest("perl") == []
+    assert suggester.suggest(" ") == []
+
+def test_incremental_update():
+    suggester = make_suggester()
+    changed = suggester.update([
+        {"key": "pyspark", "name": "PySpark", "job_count": 12},   # new
+        {"key": "pyqt", "name": "PyQt", "job_count": 0},          # last job retired
+        {"key": "sql", "name": "SQL", "job_count": 30},           # unchanged
+    ], version=2)
+    assert changed == 2 and suggester.version == 2
+    assert names(suggester.suggest("py")) == ["Python", "PySpark", "PyTorch"]
+    assert suggester.keys == sorted(suggester.keys)
+
+def test_wide_prefixes_are_memoized_until_a_change():
+    suggester = SkillSuggester()
+    suggester.load([{"key": f"skill {i:04d}", "name": f"Skill {i}", "job_count": i % 97 + 1}
+                    for i in range(1000)], version=1)
+    top = suggester.suggest("s", limit=3)
+    assert [row["job_count"] for row in top] == [97, 97, 97]
+    assert suggester.stats()["memoized_prefixes"] == 1
+
+    suggester.update([{"key": "skill 0000", "name": "Skill 0", "job_count": 500}], version=2)
+    assert suggester.stats()["memoized_prefixes"] == 0
+    assert suggester.suggest("s", limit=1)[0]["name"] == "Skill 0"
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Test the staged reader -> parser -> batched writer pipeline with fake stages
+"""
+
+import asyncio
+import time
+
+from staged_pipeline import run_staged_pipeline
+
+def make_stages(parse_delay, write_delay):
+    writes = []
+
+    def read(path):
+        if path.startswith("missing"):
+            raise FileNotFoundError(path)
+        return f"text of {path}"
+
+    async def parse(text):
+        # later files finish first, so results arrive out of order
+        await asyncio.sleep(parse_delay / (1 + int(text.rsplit("-", 1)[1]) % 3))
+        return {"job_title": text}
+
+    def write(batch):
+        time.sleep(write_delay)
+        writes.append([job["job_title"] for job in batch])
+
+    return read, parse, write, writes
+
+def test_results_in_order_batched_and_errors_skipped():
+    read, parse, write, writes = make_stages(parse_delay=0.01, write_delay=0.0)
+    paths = [f"jd-{i}" for i in range(7)] + ["missing-7"]
+    seen = []
+    report = asyncio.run(run_staged_pipeline(paths, read, parse, write, workers=3, batch_size=3, queue_size=2,
+                                             on_parsed=lambda path, parsed: seen.append(path)))
+    assert seen == paths
+    assert [len(batch) for batch in writes] == [3, 3, 1]
+    assert [title for batch in writes for title in batch] == [f"text of jd-{i}" for i in range(7)]
+    stages = {stage["stage"]: stage for stage in report["stages"]}
+    assert (stages["read"]["items"], stages["parse"]["items"], stages["write"]["items"]) == (8, 7, 7)
+    assert stages["write"]["calls"] == 3
+
+def test_parse_and_write_overlap():
+    """Wall time tracks the slowest stage, not parse time + write time"""
+    read, parse, write, writes = make_stages(parse_delay=0.05, write_delay=0.05)
+    paths = [f"jd-{i}" for i in range(12)]
+    report = asyncio.run(run_staged_pipeline(paths, read, parse, write, workers=1, batch_size=1, queue_size=2))
+    stages = {stage["stage"]: stage for stage in report["stages"]}
+    serial = stages["parse"]["busy_seconds"] + stages["write"]["busy_seconds"]
+    assert report["wall_seconds"] < 0.8 * serial